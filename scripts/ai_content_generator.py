@@ -8,16 +8,12 @@ import sys
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
-import logging
 from typing import Dict, List, Any
 import argparse
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
+from structured_logging import configure_logging, get_logger, load_config
+
+logger = get_logger(__name__)
 
 class AIContentGenerator:
     """AI-powered content generation and documentation maintenance."""
@@ -1048,9 +1044,14 @@ def main():
                        help="Automatically update existing content")
     parser.add_argument("--project-path", type=str, default=".",
                        help="Path to project repository (default: current directory)")
+    parser.add_argument("--config", type=str, default="ai_blueprint_config.yaml",
+                       help="Configuration with the logging settings (default: ai_blueprint_config.yaml)")
     
     args = parser.parse_args()
     
+    config = load_config(args.config)
+    configure_logging(config.get('logging'), 'ai_content_generator')
+
     generator = AIContentGenerator(args.project_path)
     generator.run(args.auto_update)
 
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+NetNeural Import Budget Check
+Measures each automation script's import time in a fresh interpreter against recorded budgets
+"""
+
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+# import time: self [us] | cumulative [us] | name, indented two spaces per nesting level
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$', re.MULTILINE)
+
+
+def measure_import(module: str) -> Tuple[float, List[Tuple[float, str]]]:
+    """Milliseconds to import a script module cold, and (ms, name) of its direct imports
+
+    Interpreter startup (site and whatever it pulls in) is excluded, so
+    the figure is what the script itself adds to every invocation.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=SCRIPTS_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+
+    entries = [(int(cumulative), len(indent) // 2, name)
+               for _, cumulative, indent, name in IMPORTTIME_RE.findall(result.stderr)]
+    # Entries are listed in post-order: a module's imports come right before it
+    for position, (cumulative, depth, name) in enumerate(entries):
+        if depth == 0 and name == module:
+            break
+    else:
+        raise RuntimeError(f"No import time reported for {module}")
+    children = []
+    for child_cumulative, child_depth, child_name in reversed(entries[:position]):
+        if child_depth == 0:
+            break
+        if child_depth == 1:
+            children.append((child_cumulative / 1000, child_name))
+    return cumulative / 1000, sorted(children, reverse=True)
+
+
+def check_budgets(budgets: Dict[str, float], runs: int) -> bool:
+    """Print measured import time against budget per script; True when all are within budget"""
+    within = True
+    print(f"{'Script':<32} {'Median ms':>10} {'Budget ms':>10}")
+    for module, budget in budgets.items():
+        samples = [measure_import(module) for _ in range(runs)]
+        median = statistics.median(elapsed for elapsed, _ in samples)
+        status = 'ok' if median <= budget else 'OVER BUDGET'
+        print(f"{module:<32} {median:>10.1f} {budget:>10.1f}  {status}")
+        if median > budget:
+            within = False
+            # The heaviest imports of the slowest run are the likely regression
+            _, children = max(samples)
+            for elapsed, name in children[:5]:
+                print(f"    {elapsed:>8.1f} ms  {name}")
+    return within
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Check script import times against recorded budgets")
+    parser.add_argument("--config", default="ai_blueprint_config.yaml",
+                       help="Configuration with quality_assurance.import_budgets (default: ai_blueprint_config.yaml)")
+    parser.add_argument("--runs", type=int, default=5,
+                       help="Fresh interpreters per script; the median is compared (default: 5)")
+    parser.add_argument("scripts", nargs="*", metavar="SCRIPT",
+                       help="Only check these scripts (default: every budgeted script)")
+
+    args = parser.parse_args()
+
+    import yaml
+
+    with open(args.config, 'r') as f:
+        budgets = yaml.safe_load(f)['quality_assurance']['import_budgets']
+    if args.scripts:
+        unknown = set(args.scripts) - set(budgets)
+        if unknown:
+            parser.error(f"No recorded budget for {', '.join(sorted(unknown))}")
+        budgets = {module: budgets[module] for module in args.scripts}
+
+    # Compile once up front, so every measured run reads cached bytecode
+    subprocess.run([sys.executable, '-m', 'compileall', '-q', str(SCRIPTS_DIR)], check=True)
+    sys.exit(0 if check_budgets(budgets, args.runs) else 1)
+
+if __name__ == "__main__":
+    main()
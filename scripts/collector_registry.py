@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+NetNeural Collector Registry
+Declarative monitor collectors with input tracking, TTL caching and cost classes
+"""
+
+import os
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Optional, Iterable
+
+from collector_scheduler import CollectorScheduler
+from file_index import FileIndex
+
+COST_CLASSES = ('cheap', 'moderate', 'expensive')
+
+
+class CollectorSpec:
+    """Declaration of one metric collector."""
+
+    def __init__(self, name: str, section: str, func: Callable[[], Any],
+                 inputs: Iterable[str] = (), ttl: Optional[float] = None,
+                 cost: str = 'cheap', timeout: Optional[float] = None, artifacts: Iterable[str] = ()):
+        """Declare a collector.
+
+        Args:
+            name: Metric key, unique across the registry
+            section: State section the metric is reported under
+            func: Zero-argument callable producing the metric value
+            inputs: Paths, relative to the project root, the value depends on
+            ttl: Seconds a cached value may be served (default: by cost class)
+            cost: One of COST_CLASSES
+            timeout: Deadline in seconds (default: scheduler default)
+            artifacts: Globs of files git does not track (coverage reports, dumps)
+                the value depends on, compared by mtime and size
+        """
+        if cost not in COST_CLASSES:
+            raise ValueError(f"Unknown cost class {cost!r} for collector {name}")
+        self.name = name
+        self.section = section
+        self.func = func
+        self.inputs = list(inputs)
+        self.ttl = ttl
+        self.cost = cost
+        self.timeout = timeout
+        self.artifacts = list(artifacts)
+
+
+class CollectorRegistry:
+    """Registry of metric collectors with a persistent TTL value cache.
+
+    A cached value is served while it is younger than the collector's TTL
+    and none of its declared inputs have changed, so slow collectors refresh
+    on their own cadence while cheap ones run every cycle. Inputs are
+    compared by content fingerprint, so an edit deep inside a declared
+    directory is noticed.
+    """
+
+    def __init__(self, base_path: Path, cache_file: Path,
+                 cost_ttl: Optional[Dict[str, float]] = None, file_index: Optional[FileIndex] = None):
+        """Initialize the registry.
+
+        Args:
+            base_path: Project root that collector inputs are relative to
+            cache_file: JSON file persisting collected values between runs
+            cost_ttl: Default TTL in seconds per cost class
+            file_index: File index fingerprinting inputs (default: one over base_path)
+        """
+        self.base_path = Path(base_path)
+        self.file_index = file_index or FileIndex(self.base_path)
+        self.cache_file = Path(cache_file)
+        self.cost_ttl = dict({'cheap': 0, 'moderate': 300, 'expensive': 3600}, **(cost_ttl or {}))
+        self.specs: Dict[str, CollectorSpec] = {}
+        self.cache: Dict[str, Dict[str, Any]] = self._load_cache()
+
+    def register(self, spec: CollectorSpec) -> None:
+        """Add (or replace) a collector"""
+        self.specs[spec.name] = spec
+
+    def section(self, section: str) -> List[CollectorSpec]:
+        """Collectors reporting under a state section, in registration order"""
+        return [spec for spec in self.specs.values() if spec.section == section]
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Load cached collector values"""
+        try:
+            with open(self.cache_file, 'r') as f:
+                return json.load(f)
+        except (IOError, json.JSONDecodeError):
+            return {}
+
+    def _save_cache(self) -> None:
+        """Persist cached collector values atomically"""
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(self.cache, f, separators=(',', ':'), default=str)
+        os.replace(tmp_file, self.cache_file)
+
+    def input_signature(self, spec: CollectorSpec) -> List[Any]:
+        """Content fingerprint of each of a collector's declared inputs and artifacts"""
+        return ([self.file_index.fingerprint(relative) for relative in spec.inputs]
+                + [self.file_index.artifact_fingerprint(pattern) for pattern in spec.artifacts])
+
+    def ttl_for(self, spec: CollectorSpec) -> float:
+        """Effective TTL of a collector"""
+        return spec.ttl if spec.ttl is not None else self.cost_ttl[spec.cost]
+
+    def is_fresh(self, spec: CollectorSpec, now: float) -> bool:
+        """Whether the cached value can be served without re-running"""
+        cached = self.cache.get(spec.name)
+        if cached is None:
+            return False
+        if now - cached['collected_at'] >= self.ttl_for(spec):
+            return False
+        return cached['inputs'] == self.input_signature(spec)
+
+    def run(self, scheduler: CollectorScheduler, names: Optional[Iterable[str]] = None,
+            time_budget: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Refresh due collectors concurrently and return a record per collector
+
+        Records carry 'status' (ok, cached, error or timeout), 'latency_ms',
+        'value' and, when a failed refresh fell back to the cache, 'stale'.
+        Values refreshed under a time budget may be sampled estimates, so
+        they are returned but never cached. Cheap collectors are dispatched
+        first and run outside the time budget: they finish in milliseconds,
+        and queued behind expensive ones they would miss it for no reason.
+        """
+        specs = [self.specs[name] for name in names] if names is not None else list(self.specs.values())
+        now = time.time()
+        due = [spec for spec in specs if not self.is_fresh(spec, now)]
+        # Cheap collectors first, then the most expensive so they bound the cycle
+        due.sort(key=lambda spec: (spec.cost != 'cheap', -COST_CLASSES.index(spec.cost)))
+
+        signatures = {spec.name: self.input_signature(spec) for spec in due}
+        results = scheduler.run({spec.name: (spec.func, spec.timeout) for spec in due}, time_budget,
+                                [spec.name for spec in due if spec.cost == 'cheap'])
+
+        records = {}
+        for spec in specs:
+            cached = self.cache.get(spec.name)
+            result = results.get(spec.name)
+            if result is None:
+                records[spec.name] = {'status': 'cached', 'latency_ms': 0.0,
+                                      'age_s': round(now - cached['collected_at'], 1),
+                                      'value': cached['value']}
+            elif result['status'] == 'ok' and time_budget is not None:
+                records[spec.name] = result
+            elif result['status'] == 'ok':
+                self.cache[spec.name] = {'value': result['value'], 'collected_at': now,
+                                         'inputs': signatures[spec.name]}
+                records[spec.name] = result
+            else:
+                records[spec.name] = dict(result, value=cached['value'] if cached else None,
+                                          stale=cached is not None)
+        if results:
+            self._save_cache()
+        return records
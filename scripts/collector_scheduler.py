@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+NetNeural Collector Scheduler
+Runs independent monitor collectors concurrently under per-collector deadlines
+"""
+
+import os
+import math
+import time
+import queue
+import threading
+from concurrent.futures import Executor, Future, FIRST_COMPLETED, wait
+from typing import Dict, List, Any, Callable, Iterable, Optional, Tuple
+
+# Seconds between checks for queued collectors that have started, and so have a deadline
+QUEUE_POLL = 0.25
+
+_local = threading.local()
+
+
+class DeadlineExceeded(Exception):
+    """Raised by check_deadline() in a collector that has run past its deadline"""
+
+
+class CancelToken:
+    """Deadline of a running collector, and whether the scheduler has given up on it"""
+
+    def __init__(self):
+        """Initialize an uncancelled token without a deadline"""
+        self.cancelled = False
+        self.deadline = math.inf  # time.perf_counter() value, set when the collector starts
+
+    def expired(self) -> bool:
+        """Whether the collector is past its deadline or was abandoned"""
+        return self.cancelled or time.perf_counter() >= self.deadline
+
+
+def current_token() -> Optional[CancelToken]:
+    """Token of the collector running on this thread; None outside the scheduler"""
+    return getattr(_local, 'token', None)
+
+
+def abandoned() -> bool:
+    """Whether the collector on this thread was abandoned, so its results must not be stored"""
+    token = current_token()
+    return token is not None and token.cancelled
+
+
+def check_deadline() -> None:
+    """Stop a long-running collector cooperatively once its deadline has passed
+
+    Called between units of work (file batches, sampled directories), so an
+    abandoned collector stops instead of running on in the background.
+    Outside the scheduler it does nothing.
+    """
+    token = current_token()
+    if token is not None and token.expired():
+        raise DeadlineExceeded("collector deadline passed")
+
+
+def run_in_spawn_pool(func: Callable[[List[Any]], List[Any]], items: List[Any],
+                      max_workers: Optional[int] = None, inline_below: int = 0) -> List[Any]:
+    """Results of func over items, computed in batches by worker processes
+
+    func maps a batch of items to a list of results in the same order; it
+    must be a module-level function, so spawned workers can import it.
+    Below inline_below items, starting workers costs more than it saves and
+    func runs in this process. The deadline is checked after every batch.
+    """
+    if len(items) < inline_below:
+        return func(items)
+    from multiprocessing import get_context
+
+    workers = max_workers or os.cpu_count() or 1
+    batch_size = max(1, len(items) // (workers * 4))
+    batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    results: List[Any] = []
+    # Spawned, not forked: collectors run on threads, and a fork can copy a held lock.
+    # Leaving the pool terminates its workers, so a collector stopped at its deadline leaves none running.
+    with get_context('spawn').Pool(workers) as pool:
+        for batch in pool.imap(func, batches):
+            check_deadline()
+            results.extend(batch)
+    return results
+
+
+class DaemonThreadPool(Executor):
+    """Minimal thread pool whose workers are daemon threads.
+
+    ThreadPoolExecutor joins its workers at interpreter exit, so a timed-out
+    collector still running would hold the process open until it finished.
+    Daemon workers do not, and collectors stop early on their own through
+    check_deadline(). Threads are started on demand up to max_workers.
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str = 'collector'):
+        """Initialize the pool; no thread is started until work is submitted"""
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self.work: 'queue.SimpleQueue' = queue.SimpleQueue()
+        self.threads: List[threading.Thread] = []
+        self.idle = threading.Semaphore(0)
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Queue a call and return its future"""
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("cannot submit to a pool that has been shut down")
+            future = Future()
+            self.work.put((future, fn, args, kwargs))
+            # Reuse an idle worker when there is one, else start another up to the limit
+            if not self.idle.acquire(blocking=False) and len(self.threads) < self.max_workers:
+                thread = threading.Thread(target=self._work, daemon=True,
+                                          name=f"{self.thread_name_prefix}_{len(self.threads)}")
+                thread.start()
+                self.threads.append(thread)
+        return future
+
+    def _work(self) -> None:
+        """Worker loop: run queued calls until a None sentinel arrives"""
+        while True:
+            item = self.work.get()
+            if item is None:
+                return
+            future, fn, args, kwargs = item
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+            del item, future
+            self.idle.release()
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """Stop accepting work; queued calls are cancelled or left to run, then workers exit"""
+        with self.lock:
+            self.closed = True
+            if cancel_futures:
+                while True:
+                    try:
+                        item = self.work.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not None:
+                        item[0].cancel()
+            for _ in self.threads:
+                self.work.put(None)
+        if wait:
+            for thread in self.threads:
+                thread.join()
+
+
+class CollectorScheduler:
+    """Thread-pool scheduler for the documentation monitor collectors.
+
+    Every collector is submitted at once and given its own deadline, so a
+    cycle takes as long as the slowest collector rather than the sum of all
+    of them. Deadlines run from when a collector starts, so time spent
+    queued for a worker does not count against it. A collector that misses
+    its deadline is reported as timed out. Python threads cannot be
+    killed, so long collectors call check_deadline() between units of work
+    to stop early; until then the collector runs on a daemon worker, its
+    result is discarded, and its cancel token keeps it from writing to
+    caches a later cycle would read.
+
+    Schedulers given the same pool share its workers, which bounds the
+    collectors running at once across all of them.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, default_timeout: float = 120.0,
+                 pool: Optional[Executor] = None):
+        """Initialize the scheduler.
+
+        Args:
+            max_workers: Thread pool size (default: one thread per collector)
+            default_timeout: Deadline in seconds for collectors without one
+            pool: Executor shared with other schedulers (default: a pool per run)
+        """
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+        self.pool = pool
+
+    def run(self, collectors: Dict[str, Tuple[Callable[[], Any], Optional[float]]],
+            time_budget: Optional[float] = None,
+            unbudgeted: Iterable[str] = ()) -> Dict[str, Dict[str, Any]]:
+        """Run collectors concurrently and return a result record per collector
+
+        Collectors are dispatched in the order given. Each record holds
+        'status' (ok, error or timeout), 'latency_ms' and either 'value' or
+        'error'. A time budget caps the deadline of every collector not
+        named in 'unbudgeted', which only have their own timeout.
+        """
+        if not collectors:
+            return {}
+
+        begun: Dict[str, float] = {}
+        exempt = set(unbudgeted)
+        tokens = {name: CancelToken() for name in collectors}
+
+        def timed(name: str, collector: Callable[[], Any]) -> Tuple[Any, float]:
+            begun[name] = time.perf_counter()
+            tokens[name].deadline = deadline(name)
+            _local.token = tokens[name]
+            try:
+                value = collector()
+            finally:
+                _local.token = None
+            return value, (time.perf_counter() - begun[name]) * 1000
+
+        pool = self.pool or DaemonThreadPool(self.max_workers or len(collectors))
+        started = time.perf_counter()
+        budget_deadline = started + time_budget if time_budget is not None else math.inf
+        timeouts = {name: timeout if timeout is not None else self.default_timeout
+                    for name, (_, timeout) in collectors.items()}
+
+        def deadline(name: str) -> float:
+            # A time budget bounds the whole run, queued or not
+            limit = math.inf if name in exempt else budget_deadline
+            if name not in begun:
+                return limit
+            return min(begun[name] + timeouts[name], limit)
+
+        futures = {name: pool.submit(timed, name, collector) for name, (collector, _) in collectors.items()}
+
+        results = {}
+        pending = dict(futures)
+        while pending:
+            now = time.perf_counter()
+            next_deadline = min(deadline(name) for name in pending)
+            if any(name not in begun for name in pending):
+                next_deadline = min(next_deadline, now + QUEUE_POLL)
+            done, _ = wait(pending.values(),
+                           timeout=max(0.0, next_deadline - now) if next_deadline < math.inf else None,
+                           return_when=FIRST_COMPLETED)
+            now = time.perf_counter()
+            for name, future in list(pending.items()):
+                if future in done:
+                    try:
+                        value, latency = future.result()
+                        results[name] = {'status': 'ok', 'latency_ms': round(latency, 1), 'value': value}
+                    except DeadlineExceeded:
+                        # Stopped itself just before the scheduler noticed the deadline
+                        tokens[name].cancelled = True
+                        results[name] = {'status': 'timeout',
+                                         'latency_ms': round((now - begun[name]) * 1000, 1),
+                                         'error': f"exceeded {deadline(name) - begun[name]:.1f}s deadline"}
+                    except Exception as e:
+                        results[name] = {'status': 'error',
+                                         'latency_ms': round((now - begun.get(name, started)) * 1000, 1),
+                                         'error': f"{type(e).__name__}: {e}"}
+                    del pending[name]
+                elif now >= deadline(name):
+                    future.cancel()
+                    tokens[name].cancelled = True
+                    if name in begun:
+                        error = f"exceeded {deadline(name) - begun[name]:.1f}s deadline"
+                    else:
+                        error = f"not started within the {time_budget:g}s time budget"
+                    results[name] = {'status': 'timeout',
+                                     'latency_ms': round((now - begun.get(name, now)) * 1000, 1),
+                                     'error': error}
+                    del pending[name]
+
+        if self.pool is None:
+            pool.shutdown(wait=False, cancel_futures=True)
+        return {name: results[name] for name in collectors}
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+NetNeural Coverage Ingest
+Streaming lcov, Istanbul json-summary and Go cover profile parsers
+"""
+
+import json
+import posixpath
+from pathlib import Path
+from typing import Dict, List, Any, Iterator, Tuple
+
+from scan_cache import ScanCache
+
+CHUNK_SIZE = 1 << 16
+# Jest writes both of these for the same run; the summary is skipped when the tracefile is ingested
+SAME_RUN_REPORTS = {'coverage-summary.json': 'lcov.info'}
+COUNTERS = ('lines_total', 'lines_covered', 'branches_total', 'branches_covered')
+
+
+def new_counts() -> Dict[str, int]:
+    """Zeroed coverage counters"""
+    return {counter: 0 for counter in COUNTERS}
+
+
+def package_of(source_file: str, root: str) -> str:
+    """Package (directory) a covered source file belongs to, relative to root"""
+    source_file = source_file.replace('\\', '/')
+    if root and source_file.startswith(root + '/'):
+        source_file = source_file[len(root) + 1:]
+    return posixpath.dirname(source_file) or '.'
+
+
+def add_counts(packages: Dict[str, Dict[str, int]], package: str, counts: Dict[str, int]) -> None:
+    """Accumulate counters into a package"""
+    target = packages.setdefault(package, new_counts())
+    for counter in COUNTERS:
+        target[counter] += counts[counter]
+
+
+def parse_lcov(path: Path, root: str) -> Dict[str, Dict[str, int]]:
+    """Aggregate an lcov tracefile per package, one record at a time"""
+    packages: Dict[str, Dict[str, int]] = {}
+    source, record, da_total, da_hit = None, new_counts(), 0, 0
+    with open(path, 'rb') as f:
+        for line in f:
+            # DA lines dominate tracefiles, so they take the cheapest path;
+            # DA:<line>,<hits>[,<checksum>] - only the hit count matters
+            if line.startswith(b'DA:'):
+                fields = line[3:].split(b',', 2)
+                da_total += 1
+                if len(fields) > 1 and fields[1].strip() not in (b'0', b''):
+                    da_hit += 1
+                continue
+            tag, _, value = line.rstrip().partition(b':')
+            if tag == b'SF':
+                source, record, da_total, da_hit = value.decode('utf-8', 'ignore'), new_counts(), 0, 0
+            elif tag == b'LF':
+                record['lines_total'] = int(value)
+            elif tag == b'LH':
+                record['lines_covered'] = int(value)
+            elif tag == b'BRF':
+                record['branches_total'] = int(value)
+            elif tag == b'BRH':
+                record['branches_covered'] = int(value)
+            elif tag == b'end_of_record' and source is not None:
+                if not record['lines_total'] and da_total:
+                    record['lines_total'], record['lines_covered'] = da_total, da_hit
+                add_counts(packages, package_of(source, root), record)
+                source = None
+    return packages
+
+
+def iter_json_object(path: Path) -> Iterator[Tuple[str, Any]]:
+    """Yield (key, value) pairs of a top-level JSON object without loading it whole"""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        position = 0
+        eof = False
+
+        def fill() -> bool:
+            nonlocal buffer, position, eof
+            chunk = f.read(CHUNK_SIZE)
+            buffer = buffer[position:] + chunk
+            position = 0
+            eof = not chunk
+            return bool(chunk)
+
+        def skip_whitespace() -> None:
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position] in ' \t\r\n':
+                    position += 1
+                if position < len(buffer) or not fill():
+                    return
+
+        def decode() -> Any:
+            nonlocal position
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if eof or not fill():
+                        raise
+                    continue
+                # A number at the buffer edge may be truncated; read more first
+                if end == len(buffer) and not eof and fill():
+                    continue
+                position = end
+                return value
+
+        skip_whitespace()
+        if buffer[position:position + 1] != '{':
+            raise ValueError(f"{path} is not a JSON object")
+        position += 1
+        while True:
+            skip_whitespace()
+            if buffer[position:position + 1] == '}':
+                return
+            key = decode()
+            skip_whitespace()
+            position += 1  # ':'
+            skip_whitespace()
+            yield key, decode()
+            skip_whitespace()
+            if buffer[position:position + 1] == ',':
+                position += 1
+
+
+def parse_istanbul_summary(path: Path, root: str) -> Dict[str, Dict[str, int]]:
+    """Aggregate an Istanbul coverage-summary.json per package, entry by entry"""
+    packages: Dict[str, Dict[str, int]] = {}
+    for source, summary in iter_json_object(path):
+        if source == 'total':
+            continue
+        lines = summary.get('lines', {})
+        branches = summary.get('branches', {})
+        add_counts(packages, package_of(source, root), {
+            'lines_total': lines.get('total', 0),
+            'lines_covered': lines.get('covered', 0),
+            'branches_total': branches.get('total', 0),
+            'branches_covered': branches.get('covered', 0),
+        })
+    return packages
+
+
+def parse_go_profile(path: Path, root: str) -> Dict[str, Dict[str, int]]:
+    """Aggregate a Go cover profile per package; statements count as lines"""
+    packages: Dict[str, Dict[str, int]] = {}
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            if line.startswith('mode:'):
+                continue
+            parts = line.split()
+            if len(parts) != 3:
+                continue
+            source = parts[0].rpartition(':')[0]
+            statements, count = int(parts[1]), int(parts[2])
+            target = packages.setdefault(package_of(source, root), new_counts())
+            target['lines_total'] += statements
+            if count > 0:
+                target['lines_covered'] += statements
+    return packages
+
+
+def detect_format(path: Path) -> str:
+    """Guess a coverage report format from its name and first line"""
+    if path.suffix == '.json':
+        return 'istanbul'
+    if path.suffix == '.info':
+        return 'lcov'
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        first_line = f.readline()
+    if first_line.startswith('mode:'):
+        return 'go'
+    return 'lcov'
+
+
+PARSERS = {
+    'lcov': parse_lcov,
+    'istanbul': parse_istanbul_summary,
+    'go': parse_go_profile,
+}
+
+
+def percentage(covered: int, total: int) -> float:
+    """Coverage percentage rounded for reporting"""
+    return round(covered / total * 100, 2) if total else 0.0
+
+
+class CoverageIngestor:
+    """Ingests coverage reports, caching per-package results by report hash."""
+
+    def __init__(self, cache: ScanCache, root: Path):
+        """Initialize with a content cache and the project root for relative packages"""
+        self.cache = cache
+        self.root = str(Path(root).resolve()).replace('\\', '/').rstrip('/')
+
+    def relative(self, path: Path) -> str:
+        """Report path relative to the project root, so snapshots do not depend on the checkout location"""
+        path = str(path).replace('\\', '/')
+        if path.startswith(self.root + '/'):
+            return path[len(self.root) + 1:]
+        return path
+
+    def ingest_report(self, path: Path) -> Tuple[str, Dict[str, Any]]:
+        """Parse one report, or reuse the cached result for identical content"""
+        digest = self.cache.digest(path)
+        cached = self.cache.get(digest)
+        if cached is None:
+            report_format = detect_format(path)
+            cached = {'format': report_format, 'packages': PARSERS[report_format](path, self.root)}
+            self.cache.put(digest, cached)
+        return digest, cached
+
+    def ingest(self, reports: List[Path]) -> Dict[str, Any]:
+        """Combine reports into overall and per-package line and branch coverage"""
+        totals = new_counts()
+        packages: Dict[str, Dict[str, int]] = {}
+        ingested = []
+        unique = list(dict.fromkeys(path.resolve() for path in reports))
+        listed = set(unique)
+        digests = []
+        for path in unique:
+            sibling = SAME_RUN_REPORTS.get(path.name)
+            if sibling and path.with_name(sibling) in listed:
+                continue
+            digest, result = self.ingest_report(path)
+            digests.append(digest)
+            ingested.append({'path': self.relative(path), 'format': result['format']})
+            for package, counts in result['packages'].items():
+                add_counts(packages, package, counts)
+                for counter in COUNTERS:
+                    totals[counter] += counts[counter]
+        self.cache.save(digests)
+
+        return {
+            'line_pct': percentage(totals['lines_covered'], totals['lines_total']),
+            'branch_pct': percentage(totals['branches_covered'], totals['branches_total']),
+            **totals,
+            'reports': ingested,
+            'packages': {
+                package: {
+                    'line_pct': percentage(counts['lines_covered'], counts['lines_total']),
+                    'branch_pct': percentage(counts['branches_covered'], counts['branches_total']),
+                    'lines_total': counts['lines_total'],
+                    'branches_total': counts['branches_total'],
+                }
+                for package, counts in sorted(packages.items())
+            }
+        }
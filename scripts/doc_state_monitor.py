@@ -6,82 +6,323 @@ Continuously monitors documentation alignment with project reality
 
 import os
 import json
-import yaml
-import requests
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Tuple
 import subprocess
 import re
+import argparse
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from scan_cache import ScanCache, ScanCacheGroup
+from endpoint_scanner import EndpointScanner
+from snapshot_store import SnapshotStore
+from history_rollups import HistoryCompactor
+from collector_scheduler import CollectorScheduler, DaemonThreadPool, abandoned
+from collector_registry import CollectorRegistry, CollectorSpec
+from manifest_cache import ManifestCache
+from file_index import FileIndex, is_glob
+from state_tree import state_hashes, diff_states
+from loc_counter import LocCounter, LANGUAGES, COUNTERS
+from scan_sampler import StratifiedSampler
+from coverage_ingest import CoverageIngestor
+from test_results_ingest import TestResultsIngestor
+from sql_analyzer import SchemaAnalyzer, CACHE_VERSION as SQL_CACHE_VERSION
+from schema_drift import SchemaDriftDetector
+from doc_validator import DocValidator, accuracy_score, SOURCE_GLOBS
+from link_checker import LinkChecker
+from structured_logging import configure_logging, get_logger
+
+if TYPE_CHECKING:
+    from trend_engine import MetricsMatrix
+
+logger = get_logger(__name__)
+
+STATE_SECTIONS = ('technical_metrics', 'business_metrics', 'project_metrics', 'documentation_health', 'schema')
 
 class DocumentationStateMonitor:
-    def __init__(self, config_path: str = "ai_blueprint_config.yaml"):
-        """Initialize the documentation state monitor"""
+    def __init__(self, config_path: str = "ai_blueprint_config.yaml", workspace: Optional[Dict[str, str]] = None,
+                 scheduler: Optional[CollectorScheduler] = None, caches: Optional[ScanCacheGroup] = None):
+        """Initialize the documentation state monitor
+        
+        A workspace ({'name', 'path'}) replaces project.base_path. Monitors of
+        several workspaces pass the same scheduler and cache group, to share
+        one worker pool and the content-addressed scan caches.
+        """
         self.config = self.load_config(config_path)
-        self.base_path = Path(self.config['project']['base_path'])
+        self.workspace = workspace['name'] if workspace else None
+        self.base_path = Path(workspace['path'] if workspace else self.config['project']['base_path'])
         self.docs_path = self.base_path / "docs"
         self.history_path = self.docs_path / "generated" / "analysis" / "history"
         self.history_path.mkdir(exist_ok=True)
+        self.cache_path = self.base_path / self.config['documentation'].get(
+            'cache_path', 'docs/generated/analysis/cache/')
+        store_config = self.config['historical_analysis'].get('snapshot_store', {})
+        self.snapshot_store = SnapshotStore(
+            self.history_path, store_config.get('keyframe_interval', 24), store_config.get('codec', 'json'))
+        self.history_compactor = HistoryCompactor(
+            self.snapshot_store, self.config['historical_analysis'].get('compaction'))
+        self._metrics_matrix = None
+        self._nodes_compared = 0
+        self._sample_deadline = None
+        self._doc_validation = None
+        self._doc_validation_lock = threading.Lock()
+        self.caches = caches
+        collector_config = self.config['monitoring'].get('collectors', {})
+        self.collector_scheduler = scheduler or CollectorScheduler(
+            collector_config.get('max_workers'), collector_config.get('default_timeout', 120))
+        index_config = self.config['monitoring'].get('file_index', {})
+        self.file_index = FileIndex(
+            self.base_path, index_config.get('backend', 'git'), index_config.get('include_untracked', False))
+        self.collector_registry = CollectorRegistry(
+            self.base_path, self.cache_path / "collectors.json", collector_config.get('cost_ttl'), self.file_index)
+        self.manifests = ManifestCache(self.cache_path / "manifests.json")
+        self.register_collectors()
         
+    def scan_cache(self, namespace: str, version: int = 1) -> ScanCache:
+        """Content-addressed cache of a collector, shared across workspaces when monitoring several"""
+        if self.caches is not None:
+            return self.caches.cache(namespace, version)
+        return ScanCache(self.cache_path, namespace, version)
+    
     def load_config(self, config_path: str) -> Dict[str, Any]:
         """Load configuration from YAML file"""
+        import yaml
+        
         with open(config_path, 'r') as f:
             return yaml.safe_load(f)
     
-    def scan_repository_state(self) -> Dict[str, Any]:
-        """Scan current repository state and collect metrics"""
-        state = {
-            'timestamp': datetime.now().isoformat(),
-            'technical_metrics': self.collect_technical_metrics(),
-            'business_metrics': self.collect_business_metrics(),
-            'project_metrics': self.collect_project_metrics(),
-            'documentation_health': self.assess_documentation_health()
+    def register_collectors(self) -> None:
+        """Declare metric collectors with their inputs, cost class and cache TTL"""
+        collector_config = self.config['monitoring'].get('collectors', {})
+        ttls = collector_config.get('ttl', {})
+        timeouts = collector_config.get('timeouts', {})
+        api_sources = self.config['technical_metrics'].get('api_sources', {})
+        epic_file = self.config['project_analysis']['epic_tracking']['completion_tracking_file']
+        roadmap_file = self.config['project_analysis']['milestone_tracking']['roadmap_file']
+        schema_config = self.config['technical_metrics'].get('schema_analysis', {})
+        migrations_path = schema_config.get('migrations_path', 'development/supabase/migrations')
+        edge_functions_path = api_sources.get('edge_functions_path', 'development/supabase/functions')
+        component_roots = ['development', 'supabase']
+        # Doc scores check references against edge functions, tables and the types and
+        # environment variables of every source file the validator indexes
+        doc_inputs = ['**/*.md', 'docs', edge_functions_path, migrations_path, *SOURCE_GLOBS]
+        
+        collectors = [
+            # (section, metric, collector, cost class, inputs)
+            ('technical_metrics', 'services', self.count_services, 'moderate', component_roots),
+            ('technical_metrics', 'frontend_apps', self.count_frontend_apps, 'moderate', component_roots),
+            ('technical_metrics', 'mobile_apps', self.count_mobile_apps, 'moderate', component_roots),
+            ('technical_metrics', 'infrastructure_components', self.count_infrastructure, 'expensive',
+             ['**/docker-compose*.yml', '**/k8s/*.yaml', '**/*.tf']),
+            ('technical_metrics', 'api_endpoints', self.count_api_endpoints, 'moderate',
+             [edge_functions_path, api_sources.get('app_router_path', 'development/src/app')]),
+            ('technical_metrics', 'test_coverage', self.calculate_test_coverage, 'moderate', []),
+            ('technical_metrics', 'test_results', self.ingest_test_results, 'cheap', []),
+            ('technical_metrics', 'code_inventory', self.count_lines_of_code, 'expensive',
+             [f"**/*{extension}" for extension in LANGUAGES]),
+            ('business_metrics', 'market_data_freshness', self.check_market_data_freshness, 'cheap',
+             ['docs/generated/business']),
+            ('business_metrics', 'competitive_analysis_age', self.check_competitive_analysis_age, 'cheap',
+             ['docs/generated/business']),
+            ('business_metrics', 'customer_satisfaction_data', self.get_customer_satisfaction, 'cheap', []),
+            ('business_metrics', 'financial_projections_accuracy', self.assess_financial_accuracy, 'cheap', []),
+            ('project_metrics', 'mvp_completion', self.calculate_mvp_completion, 'moderate', component_roots),
+            ('project_metrics', 'epic_completion', self.track_epic_completion, 'cheap', [epic_file]),
+            ('project_metrics', 'milestone_progress', self.track_milestone_progress, 'cheap', [roadmap_file]),
+            ('project_metrics', 'team_velocity', self.calculate_team_velocity, 'cheap', []),
+            ('documentation_health', 'technical_docs_accuracy', self.validate_technical_docs, 'moderate', doc_inputs),
+            ('documentation_health', 'business_docs_accuracy', self.validate_business_docs, 'moderate', doc_inputs),
+            ('documentation_health', 'analysis_docs_relevance', self.validate_analysis_docs, 'moderate', doc_inputs),
+            ('documentation_health', 'code_references', self.summarize_code_references, 'moderate', doc_inputs),
+            # Links may point at any file or directory, so any added or removed path can break one
+            ('documentation_health', 'links', self.check_markdown_links, 'moderate', ['**/*']),
+            ('schema', 'migrations', self.analyze_migrations, 'moderate', [migrations_path]),
+            ('schema', 'type_drift', self.detect_schema_drift, 'moderate',
+             [migrations_path, schema_config.get('types_file', 'development/src/types/supabase.ts')]),
+            ('schema', 'database_dumps', self.analyze_database_dumps, 'expensive', []),
+        ]
+        # Untracked build outputs, fingerprinted by mtime and size as the collectors glob them
+        artifacts = {
+            'test_coverage': self.config['technical_metrics'].get('coverage_reports', []),
+            'database_dumps': schema_config.get('dumps', []),
+        }
+        for section, name, collector, cost, inputs in collectors:
+            self.collector_registry.register(CollectorSpec(
+                name, section, collector, inputs=inputs, cost=cost,
+                ttl=ttls.get(name), timeout=timeouts.get(name), artifacts=artifacts.get(name, ())))
+    
+    def scan_repository_state(self, since: Optional[str] = None,
+                              time_budget: Optional[float] = None) -> Dict[str, Any]:
+        """Scan current repository state and collect metrics
+        
+        With 'since' (a revision, or 'last' for the previous snapshot's commit)
+        only collectors whose inputs changed are run; every other metric is
+        carried over from the previous snapshot.
+        
+        With 'time_budget' (seconds) collectors are cut off at the budget and
+        the code inventory samples directories outside the high-value roots,
+        reporting estimates with confidence intervals.
+        
+        A collector that fails without a cached value keeps the value of the
+        previous snapshot. Snapshots holding estimates, timed-out collectors
+        or such stale values are marked approximate.
+        """
+        started = time.monotonic()
+        plan = self.plan_incremental_scan(since) if since else None
+        if time_budget is not None:
+            budget_config = self.config['monitoring'].get('time_budget', {})
+            self._sample_deadline = started + time_budget * budget_config.get('sampling_share', 0.8)
+        # Planning has already spent part of the budget
+        remaining = None if time_budget is None else max(0.0, started + time_budget - time.monotonic())
+        try:
+            results = self.run_collectors(plan['collectors'] if plan else None, remaining)
+        finally:
+            self._sample_deadline = None
+        
+        state = {'timestamp': datetime.now().isoformat(), 'commit': self.file_index.head_commit()}
+        previous_state = plan['previous_state'] if plan else None
+        for section in STATE_SECTIONS:
+            state[section] = {}
+            for spec in self.collector_registry.section(section):
+                if spec.name in results:
+                    result = results[spec.name]
+                    if result['status'] in ('error', 'timeout') and result['value'] is None:
+                        # No cached value to fall back on: carry the last recorded one rather than None
+                        if previous_state is None:
+                            previous_state = self.load_latest_state() or {}
+                        previous = previous_state.get(section, {}).get(spec.name)
+                        if previous is not None:
+                            result.update(value=previous, stale=True)
+                    state[section][spec.name] = result['value']
+                else:
+                    state[section][spec.name] = plan['previous_state'][section][spec.name]
+                    results[spec.name] = {'status': 'reused', 'latency_ms': 0.0}
+        state['documentation_health'] = self.score_documentation_health(state['documentation_health'])
+        
+        for name, result in results.items():
+            if result['status'] in ('error', 'timeout'):
+                logger.warning("collector_failed", collector=name, status=result['status'],
+                               error=result['error'], workspace=self.workspace)
+        state['collectors'] = {
+            name: {key: value for key, value in result.items() if key != 'value'}
+            for name, result in results.items()
         }
+        state['merkle'] = state_hashes(state, STATE_SECTIONS)
+        if plan:
+            state['scan'] = {'mode': 'incremental', 'base_commit': plan['base_commit'],
+                             'changed_paths': plan['changed_paths'], 'collectors_run': len(plan['collectors'])}
+        # Sampled estimates, timed-out collectors and stale values all make the snapshot inexact
+        state['approximate'] = any(
+            isinstance(value, dict) and value.get('sampling', {}).get('approximate')
+            for section in STATE_SECTIONS for value in state[section].values()) or any(
+            result['status'] == 'timeout' or result.get('stale') for result in results.values())
+        if time_budget is not None:
+            state['scan'] = dict(state.get('scan', {'mode': 'full'}), time_budget_s=time_budget,
+                                 elapsed_s=round(time.monotonic() - started, 2))
         return state
     
+    def plan_incremental_scan(self, since: str) -> Optional[Dict[str, Any]]:
+        """Work out which collectors are affected by the changes since a revision
+        
+        Returns the previous snapshot, the base commit, the number of changed
+        paths and the collectors to run, or None (a full scan) when there is
+        no previous snapshot or the changed paths cannot be determined.
+        """
+        previous_state = self.load_latest_state()
+        if not previous_state:
+            logger.info("full_scan", reason="no previous snapshot", workspace=self.workspace)
+            return None
+        base_commit = previous_state.get('commit') if since == 'last' else since
+        changed = self.file_index.changed_since(base_commit) if base_commit else None
+        if changed is None:
+            logger.info("full_scan", reason=f"cannot diff against {base_commit or 'the previous snapshot'}",
+                        workspace=self.workspace)
+            return None
+        
+        names = [spec.name for spec in self.collector_registry.specs.values()
+                 if self.is_collector_affected(spec, changed, previous_state)]
+        logger.info("incremental_scan", base_commit=base_commit, changed_paths=len(changed),
+                    collectors=len(names), collectors_total=len(self.collector_registry.specs),
+                    workspace=self.workspace)
+        return {
+            'previous_state': previous_state,
+            'base_commit': base_commit,
+            'changed_paths': len(changed),
+            'collectors': names
+        }
+    
+    def is_collector_affected(self, spec: CollectorSpec, changed: List[str],
+                              previous_state: Dict[str, Any]) -> bool:
+        """Whether a collector must re-run for a set of changed paths
+        
+        Collectors without declared inputs, with artifacts or with inputs git
+        does not track (build outputs such as coverage reports), can't be
+        ruled out by a diff and always run. Glob inputs ('**/*.md') match changed paths.
+        """
+        if spec.name not in previous_state.get(spec.section, {}):
+            return True
+        if not spec.inputs or spec.artifacts:
+            return True
+        for relative in spec.inputs:
+            relative = Path(relative).as_posix().strip('/')
+            if relative in ('', '.'):
+                if changed:
+                    return True
+                continue
+            if is_glob(relative):
+                regex = self.file_index.matcher(relative)
+                if any(regex.match(path) for path in changed):
+                    return True
+                continue
+            if not self.file_index.is_tracked(relative):
+                return True
+            if any(path == relative or path.startswith(relative + '/') for path in changed):
+                return True
+        return False
+    
+    def run_collectors(self, names: List[str] = None,
+                       time_budget: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Run (or serve from cache) collectors, sharing one manifest pass, file listing and doc check"""
+        self.manifests.reset_run()
+        self.file_index.reset()
+        self._doc_validation = None
+        results = self.collector_registry.run(self.collector_scheduler, names, time_budget)
+        self.manifests.save()
+        return results
+    
+    def collect_section(self, section: str) -> Dict[str, Any]:
+        """Collect (or serve from cache) every metric of one state section"""
+        names = [spec.name for spec in self.collector_registry.section(section)]
+        results = self.run_collectors(names)
+        return {name: results[name]['value'] for name in names}
+    
     def collect_technical_metrics(self) -> Dict[str, Any]:
         """Collect technical project metrics"""
-        metrics = {
-            'services': self.count_services(),
-            'frontend_apps': self.count_frontend_apps(),
-            'mobile_apps': self.count_mobile_apps(),
-            'infrastructure_components': self.count_infrastructure(),
-            'api_endpoints': self.count_api_endpoints(),
-            'test_coverage': self.calculate_test_coverage()
-        }
-        return metrics
+        return self.collect_section('technical_metrics')
     
     def collect_business_metrics(self) -> Dict[str, Any]:
         """Collect business intelligence metrics"""
-        metrics = {
-            'market_data_freshness': self.check_market_data_freshness(),
-            'competitive_analysis_age': self.check_competitive_analysis_age(),
-            'customer_satisfaction_data': self.get_customer_satisfaction(),
-            'financial_projections_accuracy': self.assess_financial_accuracy()
-        }
-        return metrics
+        return self.collect_section('business_metrics')
     
     def collect_project_metrics(self) -> Dict[str, Any]:
         """Collect project progression metrics"""
-        metrics = {
-            'mvp_completion': self.calculate_mvp_completion(),
-            'epic_completion': self.track_epic_completion(),
-            'milestone_progress': self.track_milestone_progress(),
-            'team_velocity': self.calculate_team_velocity()
-        }
-        return metrics
+        return self.collect_section('project_metrics')
     
     def assess_documentation_health(self) -> Dict[str, Any]:
         """Assess current documentation health and accuracy"""
-        health = {
-            'technical_docs_accuracy': self.validate_technical_docs(),
-            'business_docs_freshness': self.validate_business_docs(),
-            'analysis_docs_relevance': self.validate_analysis_docs(),
-            'overall_health_score': 0.0
-        }
+        return self.score_documentation_health(self.collect_section('documentation_health'))
+    
+    def score_documentation_health(self, health: Dict[str, Any]) -> Dict[str, Any]:
+        """Add the overall health score to the documentation health metrics"""
+        health = dict(health, overall_health_score=0.0)
         
-        # Calculate overall health score
-        scores = [v for v in health.values() if isinstance(v, (int, float))]
+        # Calculate overall health score from the 0-10 scores, not the placeholder itself; categories
+        # without references score None and stay out of the average
+        scores = [v for k, v in health.items()
+                  if k != 'overall_health_score' and isinstance(v, (int, float)) and not isinstance(v, bool)]
         if scores:
             health['overall_health_score'] = sum(scores) / len(scores)
             
@@ -98,8 +339,8 @@ class DocumentationStateMonitor:
         }
         
         # Scan directories for Go services
-        for item in self.base_path.iterdir():
-            if item.is_dir() and (item / "go.mod").exists():
+        for item in self.file_index.children():
+            if item.is_dir() and self.manifests.go_mod(item) is not None:
                 services['total'] += 1
                 services['go_services'] += 1
                 
@@ -119,27 +360,22 @@ class DocumentationStateMonitor:
         }
         
         # Look for React applications
-        frontend_indicators = ['package.json', 'src/', 'public/']
-        for item in self.base_path.iterdir():
-            if item.is_dir() and (item / "package.json").exists():
-                package_json = item / "package.json"
-                try:
-                    with open(package_json, 'r') as f:
-                        package_data = json.load(f)
-                        deps = package_data.get('dependencies', {})
-                        
-                        if 'react' in deps:
-                            apps['total'] += 1
-                            apps['react_apps'] += 1
-                            
-                            if 'typescript' in deps or '@types/react' in deps:
-                                apps['typescript_apps'] += 1
-                                
-                            # Assess production readiness
-                            if self.is_frontend_production_ready(item):
-                                apps['production_ready'] += 1
-                except json.JSONDecodeError:
-                    continue
+        for item in self.file_index.children():
+            package_data = self.manifests.package_json(item) if item.is_dir() else None
+            if package_data is None:
+                continue
+            deps = package_data['dependencies']
+            
+            if 'react' in deps:
+                apps['total'] += 1
+                apps['react_apps'] += 1
+                
+                if 'typescript' in deps or '@types/react' in deps:
+                    apps['typescript_apps'] += 1
+                    
+                # Assess production readiness
+                if self.is_frontend_production_ready(item):
+                    apps['production_ready'] += 1
         
         return apps
     
@@ -153,7 +389,7 @@ class DocumentationStateMonitor:
         }
         
         # Look for mobile app indicators
-        for item in self.base_path.iterdir():
+        for item in self.file_index.children():
             if item.is_dir():
                 # Check for iOS
                 if (item / "ios").exists() and (item / "ios" / "Podfile").exists():
@@ -166,15 +402,9 @@ class DocumentationStateMonitor:
                     apps['total'] += 1
                 
                 # Check for React Native
-                if (item / "package.json").exists():
-                    try:
-                        with open(item / "package.json", 'r') as f:
-                            package_data = json.load(f)
-                            deps = package_data.get('dependencies', {})
-                            if 'react-native' in deps:
-                                apps['react_native_apps'] += 1
-                    except (json.JSONDecodeError, IOError):
-                        continue
+                package_data = self.manifests.package_json(item)
+                if package_data and 'react-native' in package_data['dependencies']:
+                    apps['react_native_apps'] += 1
         
         return apps
     
@@ -182,19 +412,65 @@ class DocumentationStateMonitor:
         """Count infrastructure components"""
         return {
             'total': 0,
-            'docker_compose_files': len(list(self.base_path.rglob("docker-compose*.yml"))),
-            'kubernetes_configs': len(list(self.base_path.rglob("k8s/*.yaml"))),
-            'terraform_configs': len(list(self.base_path.rglob("*.tf")))
+            'docker_compose_files': len(self.file_index.rglob("docker-compose*.yml")),
+            'kubernetes_configs': len(self.file_index.rglob("k8s/*.yaml")),
+            'terraform_configs': len(self.file_index.rglob("*.tf"))
         }
     
-    def count_api_endpoints(self) -> int:
-        """Count API endpoints across services"""
+    def count_api_endpoints(self) -> Dict[str, Any]:
+        """Count API endpoints across Go services, edge functions and app routes"""
+        api_sources = self.config['technical_metrics'].get('api_sources', {})
+        endpoints = {
+            'total': 0,
+            'go_routes': self.count_go_routes(),
+            'edge_functions': 0,
+            'edge_function_endpoints': 0,
+            'app_route_handlers': 0,
+            'app_route_endpoints': 0,
+            'app_pages': 0,
+            'functions': {}
+        }
+        
+        cache = self.scan_cache('endpoints')
+        scanner = EndpointScanner(cache, api_sources.get('max_workers', 8), self.file_index)
+        
+        functions = scanner.scan_edge_functions(
+            self.base_path / api_sources.get('edge_functions_path', 'development/supabase/functions'))
+        for name, info in functions.items():
+            endpoints['functions'][name] = {
+                'path': info['path'],
+                'handler': info['handler'],
+                'methods': info['methods'],
+                'routes': info['routes'],
+                'endpoints': info['endpoints']
+            }
+            endpoints['edge_function_endpoints'] += info['endpoints']
+        endpoints['edge_functions'] = len(functions)
+        
+        app_routes = scanner.scan_app_routes(
+            self.base_path / api_sources.get('app_router_path', 'development/src/app'))
+        endpoints['app_route_handlers'] = len(app_routes['handlers'])
+        endpoints['app_route_endpoints'] = sum(
+            len(route['methods']) for route in app_routes['handlers'].values())
+        endpoints['app_pages'] = len(app_routes['pages'])
+        
+        endpoints['total'] = (endpoints['go_routes'] +
+                              endpoints['edge_function_endpoints'] +
+                              endpoints['app_route_endpoints'])
+        
+        live = [info['hash'] for info in functions.values()]
+        live += [route['hash'] for route in app_routes['handlers'].values()]
+        cache.save(live)
+        return endpoints
+    
+    def count_go_routes(self) -> int:
+        """Count HTTP route registrations in Go services"""
         # Simplified: count route definitions in Go services
         endpoint_count = 0
-        for item in self.base_path.iterdir():
-            if item.is_dir() and (item / "go.mod").exists():
+        for item in self.file_index.children():
+            if item.is_dir() and self.manifests.go_mod(item) is not None:
                 # Count HTTP route registrations
-                for go_file in item.rglob("*.go"):
+                for go_file in self.file_index.rglob("*.go", item):
                     try:
                         with open(go_file, 'r') as f:
                             content = f.read()
@@ -209,10 +485,87 @@ class DocumentationStateMonitor:
                         continue
         return endpoint_count
     
-    def calculate_test_coverage(self) -> float:
-        """Calculate test coverage percentage"""
-        # Stub: return 0 for now
-        return 0.0
+    def calculate_test_coverage(self) -> Dict[str, Any]:
+        """Calculate line and branch test coverage from coverage reports"""
+        patterns = self.config['technical_metrics'].get('coverage_reports', [])
+        reports = []
+        for pattern in patterns:
+            reports.extend(sorted(path for path in self.base_path.glob(pattern) if path.is_file()))
+        
+        ingestor = CoverageIngestor(self.scan_cache('coverage'), self.base_path)
+        return ingestor.ingest(reports)
+    
+    def ingest_test_results(self) -> Dict[str, Any]:
+        """Collect pass/fail/skip counts, retries and slowest tests from test runs"""
+        test_reports = self.config['technical_metrics'].get('test_reports', {})
+        reports = []
+        for pattern in test_reports.get('paths', []):
+            reports.extend(sorted(path for path in self.base_path.glob(pattern) if path.is_file()))
+        
+        ingestor = TestResultsIngestor(self.scan_cache('test_results'), self.base_path)
+        return ingestor.ingest(reports, test_reports.get('slowest', 10))
+    
+    def count_lines_of_code(self) -> Dict[str, Any]:
+        """Count code, comment and blank lines per language and directory"""
+        inventory_config = self.config['technical_metrics'].get('code_inventory', {})
+        api_sources = self.config['technical_metrics'].get('api_sources', {})
+        counter = LocCounter(
+            self.scan_cache('code_inventory'), self.base_path,
+            [api_sources.get('edge_functions_path', 'development/supabase/functions')],
+            inventory_config.get('max_workers'), inventory_config.get('rollup_depth', 2))
+        if self._sample_deadline is None:
+            return counter.count(self.file_index.files())
+        
+        # Time-budgeted scan: high-value roots in full, a stratified sample of the rest
+        budget_config = self.config['monitoring'].get('time_budget', {})
+        sampler = StratifiedSampler(counter.measure, budget_config.get('confidence', 0.95), budget_config.get('seed'))
+        files = [relative for relative in self.file_index.files() if counter.classify(relative)]
+        estimate = sampler.run(files, budget_config.get('high_value_roots', []),
+                               budget_config.get('stratum_depth', 2), self._sample_deadline)
+        # Unsampled files keep their cached counts for the next full scan
+        counter.cache.save()
+        inventory = counter.rollup(estimate['units'])
+        intervals = estimate['confidence_intervals']
+        inventory['confidence_intervals'] = {name: intervals[name] for name in COUNTERS if name in intervals}
+        inventory['sampling'] = estimate['sampling']
+        return inventory
+    
+    def analyze_migrations(self) -> Dict[str, Any]:
+        """Count tables, RLS policies, functions, triggers and indexes per migration and net"""
+        schema_config = self.config['technical_metrics'].get('schema_analysis', {})
+        migrations_path = self.base_path / schema_config.get('migrations_path', 'development/supabase/migrations')
+        migrations = sorted(migrations_path.glob('*.sql')) if migrations_path.is_dir() else []
+        
+        analyzer = SchemaAnalyzer(self.scan_cache('migrations', SQL_CACHE_VERSION))
+        result = analyzer.analyze_migrations(migrations)
+        analyzer.save()
+        return result
+    
+    def detect_schema_drift(self) -> Dict[str, Any]:
+        """Compare tables and columns left by the migrations with the generated Supabase types"""
+        schema_config = self.config['technical_metrics'].get('schema_analysis', {})
+        migrations_path = self.base_path / schema_config.get('migrations_path', 'development/supabase/migrations')
+        types_file = self.base_path / schema_config.get('types_file', 'development/src/types/supabase.ts')
+        if not types_file.is_file():
+            return {}
+        migrations = sorted(migrations_path.glob('*.sql')) if migrations_path.is_dir() else []
+        
+        detector = SchemaDriftDetector(self.scan_cache('schema_drift', SQL_CACHE_VERSION))
+        drift = detector.detect(types_file, migrations)
+        detector.save()
+        return drift
+    
+    def analyze_database_dumps(self) -> Dict[str, Any]:
+        """Count schema objects in database dumps, streaming each through a memory map"""
+        schema_config = self.config['technical_metrics'].get('schema_analysis', {})
+        dumps = []
+        for pattern in schema_config.get('dumps', []):
+            dumps.extend(path for path in self.base_path.glob(pattern) if path.is_file())
+        
+        analyzer = SchemaAnalyzer(self.scan_cache('database_dumps', SQL_CACHE_VERSION))
+        result = analyzer.analyze_dumps(dumps)
+        analyzer.save()
+        return result
     
     def check_market_data_freshness(self) -> int:
         """Check age of market data in days"""
@@ -242,33 +595,120 @@ class DocumentationStateMonitor:
         """Calculate team velocity"""
         return 0.0
     
-    def validate_technical_docs(self) -> float:
-        """Validate technical documentation accuracy"""
-        return 0.0
+    def validate_documentation(self) -> Dict[str, Dict[str, Any]]:
+        """Check code references in every markdown document, once per collector run
+        
+        The documentation health collectors run concurrently and share this
+        result. Each document maps to its reference count and the
+        references no edge function, table, exported type or environment
+        variable in the repository matches.
+        """
+        with self._doc_validation_lock:
+            if self._doc_validation is None:
+                validation_config = self.config['documentation'].get('validation', {})
+                excluded = tuple(root.strip('/') + '/' for root in validation_config.get('exclude', []))
+                api_sources = self.config['technical_metrics'].get('api_sources', {})
+                schema_config = self.config['technical_metrics'].get('schema_analysis', {})
+                migrations_path = self.base_path / schema_config.get('migrations_path', 'development/supabase/migrations')
+                migrations = sorted(migrations_path.glob('*.sql')) if migrations_path.is_dir() else []
+                
+                files = self.file_index.files()
+                documents = [f for f in files if f.endswith('.md') and not f.startswith(excluded)]
+                validator = DocValidator(
+                    self.scan_cache('doc_references', SQL_CACHE_VERSION), self.base_path)
+                index = validator.build_index(
+                    files, api_sources.get('edge_functions_path', 'development/supabase/functions'), migrations)
+                results = validator.validate(documents, index)
+                validator.save()
+                # An abandoned validation may finish during a later cycle, which must not see it
+                if abandoned():
+                    return results
+                self._doc_validation = results
+            return self._doc_validation
     
-    def validate_business_docs(self) -> float:
-        """Validate business documentation freshness"""
-        return 0.0
+    def documents_in(self, category: str) -> List[str]:
+        """Validated documents under a category's roots; 'technical' is every document outside the others"""
+        categories = self.config['documentation'].get('validation', {}).get('categories', {})
+        documents = self.validate_documentation()
+        if category != 'technical':
+            roots = tuple(root.strip('/') + '/' for root in categories.get(category, []))
+            return [doc for doc in documents if doc.startswith(roots)]
+        others = tuple(root.strip('/') + '/' for roots in categories.values() for root in roots)
+        return [doc for doc in documents if not doc.startswith(others)]
     
-    def validate_analysis_docs(self) -> float:
-        """Validate analysis documentation relevance"""
-        return 0.0
+    def validate_technical_docs(self) -> Optional[float]:
+        """Validate technical documentation accuracy (0-10 share of code references that resolve)"""
+        return accuracy_score(self.validate_documentation(), self.documents_in('technical'))
+    
+    def validate_business_docs(self) -> Optional[float]:
+        """Validate business documentation accuracy (0-10 share of code references that resolve)"""
+        return accuracy_score(self.validate_documentation(), self.documents_in('business'))
+    
+    def validate_analysis_docs(self) -> Optional[float]:
+        """Validate analysis documentation code references"""
+        return accuracy_score(self.validate_documentation(), self.documents_in('analysis'))
+    
+    def summarize_code_references(self) -> Dict[str, Any]:
+        """Reference counts by kind and the unresolved references of each document"""
+        results = self.validate_documentation()
+        by_kind: Dict[str, Dict[str, int]] = {}
+        for result in results.values():
+            for kind, _, _ in result['unresolved']:
+                by_kind.setdefault(kind, {'unresolved': 0})['unresolved'] += 1
+        return {
+            'documents': len(results),
+            'references': sum(result['references'] for result in results.values()),
+            'unresolved': sum(len(result['unresolved']) for result in results.values()),
+            'unresolved_by_kind': {kind: counts['unresolved'] for kind, counts in sorted(by_kind.items())},
+            'unresolved_references': {doc: [f"{kind}:{name}@{line}" for kind, name, line in result['unresolved']]
+                                      for doc, result in results.items() if result['unresolved']},
+        }
+    
+    def check_markdown_links(self) -> Dict[str, Any]:
+        """Check relative links and heading anchors across every markdown document"""
+        validation_config = self.config['documentation'].get('validation', {})
+        checker = LinkChecker(self.scan_cache('links', version=2), self.base_path,
+                              validation_config.get('max_workers'))
+        return checker.check(self.file_index.files(), validation_config.get('exclude', []))
+    
+    def compare_section(self, previous: Dict, current: Dict, section: str) -> Dict:
+        """Path-level changes to one state section, keyed by metric path
+        
+        Each state carries Merkle hashes of its subtrees, so only branches
+        whose hashes differ are descended into.
+        """
+        if section not in previous:
+            return {}
+        diff = diff_states(previous, current, [section])
+        self._nodes_compared += diff['nodes_visited']
+        return {record['path']: record for record in diff['sections'][section]}
     
     def compare_technical_metrics(self, previous: Dict, current: Dict) -> Dict:
         """Compare technical metrics between states"""
-        return {}
+        return self.compare_section(previous, current, 'technical_metrics')
     
     def compare_business_metrics(self, previous: Dict, current: Dict) -> Dict:
         """Compare business metrics between states"""
-        return {}
+        return self.compare_section(previous, current, 'business_metrics')
     
     def compare_project_metrics(self, previous: Dict, current: Dict) -> Dict:
         """Compare project metrics between states"""
-        return {}
+        return self.compare_section(previous, current, 'project_metrics')
     
     def identify_significant_changes(self, changes: Dict) -> None:
         """Identify significant changes"""
-        pass
+        threshold = self.config['monitoring']['change_detection']['minimum_significance_threshold']
+        for key in ('technical_changes', 'business_changes', 'project_changes', 'health_changes',
+                    'schema_changes'):
+            for path, record in changes[key].items():
+                if record['type'] != 'changed':
+                    changes['significant_changes'].append(f"{path} {record['type']}")
+                elif 'change_pct' not in record:
+                    changes['significant_changes'].append(f"{path} changed")
+                elif record['change_pct'] is None or abs(record['change_pct']) >= threshold:
+                    change_pct = f" ({record['change_pct']:+.1f}%)" if record['change_pct'] is not None else ''
+                    changes['significant_changes'].append(
+                        f"{path}: {record['from']:g} -> {record['to']:g}{change_pct}")
     
     def generate_technical_recommendations(self, changes: Dict) -> List[Dict]:
         """Generate technical documentation recommendations"""
@@ -288,23 +728,46 @@ class DocumentationStateMonitor:
     
     def load_historical_snapshots(self, days: int) -> List[Dict]:
         """Load historical snapshots for the specified number of days"""
-        return []
+        max_points = self.config['historical_analysis']['trend_analysis'].get('max_points', 400)
+        _, snapshots = self.history_compactor.load_points(days, max_points)
+        return snapshots
+    
+    def build_metrics_matrix(self, snapshots: List[Dict]) -> 'MetricsMatrix':
+        """Build (once per snapshot list) the snapshots x metrics matrix"""
+        # numpy is only needed once trends are computed, not by --metric, --serve scrapes or --workspaces
+        from trend_engine import MetricsMatrix
+        
+        if self._metrics_matrix is None or self._metrics_matrix[0] is not snapshots:
+            self._metrics_matrix = (snapshots, MetricsMatrix.from_snapshots(snapshots))
+        return self._metrics_matrix[1]
+    
+    def analyze_section_trends(self, snapshots: List[Dict], section: str) -> Dict:
+        """Compute vectorized trends for every metric under a state section"""
+        from trend_engine import compute_trends
+        
+        analysis_config = self.config['historical_analysis']
+        matrix = self.build_metrics_matrix(snapshots).select(section + '.')
+        return compute_trends(
+            matrix,
+            window_days=analysis_config['trend_analysis'].get('short_term', 7),
+            min_change_pct=analysis_config['change_significance'].get('minor_change', 5)
+        )
     
     def analyze_technical_trends(self, snapshots: List[Dict]) -> Dict:
         """Analyze technical trends from historical data"""
-        return {}
+        return self.analyze_section_trends(snapshots, 'technical_metrics')
     
     def analyze_business_trends(self, snapshots: List[Dict]) -> Dict:
         """Analyze business trends from historical data"""
-        return {}
+        return self.analyze_section_trends(snapshots, 'business_metrics')
     
     def analyze_project_trends(self, snapshots: List[Dict]) -> Dict:
         """Analyze project trends from historical data"""
-        return {}
+        return self.analyze_section_trends(snapshots, 'project_metrics')
     
     def analyze_health_trends(self, snapshots: List[Dict]) -> Dict:
         """Analyze documentation health trends"""
-        return {}
+        return self.analyze_section_trends(snapshots, 'documentation_health')
     
     def calculate_mvp_completion(self) -> float:
         """Calculate current MVP completion percentage"""
@@ -326,25 +789,21 @@ class DocumentationStateMonitor:
         completion_percentage = min((weighted_completion / target_services) * 100, 100.0)
         return round(completion_percentage, 1)
     
-    def detect_changes(self, previous_state: Dict[str, Any]) -> Dict[str, Any]:
+    def detect_changes(self, previous_state: Dict[str, Any],
+                       current_state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Detect significant changes since previous scan"""
-        current_state = self.scan_repository_state()
+        current_state = current_state or self.scan_repository_state()
+        self._nodes_compared = 0
         changes = {
             'timestamp': current_state['timestamp'],
             'significant_changes': [],
-            'technical_changes': self.compare_technical_metrics(
-                previous_state.get('technical_metrics', {}),
-                current_state['technical_metrics']
-            ),
-            'business_changes': self.compare_business_metrics(
-                previous_state.get('business_metrics', {}),
-                current_state['business_metrics']
-            ),
-            'project_changes': self.compare_project_metrics(
-                previous_state.get('project_metrics', {}),
-                current_state['project_metrics']
-            )
+            'technical_changes': self.compare_technical_metrics(previous_state, current_state),
+            'business_changes': self.compare_business_metrics(previous_state, current_state),
+            'project_changes': self.compare_project_metrics(previous_state, current_state),
+            'health_changes': self.compare_section(previous_state, current_state, 'documentation_health'),
+            'schema_changes': self.compare_section(previous_state, current_state, 'schema')
         }
+        changes['nodes_compared'] = self._nodes_compared
         
         # Identify significant changes
         self.identify_significant_changes(changes)
@@ -374,12 +833,7 @@ class DocumentationStateMonitor:
     
     def save_historical_snapshot(self, state: Dict[str, Any]) -> None:
         """Save current state as historical snapshot"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"state_snapshot_{timestamp}.json"
-        filepath = self.history_path / filename
-        
-        with open(filepath, 'w') as f:
-            json.dump(state, f, indent=2, default=str)
+        self.snapshot_store.append(state)
     
     def generate_trend_analysis(self, days: int = 30) -> Dict[str, Any]:
         """Generate trend analysis for the specified number of days"""
@@ -399,25 +853,32 @@ class DocumentationStateMonitor:
         
         return trends
     
-    def run_continuous_monitoring(self) -> None:
-        """Run continuous monitoring cycle"""
-        print(f"Starting NetNeural Documentation State Monitor at {datetime.now()}")
-        
+    def monitor_cycle(self, since: Optional[str] = None,
+                      time_budget: Optional[float] = None) -> Tuple[Dict[str, Any], Dict[str, Any], List[Dict[str, Any]]]:
+        """Scan, compare with the previous snapshot and record history; returns (state, changes, recommendations)"""
         # Load previous state if exists
         previous_state = self.load_latest_state()
         
         # Scan current state
-        current_state = self.scan_repository_state()
-        print(f"Current MVP Completion: {current_state['project_metrics']['mvp_completion']}%")
+        current_state = self.scan_repository_state(since, time_budget)
         
         # Detect changes
-        changes = self.detect_changes(previous_state or {})
+        changes = self.detect_changes(previous_state or {}, current_state)
         
         # Generate recommendations
         recommendations = self.generate_update_recommendations(changes)
         
-        # Save current state
+        # Save current state and roll up / prune older history
         self.save_historical_snapshot(current_state)
+        self.history_compactor.compact()
+        return current_state, changes, recommendations
+    
+    def run_continuous_monitoring(self, since: Optional[str] = None, time_budget: Optional[float] = None) -> None:
+        """Run continuous monitoring cycle, optionally incremental or bounded by a time budget"""
+        print(f"Starting NetNeural Documentation State Monitor at {datetime.now()}")
+        
+        current_state, changes, recommendations = self.monitor_cycle(since, time_budget)
+        print(f"Current MVP Completion: {current_state['project_metrics'].get('mvp_completion', 0.0)}%")
         
         # Output results
         self.output_monitoring_results(current_state, changes, recommendations)
@@ -427,6 +888,29 @@ class DocumentationStateMonitor:
         if 'error' not in trends:
             self.output_trend_analysis(trends)
     
+    def serve_metrics(self, since: Optional[str] = None, time_budget: Optional[float] = None) -> None:
+        """Export metrics over HTTP while re-running the monitoring cycle on an interval
+        
+        Scrapes are answered from the last published state and never start a scan.
+        """
+        from metrics_exporter import MetricsExporter
+        
+        exporter_config = self.config['monitoring'].get('exporter', {})
+        exporter = MetricsExporter(exporter_config.get('host', '127.0.0.1'), exporter_config.get('port', 9464))
+        latest_state = self.load_latest_state()
+        if latest_state:
+            exporter.publish(latest_state)
+        exporter.start()
+        logger.info("serving_metrics", url=f"http://{exporter.host}:{exporter.port}/metrics")
+        
+        try:
+            while True:
+                self.run_continuous_monitoring(since, time_budget)
+                exporter.publish(self.load_latest_state())
+                time.sleep(exporter_config.get('scan_interval', 900))
+        except KeyboardInterrupt:
+            exporter.stop()
+    
     # Helper methods (simplified implementations)
     def assess_service_completion(self, service_path: Path) -> str:
         """Assess service completion status"""
@@ -459,16 +943,15 @@ class DocumentationStateMonitor:
     
     def load_latest_state(self) -> Dict[str, Any]:
         """Load the most recent state snapshot"""
-        if not self.history_path.exists():
-            return {}
-        
-        snapshot_files = list(self.history_path.glob("state_snapshot_*.json"))
-        if not snapshot_files:
-            return {}
-        
-        latest_file = max(snapshot_files, key=lambda x: x.stat().st_mtime)
-        with open(latest_file, 'r') as f:
-            return json.load(f)
+        return self.snapshot_store.latest()
+    
+    def print_latest_metric(self, path: str) -> None:
+        """Print the latest recorded values at or under a metric path, without scanning"""
+        values = self.snapshot_store.latest_subtree(path)
+        if not values:
+            print(f"No recorded value for {path}")
+        for metric, value in values.items():
+            print(f"{metric} = {json.dumps(value, default=str)}")
     
     def output_monitoring_results(self, state: Dict[str, Any], changes: Dict[str, Any], recommendations: List[Dict[str, Any]]) -> None:
         """Output monitoring results"""
@@ -478,10 +961,65 @@ class DocumentationStateMonitor:
         
         # Current state summary
         print(f"\nCurrent State Summary ({state['timestamp']}):")
-        print(f"  MVP Completion: {state['project_metrics']['mvp_completion']}%")
-        print(f"  Total Services: {state['technical_metrics']['services']['total']}")
-        print(f"  Production Ready: {state['technical_metrics']['services']['production_ready']}")
-        print(f"  Documentation Health: {state['documentation_health']['overall_health_score']:.1f}/10")
+        if state.get('approximate'):
+            inexact = sorted(name for name, collector in state.get('collectors', {}).items()
+                             if collector['status'] == 'timeout' or collector.get('stale'))
+            budget = state.get('scan', {}).get('time_budget_s')
+            reason = f"sampled within a {budget:g}s time budget" if budget is not None else "collectors did not finish"
+            if inexact:
+                reason += f"; timed out or stale: {', '.join(inexact)}"
+            print(f"  APPROXIMATE: {reason}")
+        # Failed or timed-out collectors without a cached value report None, so read with defaults
+        services = state['technical_metrics'].get('services') or {}
+        api_endpoints = state['technical_metrics'].get('api_endpoints') or {}
+        test_results = state['technical_metrics'].get('test_results') or {}
+        code_inventory = state['technical_metrics'].get('code_inventory') or {}
+        code_total = code_inventory.get('total', {})
+        migrations = state.get('schema', {}).get('migrations') or {}
+        schema_objects = migrations.get('objects', {})
+        print(f"  MVP Completion: {state['project_metrics'].get('mvp_completion', 0.0)}%")
+        print(f"  Total Services: {services.get('total', 0)}")
+        print(f"  Production Ready: {services.get('production_ready', 0)}")
+        print(f"  API Endpoints: {api_endpoints.get('total', 0)} "
+              f"({api_endpoints.get('edge_functions', 0)} edge functions, "
+              f"{api_endpoints.get('app_route_handlers', 0)} app routes)")
+        print(f"  Tests: {test_results.get('passed', 0)} passed, {test_results.get('failed', 0)} failed, "
+              f"{test_results.get('skipped', 0)} skipped, {test_results.get('flaky', 0)} flaky")
+        if code_inventory.get('sampling', {}).get('approximate'):
+            code_range = code_inventory['confidence_intervals'].get('code', {'low': 0, 'high': 0})
+            print(f"  Code: ~{code_total.get('code', 0)} lines ({code_range['low']}-{code_range['high'] or '?'}) "
+                  f"in ~{code_total.get('files', 0)} files (sampled)")
+        else:
+            print(f"  Code: {code_total.get('code', 0)} lines in {code_total.get('files', 0)} files "
+                  f"({code_total.get('comment', 0)} comment, {code_total.get('blank', 0)} blank)")
+        print(f"  Schema: {schema_objects.get('tables', 0)} tables, {schema_objects.get('policies', 0)} RLS policies, "
+              f"{schema_objects.get('functions', 0)} functions, {schema_objects.get('triggers', 0)} triggers, "
+              f"{schema_objects.get('indexes', 0)} indexes over {migrations.get('files', 0)} migrations")
+        type_drift = state.get('schema', {}).get('type_drift') or {}
+        if type_drift.get('drifted_tables'):
+            print(f"  Schema Drift: {type_drift['drifted_tables']} tables differ from generated types "
+                  f"({len(type_drift['missing_from_types'])} missing from types, "
+                  f"{len(type_drift['missing_from_migrations'])} missing from migrations)")
+        print(f"  Documentation Health: {state['documentation_health'].get('overall_health_score', 0.0):.1f}/10")
+        code_references = state['documentation_health'].get('code_references') or {}
+        if code_references.get('unresolved'):
+            print(f"  Stale Code References: {code_references['unresolved']} of {code_references['references']} "
+                  f"in {len(code_references['unresolved_references'])} documents")
+        links = state['documentation_health'].get('links') or {}
+        if links.get('broken'):
+            print(f"  Broken Links: {links['broken_links']} links and {links['broken_anchors']} anchors "
+                  f"in {len(links['broken'])} documents")
+        
+        # Slowest tests, to target CI latency
+        if test_results.get('slowest_tests'):
+            print("\nSlowest Tests:")
+            for test in test_results['slowest_tests'][:5]:
+                print(f"  {test['duration_ms'] / 1000:7.1f}s  {test['test']}")
+        
+        # Collector status and latency
+        print("\nCollectors:")
+        for name, collector in state.get('collectors', {}).items():
+            print(f"  {name}: {collector['status']} in {collector['latency_ms']:.0f} ms")
         
         # Significant changes
         if changes['significant_changes']:
@@ -497,7 +1035,118 @@ class DocumentationStateMonitor:
                 print(f"  [{priority}] {rec['description']}")
         
         print("\n" + "="*80)
+    
+    def output_trend_analysis(self, trends: Dict[str, Any]) -> None:
+        """Output trend analysis results"""
+        print(f"\nTrend Analysis ({trends['period']}, {trends['snapshots_analyzed']} snapshots):")
+        sections = [
+            ('Technical', trends['technical_trends']),
+            ('Business', trends['business_trends']),
+            ('Project', trends['project_trends']),
+            ('Documentation Health', trends['overall_health_trend'])
+        ]
+        for label, section in sections:
+            print(f"  {label}: {len(section['improving'])} improving, "
+                  f"{len(section['declining'])} declining")
+            for regression in section['regressions'][:3]:
+                print(f"    ! {regression['metric']}: {regression['from']:g} -> "
+                      f"{regression['to']:g} ({regression['change_pct']:+.1f}%)")
+            for change_point in section['change_points'][:3]:
+                print(f"    ~ {change_point['metric']} shifted at {change_point['timestamp']}: "
+                      f"{change_point['before_mean']:g} -> {change_point['after_mean']:g}")
 
-if __name__ == "__main__":
+class WorkspaceMonitors:
+    """Monitors several checkouts of the repository (e.g. git worktrees) in one process.
+    
+    Collectors of every workspace run on one bounded thread pool, and the
+    content-addressed scan caches are shared, so a file identical across
+    worktrees is analyzed once. Each workspace keeps its own snapshot
+    history, collector cache and manifests inside its checkout.
+    """
+    
+    def __init__(self, config_path: str = "ai_blueprint_config.yaml", names: Optional[List[str]] = None):
+        """Create a monitor per configured workspace, or only the named ones"""
+        import yaml
+        
+        with open(config_path, 'r') as f:
+            config = self.config = yaml.safe_load(f)
+        workspaces = config['project'].get('workspaces') or [
+            {'name': 'default', 'path': config['project']['base_path']}]
+        if names:
+            unknown = set(names) - {workspace['name'] for workspace in workspaces}
+            if unknown:
+                raise ValueError(f"Unknown workspaces: {', '.join(sorted(unknown))}")
+            workspaces = [workspace for workspace in workspaces if workspace['name'] in names]
+        
+        collector_config = config['monitoring'].get('collectors', {})
+        self.pool = DaemonThreadPool(collector_config.get('max_workers') or os.cpu_count() or 1)
+        scheduler = CollectorScheduler(
+            collector_config.get('max_workers'), collector_config.get('default_timeout', 120), self.pool)
+        self.caches = ScanCacheGroup(Path(config['project']['base_path']) / config['documentation'].get(
+            'shared_cache_path', 'docs/generated/analysis/cache/shared/'))
+        self.monitors = {workspace['name']: DocumentationStateMonitor(config_path, workspace, scheduler, self.caches)
+                         for workspace in workspaces}
+    
+    def run(self, since: Optional[str] = None, time_budget: Optional[float] = None) -> None:
+        """Run one monitoring cycle in every workspace concurrently, then report each in turn"""
+        print(f"Starting NetNeural Documentation State Monitor for {len(self.monitors)} workspaces at {datetime.now()}")
+        # Cycles only wait on their collectors, so they get threads of their own outside the bounded pool
+        with ThreadPoolExecutor(max_workers=len(self.monitors), thread_name_prefix='workspace') as cycles:
+            futures = {name: cycles.submit(monitor.monitor_cycle, since, time_budget)
+                       for name, monitor in self.monitors.items()}
+        self.caches.flush()
+        
+        for name, future in futures.items():
+            monitor = self.monitors[name]
+            print(f"\nWorkspace: {name} ({monitor.base_path})")
+            try:
+                current_state, changes, recommendations = future.result()
+            except Exception as e:
+                logger.error("workspace_failed", workspace=name, exc_info=e)
+                print(f"  Monitoring failed: {type(e).__name__}: {e}")
+                continue
+            monitor.output_monitoring_results(current_state, changes, recommendations)
+    
+    def close(self) -> None:
+        """Release the shared worker pool"""
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Monitor documentation state against the repository")
+    parser.add_argument("--since", nargs="?", const="last", default=None, metavar="REV",
+                       help="Only re-run collectors whose inputs changed between REV and HEAD "
+                            "(default REV: the commit of the previous snapshot)")
+    parser.add_argument("--time-budget", type=float, default=None, metavar="SECONDS",
+                       help="Finish within SECONDS, sampling large trees and marking the snapshot approximate")
+    parser.add_argument("--serve", action="store_true",
+                       help="Serve metrics over HTTP and re-run the monitor every scan_interval seconds")
+    parser.add_argument("--workspaces", nargs="*", default=None, metavar="NAME",
+                       help="Monitor the workspaces listed under project.workspaces (default: all) "
+                            "on one worker pool with shared scan caches")
+    parser.add_argument("--metric", default=None, metavar="PATH",
+                       help="Print the latest recorded values under a metric path "
+                            "(e.g. technical_metrics.code_inventory.total) and exit")
+    
+    args = parser.parse_args()
+    
+    if args.workspaces is not None:
+        workspaces = WorkspaceMonitors(names=args.workspaces)
+        configure_logging(workspaces.config.get('logging'), 'doc_state_monitor')
+        try:
+            workspaces.run(args.since, args.time_budget)
+        finally:
+            workspaces.close()
+        return
+    
     monitor = DocumentationStateMonitor()
-    monitor.run_continuous_monitoring()
+    configure_logging(monitor.config.get('logging'), 'doc_state_monitor')
+    if args.metric:
+        monitor.print_latest_metric(args.metric)
+    elif args.serve:
+        monitor.serve_metrics(args.since, args.time_budget)
+    else:
+        monitor.run_continuous_monitoring(args.since, args.time_budget)
+
+if __name__ == "__main__":
+    main()
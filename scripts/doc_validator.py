@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+NetNeural Doc Validator
+Verifies code references in the markdown corpus against an index of code identifiers
+"""
+
+import re
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional, Set
+
+from scan_cache import ScanCache
+from collector_scheduler import check_deadline
+from sql_analyzer import analyze_file, normalize_name
+
+SYMBOL_KINDS = ('functions', 'tables', 'types', 'env')
+SCRIPT_SUFFIXES = {'.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs'}
+CONFIG_SUFFIXES = {'.yml', '.yaml', '.toml', '.sh'}
+ENV_NAME = r'[A-Z][A-Z0-9]*(?:_[A-Z0-9]+)+'
+
+# Identifiers defined or consumed by source files
+EXPORT_RE = re.compile(
+    r'^[ \t]*export\s+(?:declare\s+)?(?:default\s+)?(?:abstract\s+)?(?:async\s+)?'
+    r'(?:type|interface|enum|class|function\*?|const|let|var)\s+([A-Za-z_$][\w$]*)', re.MULTILINE)
+EXPORT_LIST_RE = re.compile(r'^[ \t]*export\s+(?:type\s+)?\{([^}]*)\}', re.MULTILINE)
+SCRIPT_ENV_RE = re.compile(
+    r'(?:process\.env|import\.meta\.env)\.([A-Z_][A-Z0-9_]*)'
+    r'|(?:process\.env\[|Deno\.env\.get\()\s*[\'"]([A-Z_][A-Z0-9_]*)')
+GO_ENV_RE = re.compile(r'os\.(?:Getenv|LookupEnv)\(\s*"([A-Z_][A-Z0-9_]*)"')
+DOTENV_RE = re.compile(r'^[ \t]*(?:export\s+)?([A-Z_][A-Z0-9_]*)[ \t]*=', re.MULTILINE)
+CONFIG_ENV_RE = re.compile(
+    r'\$\{\{\s*(?:secrets|env|vars)\.([A-Z_][A-Z0-9_]*)'
+    r'|\$\{([A-Z_][A-Z0-9_]*)'
+    r'|env\(\s*([A-Z_][A-Z0-9_]*)\s*\)'
+    r'|^[ \t]*(?:-[ \t]*)?(?:export[ \t]+)?(' + ENV_NAME + r')[ \t]*[:=]', re.MULTILINE)
+DOCKERFILE_ENV_RE = re.compile(r'^[ \t]*(?:ENV|ARG)[ \t]+([A-Z_][A-Z0-9_]*)', re.MULTILINE)
+
+# References made by markdown documents
+FENCE_RE = re.compile(r'^[ \t]*(```|~~~)[^\n]*\n.*?^[ \t]*\1[ \t]*$', re.MULTILINE | re.DOTALL)
+CODE_SPAN_RE = re.compile(r'`([^`\n]+)`')
+REFERENCE_PATTERNS = [
+    ('functions', re.compile(r'functions/v1/([A-Za-z0-9_-]+)')),
+    ('functions', re.compile(r'supabase[ \t]+functions[ \t]+(?:deploy|serve)[ \t]+([A-Za-z0-9_][A-Za-z0-9_-]*)')),
+    ('tables', re.compile(r'\.from\(\s*[\'"]([A-Za-z_][\w]*)[\'"]')),
+    ('tables', re.compile(r'\bpublic\.([a-z_][a-z0-9_]*)\b(?!\s*\(|[./])')),
+    ('tables', re.compile(r'`([a-z_][a-z0-9_]*)`\s+tables?\b')),
+    ('env', re.compile(r'(?:process\.env|import\.meta\.env)\.([A-Z_][A-Z0-9_]*)')),
+    ('env', re.compile(r'Deno\.env\.get\(\s*[\'"]([A-Z_][A-Z0-9_]*)')),
+]
+FENCED_ENV_RE = re.compile(r'^[ \t]*(?:export\s+)?(' + ENV_NAME + r')=', re.MULTILINE)
+# Names docs use as stand-ins rather than references
+PLACEHOLDERS = {'my-function', 'function-name', 'your-function', 'endpoint', 'YOUR_ORG_ID'}
+SPAN_PATTERNS = [
+    ('env', re.compile(r'\$?(' + ENV_NAME + r')\Z')),
+    ('types', re.compile(r'<?([A-Z][a-z0-9]+(?:[A-Z][a-z0-9]*)+)(?:<[^>]*>)?\s*/?>?\Z')),
+]
+
+
+def source_symbols(path: Path) -> Dict[str, List[str]]:
+    """Exported identifiers and environment variables a source file defines or reads"""
+    name = path.name
+    try:
+        text = path.read_text(encoding='utf-8', errors='ignore')
+    except IOError:
+        return {}
+    types: Set[str] = set()
+    env: Set[str] = set()
+    if path.suffix in SCRIPT_SUFFIXES:
+        types.update(EXPORT_RE.findall(text))
+        for names in EXPORT_LIST_RE.findall(text):
+            for item in names.split(','):
+                exported = item.split(' as ')[-1].strip()
+                if exported:
+                    types.add(exported)
+        env.update(filter(None, (group for match in SCRIPT_ENV_RE.findall(text) for group in match)))
+    elif path.suffix == '.go':
+        env.update(GO_ENV_RE.findall(text))
+    elif name.startswith('.env') or name.endswith('.env'):
+        env.update(DOTENV_RE.findall(text))
+    elif path.suffix in CONFIG_SUFFIXES:
+        env.update(filter(None, (group for match in CONFIG_ENV_RE.findall(text) for group in match)))
+    elif name.startswith('Dockerfile'):
+        env.update(DOCKERFILE_ENV_RE.findall(text))
+    return {'types': sorted(types), 'env': sorted(env)}
+
+
+def is_source(relative: str) -> bool:
+    """Whether a file can define symbols the index tracks"""
+    name = relative.rpartition('/')[2]
+    suffix = Path(name).suffix
+    return (suffix in SCRIPT_SUFFIXES or suffix in CONFIG_SUFFIXES or suffix == '.go'
+            or name.startswith('.env') or name.endswith('.env') or name.startswith('Dockerfile'))
+
+
+# The files is_source() accepts, as input globs for change detection
+SOURCE_GLOBS = ([f"**/*{suffix}" for suffix in sorted(SCRIPT_SUFFIXES | CONFIG_SUFFIXES)]
+                + ['**/*.go', '**/.env*', '**/*.env', '**/Dockerfile*'])
+
+
+def document_references(text: str) -> List[List[Any]]:
+    """[kind, name, line] for every code reference in a markdown document"""
+    references = []
+    line_starts = [0] + [match.end() for match in re.finditer(r'\n', text)]
+
+    def line_of(offset: int) -> int:
+        low, high = 0, len(line_starts)
+        while low + 1 < high:
+            middle = (low + high) // 2
+            if line_starts[middle] <= offset:
+                low = middle
+            else:
+                high = middle
+        return low + 1
+
+    for kind, pattern in REFERENCE_PATTERNS:
+        for match in pattern.finditer(text):
+            references.append([kind, match.group(1), line_of(match.start(1))])
+
+    fences = [(match.start(), match.end()) for match in FENCE_RE.finditer(text)]
+    for start, end in fences:
+        for match in FENCED_ENV_RE.finditer(text, start, end):
+            references.append(['env', match.group(1), line_of(match.start(1))])
+
+    # Inline code spans, outside fenced blocks
+    fence_index = 0
+    for match in CODE_SPAN_RE.finditer(text):
+        while fence_index < len(fences) and fences[fence_index][1] <= match.start():
+            fence_index += 1
+        if fence_index < len(fences) and fences[fence_index][0] <= match.start():
+            continue
+        span = match.group(1).strip()
+        for kind, pattern in SPAN_PATTERNS:
+            found = pattern.match(span)
+            if found:
+                references.append([kind, found.group(1), line_of(match.start(1))])
+                break
+
+    # One verdict per distinct reference; the first line it appears on is reported
+    unique: Dict[tuple, List[Any]] = {}
+    for kind, name, line in sorted(references, key=lambda reference: reference[2]):
+        if name in PLACEHOLDERS:
+            continue
+        unique.setdefault((kind, name), [kind, name, line])
+    return list(unique.values())
+
+
+class DocValidator:
+    """Checks every code reference in the markdown corpus against one symbol index.
+
+    The index maps each kind (edge function, table, exported TypeScript
+    type, environment variable) to a set of names, so every reference is
+    verified with one set lookup. Symbols are extracted per source file,
+    references per document and verdicts per (document, index) pair, all
+    cached by content hash, so a re-run re-reads only changed files and
+    re-checks only documents whose text or index changed.
+    """
+
+    def __init__(self, cache: ScanCache, base_path: Path):
+        """Initialize with a content-addressed cache and the project root"""
+        self.cache = cache
+        self.base_path = Path(base_path)
+        self.live: List[str] = []
+
+    def cached(self, key: str, compute) -> Any:
+        """Cached value for a key, computing and storing it on a miss"""
+        self.live.append(key)
+        value = self.cache.get(key)
+        if value is None:
+            value = compute()
+            self.cache.put(key, value)
+        return value
+
+    def build_index(self, files: Iterable[str], functions_path: str,
+                    migrations: List[Path]) -> Dict[str, Any]:
+        """Symbol index over the source files, edge functions and migrations
+
+        Returns {'digest': content hash of every input, 'symbols': {kind: set}}.
+        """
+        prefix = functions_path.strip('/') + '/'
+        functions: Set[str] = set()
+        sources = []
+        for relative in files:
+            if relative.startswith(prefix):
+                parts = relative[len(prefix):].split('/')
+                if len(parts) == 2 and parts[1] == 'index.ts' and not parts[0].startswith('_'):
+                    functions.add(parts[0])
+            if is_source(relative):
+                sources.append(relative)
+
+        symbols: Dict[str, Set[str]] = {kind: set() for kind in SYMBOL_KINDS}
+        symbols['functions'] = functions
+        digests = []
+        for relative in sorted(sources):
+            check_deadline()
+            path = self.base_path / relative
+            try:
+                digest = self.cache.digest(path)
+            except OSError:
+                continue
+            digests.append(digest)
+            extracted = self.cached(f"source:{digest}", lambda: source_symbols(path))
+            for kind, names in extracted.items():
+                symbols[kind].update(names)
+
+        for path in sorted(migrations, key=lambda p: p.name):
+            digest = self.cache.digest(path)
+            digests.append(digest)
+            tables = self.cached(f"sql:{digest}", lambda: {
+                change: analyze_file(path)[change]['tables'] for change in ('created', 'dropped')})
+            symbols['tables'].difference_update(tables['dropped'])
+            symbols['tables'].update(tables['created'])
+
+        digests.extend(sorted(functions))
+        digest = hashlib.sha1('\n'.join(digests).encode()).hexdigest()
+        return {'digest': digest, 'symbols': symbols}
+
+    def resolves(self, kind: str, name: str, symbols: Dict[str, Set[str]]) -> bool:
+        """Whether one reference names a known identifier"""
+        if kind == 'tables':
+            return normalize_name(name) in symbols['tables']
+        return name in symbols[kind]
+
+    def validate(self, documents: Iterable[str], index: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Per-document {'references': n, 'unresolved': [[kind, name, line]]}"""
+        results = {}
+        for relative in sorted(documents):
+            check_deadline()
+            path = self.base_path / relative
+            try:
+                digest = self.cache.digest(path)
+            except OSError:
+                continue
+
+            def check():
+                references = self.cached(f"refs:{digest}", lambda: document_references(
+                    path.read_text(encoding='utf-8', errors='ignore')))
+                unresolved = [reference for reference in references
+                              if not self.resolves(reference[0], reference[1], index['symbols'])]
+                return {'references': len(references), 'unresolved': unresolved}
+
+            # References stay live even when the verdict is served from cache
+            self.live.append(f"refs:{digest}")
+            results[relative] = self.cached(f"result:{digest}:{index['digest']}", check)
+        return results
+
+    def save(self) -> None:
+        """Persist the cache, pruning entries no longer referenced"""
+        self.cache.save(self.live)
+        self.live = []
+
+
+def accuracy_score(results: Dict[str, Dict[str, Any]], documents: Optional[Iterable[str]] = None) -> Optional[float]:
+    """0-10 share of resolved references over a set of documents, None when nothing is checkable"""
+    selected = results if documents is None else {doc: results[doc] for doc in documents if doc in results}
+    total = sum(result['references'] for result in selected.values())
+    unresolved = sum(len(result['unresolved']) for result in selected.values())
+    return round(10.0 * (total - unresolved) / total, 2) if total else None
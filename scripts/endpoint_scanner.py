@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+NetNeural Endpoint Scanner
+Builds an endpoint index from Supabase edge functions and Next.js app routes
+"""
+
+import re
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from scan_cache import ScanCache
+from file_index import FileIndex
+from collector_scheduler import DaemonThreadPool
+
+HTTP_METHODS = ('GET', 'HEAD', 'POST', 'PUT', 'DELETE', 'PATCH', 'OPTIONS')
+
+# createEdgeFunction() default from supabase/functions/_shared/request-handler.ts
+EDGE_DEFAULT_METHODS = ['GET', 'POST', 'PUT', 'DELETE', 'PATCH']
+
+METHOD_CHECK_RE = re.compile(r"\.method\s*[!=]==?\s*['\"]([A-Z]+)['\"]")
+METHOD_CASE_RE = re.compile(r"case\s+['\"](GET|HEAD|POST|PUT|DELETE|PATCH)['\"]")
+ALLOWED_METHODS_RE = re.compile(r"allowedMethods\s*:\s*\[([^\]]*)\]")
+ACTION_RE = re.compile(r"action\s*===?\s*['\"]([\w-]+)['\"]")
+ROUTE_EXPORT_RE = re.compile(
+    r"export\s+(?:async\s+)?(?:function|const|let)\s+(GET|HEAD|POST|PUT|DELETE|PATCH|OPTIONS)\b"
+)
+ROUTE_REEXPORT_RE = re.compile(r"export\s*\{([^}]*)\}")
+
+
+def parse_edge_function(source: str) -> Dict[str, Any]:
+    """Extract handler type, HTTP methods and action routes from an edge function"""
+    if 'createEdgeFunction(' in source:
+        handler = 'createEdgeFunction'
+    elif 'Deno.serve(' in source:
+        handler = 'Deno.serve'
+    elif re.search(r"\bserve\(", source):
+        handler = 'serve'
+    else:
+        handler = None
+
+    allowed = ALLOWED_METHODS_RE.search(source)
+    checked = set()
+    routes = set()
+    for line in source.splitlines():
+        methods = set(METHOD_CHECK_RE.findall(line)) | set(METHOD_CASE_RE.findall(line))
+        methods.discard('OPTIONS')
+        actions = ACTION_RE.findall(line)
+        checked |= methods
+        for method in methods or ['*']:
+            for action in actions or [None]:
+                if method != '*' or action:
+                    routes.add((method, action))
+
+    if allowed:
+        methods = [m for m in re.findall(r"['\"]([A-Z]+)['\"]", allowed.group(1))
+                   if m in HTTP_METHODS]
+    elif checked:
+        methods = sorted(m for m in checked if m in HTTP_METHODS)
+    elif handler == 'createEdgeFunction':
+        methods = list(EDGE_DEFAULT_METHODS)
+    else:
+        methods = ['ANY']
+
+    # Routes discriminated by method and ?action=; fall back to one per method
+    routes = {(m, a) for m, a in routes if m == '*' or m in methods or 'ANY' in methods}
+    if not routes:
+        routes = {(m, None) for m in methods}
+
+    return {
+        'handler': handler,
+        'methods': methods,
+        'routes': sorted(f"{m} ?action={a}" if a else m for m, a in routes),
+        'endpoints': len(routes)
+    }
+
+
+def parse_route_handler(source: str) -> List[str]:
+    """Extract exported HTTP method handlers from a Next.js route file"""
+    methods = set(ROUTE_EXPORT_RE.findall(source))
+    for group in ROUTE_REEXPORT_RE.findall(source):
+        for name in group.split(','):
+            exported = name.split(' as ')[-1].strip()
+            if exported in HTTP_METHODS:
+                methods.add(exported)
+    return sorted(methods)
+
+
+def app_route_path(relative_dir: Path) -> Optional[str]:
+    """Map an app-router directory to its URL path, None for private folders"""
+    segments = []
+    for part in relative_dir.parts:
+        if part.startswith('_'):
+            return None
+        if part.startswith('(') and part.endswith(')'):
+            continue
+        if part.startswith('@'):
+            continue
+        segments.append(part)
+    return '/' + '/'.join(segments)
+
+
+class EndpointScanner:
+    """Parallel, hash-cached scanner for the API surface of the monorepo."""
+
+    def __init__(self, cache: ScanCache, max_workers: int = 8, file_index: Optional[FileIndex] = None):
+        """Initialize the scanner.
+
+        Args:
+            cache: Content-addressed cache for parsed results
+            max_workers: Size of the parsing thread pool
+            file_index: File listing to scan instead of walking the filesystem
+        """
+        self.cache = cache
+        self.max_workers = max_workers
+        self.file_index = file_index
+        self.parsed = 0
+
+    def _subdirectories(self, directory: Path) -> List[Path]:
+        """Immediate subdirectories, from the file index when there is one"""
+        if self.file_index is not None:
+            return self.file_index.children(directory)
+        return sorted(item for item in directory.iterdir() if item.is_dir())
+
+    def _rglob(self, pattern: str, directory: Path) -> List[Path]:
+        """Files matching a pattern at any depth, from the file index when there is one"""
+        if self.file_index is not None:
+            return self.file_index.rglob(pattern, directory)
+        return [path for path in directory.rglob(pattern) if path.is_file()]
+
+    def _cached_parse(self, files: List[Path], parser, kind: str) -> Tuple[str, Any, bool]:
+        """Parse a group of files unless their combined hash is cached
+
+        Keys are prefixed with the kind of result, so an edge function and a
+        route handler with identical source never share an entry. Returns
+        the key, the result and whether it was parsed; new results are stored
+        by the caller, on the collector's own thread.
+        """
+        if len(files) == 1:
+            digest = self.cache.digest(files[0])
+        else:
+            combined = hashlib.sha1()
+            for path in files:
+                combined.update(self.cache.digest(path).encode())
+            digest = combined.hexdigest()
+        key = f"{kind}:{digest}"
+
+        result = self.cache.get(key)
+        if result is not None:
+            return key, result, False
+        source = '\n'.join(p.read_text(encoding='utf-8', errors='ignore') for p in files)
+        return key, parser(source), True
+
+    def _store(self, key: str, result: Any, parsed: bool) -> None:
+        """Cache a freshly parsed result"""
+        if parsed:
+            self.cache.put(key, result)
+            self.parsed += 1
+
+    def scan_edge_functions(self, functions_dir: Path) -> Dict[str, Dict[str, Any]]:
+        """Index every deployable edge function under supabase/functions"""
+        if not functions_dir.is_dir():
+            return {}
+
+        jobs = {}
+        for item in self._subdirectories(functions_dir):
+            if item.name.startswith(('_', '.')):
+                continue
+            if not (item / 'index.ts').exists():
+                continue
+            files = sorted(p for p in self._rglob('*.ts', item) if not p.name.endswith('_test.ts'))
+            jobs[item.name] = files
+
+        index = {}
+        with DaemonThreadPool(self.max_workers, 'endpoint-parse') as pool:
+            futures = {name: pool.submit(self._cached_parse, files, parse_edge_function, 'edge')
+                       for name, files in jobs.items()}
+            for name, future in futures.items():
+                key, result, parsed = future.result()
+                self._store(key, result, parsed)
+                index[name] = dict(result, path=f"/functions/v1/{name}", hash=key)
+        return index
+
+    def scan_app_routes(self, app_dir: Path) -> Dict[str, Any]:
+        """Index Next.js route handlers and pages under src/app"""
+        routes = {'handlers': {}, 'pages': []}
+        if not app_dir.is_dir():
+            return routes
+
+        handler_files = {}
+        for path in self._rglob('*', app_dir):
+            if path.suffix not in ('.ts', '.tsx', '.js', '.jsx'):
+                continue
+            url = app_route_path(path.parent.relative_to(app_dir))
+            if url is None:
+                continue
+            if path.stem == 'route':
+                handler_files[url] = path
+            elif path.stem == 'page':
+                routes['pages'].append(url)
+
+        with DaemonThreadPool(self.max_workers, 'endpoint-parse') as pool:
+            futures = {url: pool.submit(self._cached_parse, [path], parse_route_handler, 'route')
+                       for url, path in handler_files.items()}
+            for url, future in sorted(futures.items()):
+                key, methods, parsed = future.result()
+                self._store(key, methods, parsed)
+                routes['handlers'][url] = {
+                    'file': str(handler_files[url].relative_to(app_dir)),
+                    'methods': methods,
+                    'hash': key
+                }
+        routes['pages'].sort()
+        return routes
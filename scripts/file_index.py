@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+NetNeural File Index
+Enumerates project files from the git index instead of walking the filesystem
+"""
+
+import os
+import bisect
+import hashlib
+import re
+import subprocess
+import threading
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Pruned by the filesystem fallback, which has no .gitignore to consult
+IGNORED_DIRS = {'.git', 'node_modules', '.next', 'dist', 'build', 'coverage', 'vendor',
+                '__pycache__', '.venv', 'venv', '.turbo', '.cache'}
+
+
+def translate_glob(pattern: str) -> 're.Pattern':
+    """Compile a pathlib-style glob ('*' within a segment, '**' across) to a regex"""
+    parts = []
+    for segment in pattern.strip('/').split('/'):
+        if segment == '**':
+            parts.append('(?:[^/]+/)*')
+            continue
+        regex = ''
+        for char in segment:
+            if char == '*':
+                regex += '[^/]*'
+            elif char == '?':
+                regex += '[^/]'
+            else:
+                regex += re.escape(char)
+        parts.append(regex + '/')
+    regex = ''.join(parts)
+    if regex.endswith('/'):
+        regex = regex[:-1]
+    return re.compile(regex + r'\Z')
+
+
+def is_glob(relative: str) -> bool:
+    """Whether a relative input path is a glob pattern rather than a file or directory"""
+    return any(char in relative for char in '*?')
+
+
+class FileIndex:
+    """Lazily built, thread-safe list of the project's files.
+
+    Tracked files come from 'git ls-files', which reads the index rather than
+    the working tree, so ignored trees such as node_modules, .next and dist
+    are never visited. Untracked files can be added with 'include_untracked',
+    honouring .gitignore. Outside a git checkout the index falls back to a
+    pruned filesystem walk.
+    """
+
+    def __init__(self, root: Path, backend: str = 'git', include_untracked: bool = False):
+        """Initialize the index.
+
+        Args:
+            root: Project root; all paths are listed relative to it
+            backend: 'git' or 'filesystem'
+            include_untracked: Also list untracked files not excluded by .gitignore
+        """
+        self.root = Path(root)
+        self.backend = backend
+        self.include_untracked = include_untracked
+        self.lock = threading.Lock()
+        self._files: Optional[List[str]] = None
+        self._dirs: Optional[Set[str]] = None
+        self._blobs: Optional[Tuple[List[str], List[str]]] = None
+        self._patterns: Dict[str, 're.Pattern'] = {}
+
+    def reset(self) -> None:
+        """Forget the listing so the next query re-reads the index"""
+        with self.lock:
+            self._files = None
+            self._dirs = None
+            self._blobs = None
+
+    def files(self) -> List[str]:
+        """Relative POSIX paths of every indexed file, sorted"""
+        with self.lock:
+            if self._files is None:
+                self._files = self._list_git() if self.backend == 'git' else None
+                if self._files is None:
+                    self._files = self._list_filesystem()
+            return self._files
+
+    def _list_git(self) -> Optional[List[str]]:
+        """List files from the git index, or None if git is unavailable"""
+        args = ['ls-files', '-z', '--cached']
+        if self.include_untracked:
+            args += ['--others', '--exclude-standard']
+        output = self._git(*args)
+        if output is None:
+            return None
+        return sorted(set(os.fsdecode(name) for name in output.split(b'\0') if name))
+
+    def _list_filesystem(self) -> List[str]:
+        """Walk the tree, pruning well-known build and dependency directories"""
+        files = []
+        for directory, subdirs, names in os.walk(self.root):
+            subdirs[:] = [name for name in subdirs if name not in IGNORED_DIRS]
+            relative = os.path.relpath(directory, self.root).replace(os.sep, '/')
+            prefix = '' if relative == '.' else relative + '/'
+            files.extend(prefix + name for name in names)
+        return sorted(files)
+
+    def directories(self) -> Set[str]:
+        """Relative paths of every directory holding an indexed file"""
+        files = self.files()
+        with self.lock:
+            if self._dirs is None:
+                dirs = set()
+                for path in files:
+                    parent = path.rpartition('/')[0]
+                    while parent and parent not in dirs:
+                        dirs.add(parent)
+                        parent = parent.rpartition('/')[0]
+                self._dirs = dirs
+            return self._dirs
+
+    def children(self, directory: Path = None) -> List[Path]:
+        """Immediate subdirectories of a directory that hold indexed files"""
+        prefix = self.relative(directory)
+        prefix = prefix + '/' if prefix else ''
+        names = {path[len(prefix):] for path in self.directories()
+                 if path.startswith(prefix) and '/' not in path[len(prefix):]}
+        base = self.root / prefix if prefix else self.root
+        return [base / name for name in sorted(names)]
+
+    def relative(self, path: Optional[Path]) -> str:
+        """Relative POSIX form of a path under the root ('' for the root)"""
+        if path is None:
+            return ''
+        path = Path(path)
+        if path.is_absolute():
+            path = path.relative_to(self.root)
+        relative = path.as_posix()
+        return '' if relative == '.' else relative.strip('/')
+
+    def matcher(self, pattern: str) -> 're.Pattern':
+        """Compiled regex for a glob, cached per pattern"""
+        regex = self._patterns.get(pattern)
+        if regex is None:
+            regex = self._patterns[pattern] = translate_glob(pattern)
+        return regex
+
+    def glob(self, pattern: str, under: Path = None) -> List[Path]:
+        """Indexed files matching a glob relative to 'under' (default: the root)"""
+        regex = self.matcher(pattern)
+        prefix = self.relative(under)
+        prefix = prefix + '/' if prefix else ''
+        return [self.root / path for path in self.files()
+                if path.startswith(prefix) and regex.match(path, len(prefix))]
+
+    def rglob(self, pattern: str, under: Path = None) -> List[Path]:
+        """Indexed files matching a glob at any depth below 'under'"""
+        return self.glob('**/' + pattern, under)
+
+    def is_tracked(self, relative: str) -> bool:
+        """Whether a relative path is an indexed file or a directory holding one"""
+        relative = relative.strip('/')
+        if relative in ('', '.'):
+            return True
+        if relative in self.directories():
+            return True
+        files = self.files()
+        position = bisect.bisect_left(files, relative)
+        return position < len(files) and files[position] == relative
+
+    def _content_ids(self) -> Optional[Tuple[List[str], List[str]]]:
+        """Sorted paths with their content ids, or None without git
+
+        Ids are the blob hashes in the git index; files modified in the
+        working tree (and listed untracked files) are hashed directly.
+        """
+        with self.lock:
+            if self._blobs is None and self.backend == 'git':
+                staged = self._git('ls-files', '-s', '-z')
+                if staged is None:
+                    return None
+                ids = {}
+                for entry in staged.split(b'\0'):
+                    if entry:
+                        meta, _, name = entry.partition(b'\t')
+                        ids[os.fsdecode(name)] = meta.split()[1].decode()
+                dirty = self._git('diff-files', '--name-only', '-z') or b''
+                if self.include_untracked:
+                    dirty += b'\0' + (self._git('ls-files', '--others', '--exclude-standard', '-z') or b'')
+                for name in dirty.split(b'\0'):
+                    if name:
+                        relative = os.fsdecode(name)
+                        ids[relative] = self._hash_file(self.root / relative)
+                paths = sorted(ids)
+                self._blobs = (paths, [ids[path] for path in paths])
+            return self._blobs
+
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        """Git blob id of a working tree file ('missing' once deleted)
+
+        Hashed the way git hashes blobs, so a file that is only stat-dirty
+        keeps the id it has in the index.
+        """
+        try:
+            with open(path, 'rb') as f:
+                hasher = hashlib.sha1(b'blob %d\0' % os.fstat(f.fileno()).st_size)
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    hasher.update(chunk)
+        except OSError:
+            return 'missing'
+        return hasher.hexdigest()
+
+    def fingerprint(self, relative: str) -> Optional[str]:
+        """Content fingerprint of the files at or under a path, None if there are none
+
+        An edit anywhere below a directory changes its fingerprint, which a
+        directory's own mtime does not. Indexed paths hash the git content
+        ids; paths git does not list (build artifacts such as coverage
+        reports) and checkouts without git hash file mtimes and sizes. A glob
+        fingerprints the indexed files it matches.
+        """
+        relative = relative.strip('/')
+        relative = '' if relative == '.' else relative
+        hasher = hashlib.sha1()
+        if is_glob(relative):
+            regex = self.matcher(relative)
+            listing = self._content_ids()
+            if listing is not None:
+                matched = [(path, blob) for path, blob in zip(*listing) if regex.match(path)]
+            else:
+                matched = []
+                for path in self.files():
+                    if regex.match(path):
+                        try:
+                            stat = (self.root / path).stat()
+                        except OSError:
+                            continue
+                        matched.append((path, f"{stat.st_mtime_ns}:{stat.st_size}"))
+            for path, blob in matched:
+                hasher.update(f"{path}\0{blob}\n".encode())
+            return hasher.hexdigest() if matched else None
+        listing = self._content_ids() if self.is_tracked(relative) else None
+        if listing is not None:
+            paths, ids = listing
+            position = bisect.bisect_left(paths, relative)
+            if relative and position < len(paths) and paths[position] == relative:
+                return ids[position]
+            prefix = relative + '/' if relative else ''
+            # '0' sorts right after '/', so this range is exactly the paths under the prefix
+            start = bisect.bisect_left(paths, prefix)
+            end = bisect.bisect_left(paths, prefix[:-1] + '0') if prefix else len(paths)
+            for position in range(start, end):
+                hasher.update(f"{paths[position]}\0{ids[position]}\n".encode())
+            return hasher.hexdigest() if end > start else None
+
+        target = self.root / relative
+        if target.is_file():
+            stat = target.stat()
+            return f"{stat.st_mtime_ns}:{stat.st_size}"
+        if not target.is_dir():
+            return None
+        for directory, subdirs, names in os.walk(target):
+            subdirs[:] = sorted(name for name in subdirs if name not in IGNORED_DIRS)
+            for name in sorted(names):
+                try:
+                    stat = os.stat(os.path.join(directory, name))
+                except OSError:
+                    continue
+                hasher.update(f"{os.path.join(directory, name)}\0{stat.st_mtime_ns}:{stat.st_size}\n".encode())
+        return hasher.hexdigest()
+
+    def artifact_fingerprint(self, pattern: str) -> Optional[str]:
+        """mtime and size fingerprint of the files on disk matching a glob, None if there are none
+
+        For build artifacts git does not list, matched the way collectors
+        find them (Path.glob from the root), so a report written under a
+        tracked directory is noticed as well.
+        """
+        hasher = hashlib.sha1()
+        matched = False
+        for path in sorted(self.root.glob(pattern)):
+            try:
+                if not path.is_file():
+                    continue
+                stat = path.stat()
+            except OSError:
+                continue
+            matched = True
+            hasher.update(f"{path.relative_to(self.root).as_posix()}\0{stat.st_mtime_ns}:{stat.st_size}\n".encode())
+        return hasher.hexdigest() if matched else None
+
+    def _git(self, *args: str) -> Optional[bytes]:
+        """Output of a git command run in the root, or None if it fails"""
+        try:
+            return subprocess.run(['git', '-C', str(self.root), *args],
+                                  capture_output=True, check=True).stdout
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.warning(f"git {args[0]} failed in {self.root}: {e}")
+            return None
+
+    def head_commit(self) -> Optional[str]:
+        """Commit checked out at the root, or None outside a git checkout"""
+        output = self._git('rev-parse', 'HEAD')
+        return output.decode().strip() if output else None
+
+    def changed_since(self, revision: str) -> Optional[List[str]]:
+        """Relative paths added, modified, deleted or renamed between a revision and HEAD
+
+        Returns None when the revision cannot be resolved, e.g. in a shallow clone.
+        """
+        output = self._git('diff', '--name-only', '--no-renames', '--relative', '-z', revision, 'HEAD')
+        if output is None:
+            return None
+        return sorted(set(os.fsdecode(name) for name in output.split(b'\0') if name))
@@ -6,21 +6,14 @@ Tracks project progression and generates historical trend analysis
 import os
 import sys
 import json
-import git
 from datetime import datetime, timedelta
 from pathlib import Path
-import logging
 from typing import Dict, List, Any, Optional
-import matplotlib.pyplot as plt
-import pandas as pd
 import argparse
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
+from structured_logging import configure_logging, get_logger, load_config
+
+logger = get_logger(__name__)
 
 class HistoricalAnalyzer:
     """Analyzes historical project data and generates trend insights."""
@@ -32,6 +25,8 @@ class HistoricalAnalyzer:
             project_path: Path to the project repository
             analysis_period: Number of days to analyze (default: 30)
         """
+        import git
+        
         self.project_path = Path(project_path)
         self.analysis_period = analysis_period
         self.repo = git.Repo(project_path)
@@ -483,9 +478,14 @@ def main():
                        help="Analysis period in days (default: 30)")
     parser.add_argument("--project-path", type=str, default=".",
                        help="Path to project repository (default: current directory)")
+    parser.add_argument("--config", type=str, default="ai_blueprint_config.yaml",
+                       help="Configuration with the logging settings (default: ai_blueprint_config.yaml)")
     
     args = parser.parse_args()
     
+    config = load_config(args.config)
+    configure_logging(config.get('logging'), 'historical_analyzer')
+
     analyzer = HistoricalAnalyzer(args.project_path, args.period)
     analyzer.run()
 
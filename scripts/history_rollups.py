@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+NetNeural History Rollups
+Hourly, daily and weekly metric rollups and retention compaction for monitor history
+"""
+
+import os
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+from snapshot_store import SnapshotStore, parse_timestamp, unflatten_state
+
+# Tiers from finest to coarsest: (name, bucket length in seconds)
+ROLLUP_TIERS = [
+    ('hourly', 3600),
+    ('daily', 86400),
+    ('weekly', 7 * 86400),
+]
+
+DEFAULT_RETENTION = {
+    'raw_snapshots': 7,
+    'hourly_rollups': 30,
+    'daily_rollups': 365,
+    'weekly_rollups': 1095,
+}
+
+
+def bucket_start(timestamp: float, tier: str) -> float:
+    """Align a timestamp down to the start of its rollup bucket"""
+    moment = datetime.fromtimestamp(timestamp)
+    if tier == 'hourly':
+        moment = moment.replace(minute=0, second=0, microsecond=0)
+    else:
+        moment = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+        if tier == 'weekly':
+            moment -= timedelta(days=moment.weekday())
+    return moment.timestamp()
+
+
+def is_metric(value: Any) -> bool:
+    """Only numeric leaves are rolled up"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def merge_stats(stats: Dict[str, list], path: str, other: list) -> None:
+    """Merge [min, max, mean, last, count] statistics for one metric"""
+    current = stats.get(path)
+    if current is None:
+        stats[path] = list(other)
+        return
+    count = current[4] + other[4]
+    current[0] = min(current[0], other[0])
+    current[1] = max(current[1], other[1])
+    current[2] = (current[2] * current[4] + other[2] * other[4]) / count
+    current[3] = other[3]
+    current[4] = count
+
+
+class HistoryCompactor:
+    """Maintains rollup tiers and enforces retention for the snapshot store.
+
+    Each tier is rolled up from the tier below it (raw snapshots feed hourly,
+    hourly feeds daily, daily feeds weekly) and only complete buckets are
+    written, so compaction is incremental and safe to run every cycle.
+    """
+
+    def __init__(self, store: SnapshotStore, retention: Optional[Dict[str, int]] = None):
+        """Initialize the compactor.
+
+        Args:
+            store: Snapshot store holding raw snapshots
+            retention: Days to keep per tier, see DEFAULT_RETENTION
+        """
+        self.store = store
+        self.retention = dict(DEFAULT_RETENTION, **(retention or {}))
+        self.rollups_path = store.history_path / "rollups"
+        self.rollups_path.mkdir(parents=True, exist_ok=True)
+
+    def _tier_file(self, tier: str) -> Path:
+        """Path of the rollup file for a tier"""
+        return self.rollups_path / f"{tier}.jsonl"
+
+    def read_tier(self, tier: str, start: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Return rollup points for a tier with bucket start >= start"""
+        tier_file = self._tier_file(tier)
+        if not tier_file.exists():
+            return []
+        points = []
+        with open(tier_file, 'r') as f:
+            for line in f:
+                point = json.loads(line)
+                if start is None or point['t'] >= start:
+                    points.append(point)
+        return points
+
+    def _write_tier(self, tier: str, points: Iterable[Dict[str, Any]], append: bool) -> None:
+        """Append to or atomically rewrite a tier file"""
+        lines = [json.dumps(point, separators=(',', ':')) + '\n' for point in points]
+        if append:
+            with open(self._tier_file(tier), 'a') as f:
+                f.writelines(lines)
+            return
+        tmp_file = self._tier_file(tier).with_suffix('.jsonl.tmp')
+        with open(tmp_file, 'w') as f:
+            f.writelines(lines)
+        os.replace(tmp_file, self._tier_file(tier))
+
+    def _watermark(self, tier: str, length: int) -> Optional[float]:
+        """End of the newest bucket already written for a tier"""
+        tier_file = self._tier_file(tier)
+        if not tier_file.exists() or tier_file.stat().st_size == 0:
+            return None
+        with open(tier_file, 'rb') as f:
+            f.seek(max(0, tier_file.stat().st_size - 65536))
+            last_line = f.read().splitlines()[-1]
+        return json.loads(last_line)['t'] + length
+
+    def _roll_raw(self, start: Optional[float], end: float) -> List[Dict[str, Any]]:
+        """Roll raw snapshots in [start, end) into hourly points"""
+        points: Dict[float, Dict[str, Any]] = {}
+        for timestamp, flat in self.store.iter_flat(start, end):
+            bucket = bucket_start(timestamp, 'hourly')
+            point = points.setdefault(bucket, {'t': bucket, 'n': 0, 'm': {}})
+            point['n'] += 1
+            for path, value in flat.items():
+                if is_metric(value):
+                    merge_stats(point['m'], path, [value, value, value, value, 1])
+        return [points[bucket] for bucket in sorted(points)]
+
+    def _roll_points(self, points: List[Dict[str, Any]], tier: str) -> List[Dict[str, Any]]:
+        """Merge finer rollup points into buckets of a coarser tier"""
+        merged: Dict[float, Dict[str, Any]] = {}
+        for point in points:
+            bucket = bucket_start(point['t'], tier)
+            target = merged.setdefault(bucket, {'t': bucket, 'n': 0, 'm': {}})
+            target['n'] += point['n']
+            for path, stats in point['m'].items():
+                merge_stats(target['m'], path, stats)
+        return [merged[bucket] for bucket in sorted(merged)]
+
+    def compact(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Roll up complete buckets and prune everything past retention"""
+        # Concurrent runs would both roll the buckets past the same watermark
+        with self.store.lock():
+            return self._compact(now or datetime.now())
+
+    def _compact(self, now: datetime) -> Dict[str, int]:
+        """Compact under the store's commit lock"""
+        report = {}
+
+        previous_tier = None
+        for tier, length in ROLLUP_TIERS:
+            watermark = self._watermark(tier, length)
+            end = bucket_start(now.timestamp(), tier)
+            if previous_tier is None:
+                points = self._roll_raw(watermark, end)
+            else:
+                source = [point for point in self.read_tier(previous_tier, watermark)
+                          if point['t'] < end]
+                points = self._roll_points(source, tier)
+            if points:
+                self._write_tier(tier, points, append=True)
+            report[f"{tier}_rolled"] = len(points)
+            previous_tier = tier
+
+        # Raw snapshots are dropped a whole day segment at a time
+        raw_cutoff = now - timedelta(days=self.retention['raw_snapshots'])
+        report['raw_dropped'] = self.store.drop_segments_before(int(raw_cutoff.strftime("%Y%m%d")))
+        for legacy_file in self.store.history_path.glob("state_snapshot_*.json"):
+            if datetime.fromtimestamp(legacy_file.stat().st_mtime) < raw_cutoff:
+                legacy_file.unlink()
+
+        for tier, _ in ROLLUP_TIERS:
+            cutoff = (now - timedelta(days=self.retention[f"{tier}_rollups"])).timestamp()
+            points = self.read_tier(tier)
+            kept = [point for point in points if point['t'] >= cutoff]
+            if len(kept) != len(points):
+                self._write_tier(tier, kept, append=False)
+            report[f"{tier}_dropped"] = len(points) - len(kept)
+        return report
+
+    def resolution_for(self, days: int, max_points: int) -> Tuple[str, int]:
+        """Pick the finest rollup tier covering a period within a point budget"""
+        for tier, length in ROLLUP_TIERS:
+            covers = days <= self.retention[f"{tier}_rollups"]
+            if covers and days * 86400 / length <= max_points:
+                return tier, length
+        return ROLLUP_TIERS[-1]
+
+    def load_points(self, days: int, max_points: int) -> Tuple[str, List[Dict[str, Any]]]:
+        """Load snapshot-shaped points for a period at a bounded resolution
+
+        Raw snapshots are used wherever they fit the point budget, and the
+        rest of the period is filled from the finest affordable rollup tier.
+        """
+        start = (datetime.now() - timedelta(days=days)).timestamp()
+        tier, length = self.resolution_for(days, max_points)
+        raw = self.store.range(start=start) if self.store.count(start) <= max_points else None
+        raw_start = parse_timestamp(raw[0]['timestamp']) if raw else None
+
+        snapshots = []
+        for point in self.read_tier(tier, bucket_start(start, tier)):
+            if raw_start is not None and point['t'] + length > raw_start:
+                break
+            snapshot = unflatten_state({path: stats[2] for path, stats in point['m'].items()})
+            snapshot['timestamp'] = datetime.fromtimestamp(point['t']).isoformat()
+            snapshot['_rollup'] = {'resolution': tier, 'snapshots': point['n']}
+            snapshots.append(snapshot)
+
+        if raw is not None:
+            return ('raw' if not snapshots else tier), snapshots + raw
+
+        # Rollups lag by up to one bucket; finish the series with the newest raw state
+        latest = self.store.latest()
+        if latest and (not snapshots or latest.get('timestamp', '') > snapshots[-1]['timestamp']):
+            snapshots.append(latest)
+        return tier, snapshots
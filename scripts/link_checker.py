@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+NetNeural Link Checker
+Parallel, hash-cached check of relative links and heading anchors across the markdown corpus
+"""
+
+import re
+import logging
+import posixpath
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple
+from urllib.parse import unquote
+
+from scan_cache import ScanCache
+from collector_scheduler import run_in_spawn_pool
+
+logger = logging.getLogger(__name__)
+
+# Below this many uncached documents, parsing inline beats starting worker processes
+POOL_THRESHOLD = 32
+
+FENCE_RE = re.compile(r'^[ \t]*(```|~~~)[^\n]*\n.*?(?:^[ \t]*\1[ \t]*$|\Z)', re.MULTILINE | re.DOTALL)
+CODE_SPAN_RE = re.compile(r'(`+)[^`\n].*?\1')
+HTML_COMMENT_RE = re.compile(r'<!--.*?-->', re.DOTALL)
+ATX_HEADING_RE = re.compile(r'^ {0,3}#{1,6}[ \t]+(.*?)(?:[ \t]+#+)?[ \t]*$', re.MULTILINE)
+SETEXT_HEADING_RE = re.compile(r'^ {0,3}(\S[^\n]*)\n {0,3}(?:=+|-+)[ \t]*$', re.MULTILINE)
+HTML_ANCHOR_RE = re.compile(r'<[a-zA-Z][^>]*?\s(?:id|name)\s*=\s*["\']([^"\']+)["\']')
+INLINE_LINK_RE = re.compile(r'\[(?:[^\[\]\n]|\[[^\]\n]*\])*\]\(\s*(<[^>\n]*>|[^)\s]+)(?:\s+["\'(][^\n]*?)?\s*\)')
+REFERENCE_DEFINITION_RE = re.compile(r'^ {0,3}\[[^\]\n]+\]:[ \t]*(<[^>\n]*>|\S+)', re.MULTILINE)
+HTML_LINK_RE = re.compile(r'<(?:a|img)\s[^>]*?(?:href|src)\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+MARKUP_LINK_RE = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+SCHEME_RE = re.compile(r'[a-zA-Z][a-zA-Z0-9+.-]*:')
+LINE_ANCHOR_RE = re.compile(r'L\d+(?:C\d+)?(?:-L\d+(?:C\d+)?)?\Z')
+
+
+def blank(match: re.Match) -> str:
+    """Replace matched text with spaces, keeping newlines so offsets and lines stay put"""
+    return re.sub(r'[^\n]', ' ', match.group())
+
+
+def heading_slug(text: str) -> str:
+    """GitHub-style anchor of a heading: markup dropped, lowercased, punctuation removed, spaces to hyphens"""
+    text = MARKUP_LINK_RE.sub(r'\1', text)
+    text = HTML_TAG_RE.sub('', text)
+    return re.sub(r'[^\w\- ]', '', text.strip().lower()).replace(' ', '-')
+
+
+def parse_markdown(text: str) -> Dict[str, List[Any]]:
+    """Anchors a document defines and [target, line] of every link it makes
+
+    Code fences and HTML comments are blanked first, so examples inside
+    them are neither anchors nor links; code spans are blanked once the
+    headings, whose slugs keep their text, are read. Repeated headings get
+    GitHub's -1, -2 suffixes.
+    """
+    text = FENCE_RE.sub(blank, text)
+    text = HTML_COMMENT_RE.sub(blank, text)
+
+    headings = [(match.start(), match.group(1)) for match in ATX_HEADING_RE.finditer(text)]
+    headings += [(match.start(), match.group(1)) for match in SETEXT_HEADING_RE.finditer(text)
+                 if not match.group(1).lstrip().startswith(('-', '*', '+', '|', '>', '#'))]
+    anchors: List[str] = []
+    seen: Dict[str, int] = {}
+    for _, heading in sorted(headings):
+        slug = heading_slug(heading)
+        if slug in seen:
+            seen[slug] += 1
+            slug = f"{slug}-{seen[slug]}"
+        else:
+            seen[slug] = 0
+        anchors.append(slug)
+    text = CODE_SPAN_RE.sub(blank, text)
+    anchors.extend(HTML_ANCHOR_RE.findall(text))
+
+    links = []
+    for pattern in (INLINE_LINK_RE, REFERENCE_DEFINITION_RE, HTML_LINK_RE):
+        for match in pattern.finditer(text):
+            target = match.group(1).strip()
+            if target.startswith('<') and target.endswith('>'):
+                target = target[1:-1]
+            links.append([target, text.count('\n', 0, match.start(1)) + 1])
+    links.sort(key=lambda link: link[1])
+    return {'anchors': anchors, 'links': links}
+
+
+def parse_batch(paths: List[str]) -> List[Optional[Dict[str, List[Any]]]]:
+    """Parse a batch of documents; runs in worker processes, unreadable files yield None"""
+    results = []
+    for path in paths:
+        try:
+            with open(path, 'rb') as f:
+                results.append(parse_markdown(f.read().decode('utf-8', 'ignore')))
+        except OSError:
+            results.append(None)
+    return results
+
+
+def resolve_target(document: str, target: str) -> Optional[Tuple[str, str]]:
+    """(repository path, anchor) a relative link points at; None for external links"""
+    if SCHEME_RE.match(target) or target.startswith('//'):
+        return None
+    path, _, anchor = target.partition('#')
+    path = unquote(path.partition('?')[0])
+    if not path:
+        return document, unquote(anchor)
+    if path.startswith('/'):
+        resolved = posixpath.normpath(path.lstrip('/') or '.')
+    else:
+        resolved = posixpath.normpath(posixpath.join(posixpath.dirname(document), path))
+    return resolved, unquote(anchor)
+
+
+class LinkChecker:
+    """Checks relative links and anchors in every markdown document of the repository.
+
+    Documents are parsed for headings and links in a process pool, and each
+    parse is cached by content hash, so a re-check only reads edited files.
+    All anchors go into one index keyed by document path, and every link is
+    then resolved against it and the file listing with set lookups in a
+    single pass.
+    """
+
+    def __init__(self, cache: ScanCache, root: Path, max_workers: Optional[int] = None):
+        """Initialize the checker.
+
+        Args:
+            cache: Content-addressed cache for per-document parses
+            root: Project root that file paths are relative to
+            max_workers: Worker processes (default: CPU count)
+        """
+        self.cache = cache
+        self.root = Path(root)
+        self.max_workers = max_workers
+
+    def parse_documents(self, documents: List[str]) -> Tuple[Dict[str, Dict[str, List[Any]]], int]:
+        """Parse of every document, and how many had to be (re)parsed"""
+        keys: Dict[str, str] = {}
+        pending: Dict[str, str] = {}
+        for relative in documents:
+            try:
+                key = self.cache.digest(self.root / relative)
+            except OSError:
+                continue
+            keys[relative] = key
+            if self.cache.get(key) is None:
+                pending[key] = str(self.root / relative)
+
+        jobs = list(pending.items())
+        results = run_in_spawn_pool(parse_batch, [path for _, path in jobs], self.max_workers, POOL_THRESHOLD)
+        for (key, _), parsed in zip(jobs, results):
+            if parsed is not None:
+                self.cache.put(key, parsed)
+
+        self.cache.save(keys.values())
+        parsed_documents = {relative: self.cache.get(key) for relative, key in keys.items()
+                            if self.cache.get(key) is not None}
+        return parsed_documents, len(pending)
+
+    def check(self, files: List[str], excluded: Iterable[str] = ()) -> Dict[str, Any]:
+        """Check the links of every markdown file outside the excluded roots
+
+        Excluded documents are still parsed, so links into them resolve.
+        """
+        documents = [relative for relative in files if relative.lower().endswith('.md')]
+        parsed, reparsed = self.parse_documents(documents)
+        logger.info(f"Links: {len(documents)} documents, {reparsed} reparsed")
+        anchors: Dict[str, Set[str]] = {relative: set(result['anchors']) for relative, result in parsed.items()}
+        existing = set(files)
+        directories = {'.'}
+        for relative in files:
+            parent = relative.rpartition('/')[0]
+            while parent and parent not in directories:
+                directories.add(parent)
+                parent = parent.rpartition('/')[0]
+
+        prefixes = tuple(root.strip('/') + '/' for root in excluded)
+        report = {'documents': 0, 'links': 0, 'external': 0, 'broken_links': 0, 'broken_anchors': 0,
+                  'broken': {}}
+        for relative, result in parsed.items():
+            if relative.startswith(prefixes):
+                continue
+            report['documents'] += 1
+            broken = []
+            for target, line in result['links']:
+                report['links'] += 1
+                resolved = resolve_target(relative, target)
+                if resolved is None:
+                    report['external'] += 1
+                    continue
+                path, anchor = resolved
+                if path not in existing and path.rstrip('/') not in directories:
+                    report['broken_links'] += 1
+                    broken.append(f"{target}@{line}")
+                elif (anchor and path in anchors and not LINE_ANCHOR_RE.match(anchor)
+                      and anchor not in anchors[path] and anchor.lower() not in anchors[path]):
+                    report['broken_anchors'] += 1
+                    broken.append(f"{target}@{line}")
+            if broken:
+                report['broken'][relative] = broken
+        return report
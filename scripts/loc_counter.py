@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+NetNeural LOC Counter
+Parallel, hash-cached code/comment/blank line inventory with per-directory rollups
+"""
+
+import os
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from scan_cache import ScanCache
+from collector_scheduler import run_in_spawn_pool
+
+logger = logging.getLogger(__name__)
+
+# Comment syntax per family: (line comment markers, (block open, block close) or None)
+SYNTAXES = {
+    'c': (('//',), ('/*', '*/')),
+    'sql': (('--',), ('/*', '*/')),
+    'hash': (('#',), None),
+}
+
+# extension: (language, syntax)
+LANGUAGES = {
+    '.ts': ('TypeScript', 'c'),
+    '.tsx': ('TSX', 'c'),
+    '.js': ('JavaScript', 'c'),
+    '.jsx': ('JavaScript', 'c'),
+    '.mjs': ('JavaScript', 'c'),
+    '.cjs': ('JavaScript', 'c'),
+    '.go': ('Go', 'c'),
+    '.sql': ('SQL', 'sql'),
+    '.py': ('Python', 'hash'),
+    '.sh': ('Shell', 'hash'),
+    '.bash': ('Shell', 'hash'),
+}
+
+# Below this many uncached files, counting inline beats starting worker processes
+POOL_THRESHOLD = 64
+COUNTERS = ('files', 'code', 'comment', 'blank')
+
+
+def count_lines(text: str, syntax: str) -> Tuple[int, int, int]:
+    """Classify lines as code, comment or blank; a line with any code is code"""
+    line_markers, block = SYNTAXES[syntax]
+    code = comment = blank = 0
+    in_block = False
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            blank += 1
+            continue
+        has_code = has_comment = False
+        position = 0
+        while position < len(line):
+            if in_block:
+                has_comment = True
+                end = line.find(block[1], position)
+                if end < 0:
+                    break
+                in_block = False
+                position = end + len(block[1])
+                continue
+            nearest, marker = len(line), None
+            for candidate in line_markers + ((block[0],) if block else ()):
+                found = line.find(candidate, position)
+                if 0 <= found < nearest:
+                    nearest, marker = found, candidate
+            if line[position:nearest].strip():
+                has_code = True
+            if marker is None:
+                break
+            has_comment = True
+            if marker in line_markers:
+                break
+            in_block = True
+            position = nearest + len(marker)
+        if has_code:
+            code += 1
+        elif has_comment:
+            comment += 1
+    return code, comment, blank
+
+
+def count_file(path: str, syntax: str) -> Tuple[int, int, int]:
+    """Count one file; runs in worker processes"""
+    with open(path, 'rb') as f:
+        return count_lines(f.read().decode('utf-8', 'ignore'), syntax)
+
+
+def count_batch(jobs: List[Tuple[str, str]]) -> List[Optional[Tuple[int, int, int]]]:
+    """Count a batch of (path, syntax) jobs; unreadable files yield None"""
+    results = []
+    for path, syntax in jobs:
+        try:
+            results.append(count_file(path, syntax))
+        except OSError:
+            results.append(None)
+    return results
+
+
+def new_totals() -> Dict[str, int]:
+    """Zeroed inventory counters"""
+    return {counter: 0 for counter in COUNTERS}
+
+
+def add_totals(target: Dict[str, int], counts: Tuple[int, int, int]) -> None:
+    """Add one file's counts to a rollup"""
+    target['files'] += 1
+    target['code'] += counts[0]
+    target['comment'] += counts[1]
+    target['blank'] += counts[2]
+
+
+def ancestors(directory: str, depth: int) -> List[str]:
+    """Rollup directories of a file's directory: every ancestor down to depth, '.' at the root"""
+    parents = directory.split('/')[:depth] if directory else []
+    return ['/'.join(parents[:level]) for level in range(1, len(parents) + 1)] or ['.']
+
+
+class LocCounter:
+    """Counts code, comment and blank lines across the monorepo.
+
+    Per-file counts are cached by content hash, so a recount only reads
+    files that changed. Uncached files are counted in a process pool, since
+    line classification is CPU-bound.
+    """
+
+    def __init__(self, cache: ScanCache, root: Path, deno_paths: List[str] = (),
+                 max_workers: Optional[int] = None, rollup_depth: int = 2):
+        """Initialize the counter.
+
+        Args:
+            cache: Content-addressed cache for per-file counts
+            root: Project root that file paths are relative to
+            deno_paths: Directories whose TypeScript runs on Deno (edge functions)
+            max_workers: Worker processes (default: CPU count)
+            rollup_depth: Directory depth of the per-directory rollups
+        """
+        self.cache = cache
+        self.root = Path(root)
+        self.deno_paths = [path.strip('/') + '/' for path in deno_paths]
+        self.max_workers = max_workers
+        self.rollup_depth = rollup_depth
+
+    def classify(self, relative: str) -> Optional[Tuple[str, str]]:
+        """Language and comment syntax of a file, or None if not counted"""
+        language = LANGUAGES.get(os.path.splitext(relative)[1].lower())
+        if language and language[0] == 'TypeScript' and relative.startswith(tuple(self.deno_paths)):
+            return 'Deno', language[1]
+        return language
+
+    def keyed(self, files: List[str]) -> Tuple[List[Tuple[str, str, str]], Dict[str, Tuple[str, str]]]:
+        """(relative, language, cache key) of counted files, and the uncached jobs by key"""
+        counted: List[Tuple[str, str, str]] = []
+        pending: Dict[str, Tuple[str, str]] = {}
+        for relative in files:
+            language = self.classify(relative)
+            if language is None:
+                continue
+            try:
+                # Counts depend on the comment syntax as well as the content
+                key = f"{language[1]}:{self.cache.digest(self.root / relative)}"
+            except OSError:
+                continue
+            counted.append((relative, language[0], key))
+            if self.cache.get(key) is None:
+                pending[key] = (str(self.root / relative), language[1])
+        return counted, pending
+
+    def count_pending(self, pending: Dict[str, Tuple[str, str]]) -> None:
+        """Count uncached jobs into the cache, in a process pool when there are enough"""
+        jobs = list(pending.items())
+        results = run_in_spawn_pool(count_batch, [job for _, job in jobs], self.max_workers, POOL_THRESHOLD)
+        for (key, _), counts in zip(jobs, results):
+            if counts is not None:
+                self.cache.put(key, list(counts))
+
+    def measure(self, files: List[str]) -> Dict[str, int]:
+        """Flat totals for a batch of files, the unit of sampled scans
+
+        Holds the inventory counters plus one 'Language:counter' entry per
+        language, all additive, so sampled batches can be scaled and summed
+        back into an inventory by rollup().
+        """
+        counted, pending = self.keyed(files)
+        self.count_pending(pending)
+        totals = new_totals()
+        languages: Dict[str, Dict[str, int]] = {}
+        for _, language, key in counted:
+            counts = self.cache.get(key)
+            if counts is not None:
+                add_totals(totals, counts)
+                add_totals(languages.setdefault(language, new_totals()), counts)
+        for language, language_totals in languages.items():
+            totals.update((f"{language}:{counter}", value) for counter, value in language_totals.items())
+        return totals
+
+    def rollup(self, units: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
+        """Inventory of the same shape as count() from measure() totals per directory
+
+        Values may be estimates, so they are rounded once summed.
+        """
+        inventory: Dict[str, Any] = {'total': new_totals(), 'languages': {}, 'directories': {}}
+        for directory, metrics in units.items():
+            for metric, value in metrics.items():
+                language, _, counter = metric.rpartition(':')
+                if language:
+                    target = inventory['languages'].setdefault(language, new_totals())
+                    target[counter] += value
+                    continue
+                inventory['total'][metric] += value
+                for rollup in ancestors(directory, self.rollup_depth):
+                    inventory['directories'].setdefault(rollup, new_totals())[metric] += value
+        for totals in [inventory['total'], *inventory['languages'].values(), *inventory['directories'].values()]:
+            for counter in COUNTERS:
+                totals[counter] = round(totals[counter])
+        inventory['directories'] = dict(sorted(inventory['directories'].items()))
+        return inventory
+
+    def count(self, files: List[str]) -> Dict[str, Any]:
+        """Count files (relative paths) and roll results up by language and directory"""
+        counted, pending = self.keyed(files)
+        self.count_pending(pending)
+        self.cache.save(key for _, _, key in counted)
+
+        logger.info(f"Code inventory: {len(counted)} files, {len(pending)} recounted")
+        inventory = {'total': new_totals(), 'languages': {}, 'directories': {}}
+        for relative, language, key in counted:
+            counts = self.cache.get(key)
+            if counts is None:
+                continue
+            add_totals(inventory['total'], counts)
+            add_totals(inventory['languages'].setdefault(language, new_totals()), counts)
+            for directory in ancestors(relative.rpartition('/')[0], self.rollup_depth):
+                add_totals(inventory['directories'].setdefault(directory, new_totals()), counts)
+        inventory['directories'] = dict(sorted(inventory['directories'].items()))
+        return inventory
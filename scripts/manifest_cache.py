@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+NetNeural Manifest Cache
+Parses package.json and go.mod manifests once and shares them across collectors
+"""
+
+import os
+import re
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from collector_scheduler import abandoned
+
+GO_REQUIRE_BLOCK_RE = re.compile(r"^require\s*\((.*?)^\)", re.MULTILINE | re.DOTALL)
+GO_REQUIRE_LINE_RE = re.compile(r"^require[ \t]+([^\s(]+)[ \t]+\S+", re.MULTILINE)
+
+
+def parse_package_json(text: str) -> Dict[str, Any]:
+    """Reduce a package.json to the fields collectors use"""
+    package = json.loads(text)
+    return {
+        'name': package.get('name'),
+        'dependencies': sorted(package.get('dependencies', {}) or {}),
+        'dev_dependencies': sorted(package.get('devDependencies', {}) or {}),
+        'scripts': sorted(package.get('scripts', {}) or {}),
+    }
+
+
+def parse_go_mod(text: str) -> Dict[str, Any]:
+    """Reduce a go.mod to its module path, Go version and requirements"""
+    module = re.search(r"^module\s+(\S+)", text, re.MULTILINE)
+    go_version = re.search(r"^go\s+(\S+)", text, re.MULTILINE)
+    requires = set(GO_REQUIRE_LINE_RE.findall(text))
+    for block in GO_REQUIRE_BLOCK_RE.findall(text):
+        for line in block.splitlines():
+            line = line.split('//')[0].strip()
+            if line:
+                requires.add(line.split()[0])
+    return {
+        'module': module.group(1) if module else None,
+        'go': go_version.group(1) if go_version else None,
+        'requires': sorted(requires),
+    }
+
+
+PARSERS = {
+    'package.json': parse_package_json,
+    'go.mod': parse_go_mod,
+}
+
+
+class ManifestCache:
+    """Thread-safe manifest cache keyed by path, mtime and size.
+
+    Within a run each path is stat'ed and parsed at most once, including
+    misses, so repeated probes from different collectors are free. Parsed
+    manifests persist between runs and are re-parsed only when they change.
+    """
+
+    def __init__(self, cache_file: Path):
+        """Initialize the cache backed by a JSON file"""
+        self.cache_file = Path(cache_file)
+        self.lock = threading.Lock()
+        self.persisted: Dict[str, list] = {}
+        self.run_memo: Dict[str, Optional[Dict[str, Any]]] = {}
+        self.missing = set()
+        self.dirty = False
+        try:
+            with open(self.cache_file, 'r') as f:
+                self.persisted = json.load(f)
+        except (IOError, json.JSONDecodeError):
+            self.persisted = {}
+
+    def reset_run(self) -> None:
+        """Forget per-run results so the next probe re-checks mtimes"""
+        with self.lock:
+            self.run_memo = {}
+            self.missing = set()
+
+    def get(self, path: Path) -> Optional[Dict[str, Any]]:
+        """Return the parsed manifest at path, or None if missing or invalid"""
+        key = str(path)
+        with self.lock:
+            if key in self.run_memo:
+                return self.run_memo[key]
+
+        parser = PARSERS[path.name]
+        try:
+            stat = path.stat()
+        except OSError:
+            parsed = None
+            with self.lock:
+                self.missing.add(key)
+        else:
+            known = self.persisted.get(key)
+            if known and known[0] == stat.st_mtime_ns and known[1] == stat.st_size:
+                parsed = known[2]
+            else:
+                try:
+                    parsed = parser(path.read_text(encoding='utf-8'))
+                except (ValueError, IOError, UnicodeDecodeError):
+                    parsed = None
+                if abandoned():
+                    return parsed
+                with self.lock:
+                    self.persisted[key] = [stat.st_mtime_ns, stat.st_size, parsed]
+                    self.dirty = True
+
+        # An abandoned collector may still be probing after the next run reset the memo
+        if abandoned():
+            return parsed
+        with self.lock:
+            self.run_memo[key] = parsed
+        return parsed
+
+    def package_json(self, directory: Path) -> Optional[Dict[str, Any]]:
+        """Parsed package.json of a directory"""
+        return self.get(directory / "package.json")
+
+    def go_mod(self, directory: Path) -> Optional[Dict[str, Any]]:
+        """Parsed go.mod of a directory"""
+        return self.get(directory / "go.mod")
+
+    def save(self) -> None:
+        """Persist parsed manifests, dropping entries for deleted files"""
+        with self.lock:
+            for key in self.missing:
+                if self.persisted.pop(key, None) is not None:
+                    self.dirty = True
+            if not self.dirty:
+                return
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(self.persisted, f, separators=(',', ':'))
+            os.replace(tmp_file, self.cache_file)
+            self.dirty = False
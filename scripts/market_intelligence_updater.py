@@ -7,23 +7,13 @@ import os
 import sys
 import json
 import time
-import requests
 from datetime import datetime, timedelta
 from pathlib import Path
-import logging
 from typing import Dict, List, Any
-import yaml
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/market_intelligence.log'),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger(__name__)
+from structured_logging import configure_logging, get_logger
+
+logger = get_logger(__name__)
 
 class MarketIntelligenceUpdater:
     """Automated market intelligence collection and analysis system."""
@@ -37,6 +27,8 @@ class MarketIntelligenceUpdater:
         
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Load configuration from YAML file."""
+        import yaml
+        
         try:
             with open(config_path, 'r') as file:
                 return yaml.safe_load(file)
@@ -334,4 +326,5 @@ The global IoT market continues to experience robust growth, reaching $79.13B in
 
 if __name__ == "__main__":
     updater = MarketIntelligenceUpdater()
+    configure_logging(updater.config.get('logging'), 'market_intelligence')
     updater.run()
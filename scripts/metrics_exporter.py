@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+NetNeural Metrics Exporter
+Serves the latest documentation monitor state as OpenMetrics over HTTP
+"""
+
+import re
+import threading
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+from snapshot_store import parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+OPENMETRICS_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+PROMETHEUS_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+PREFIX = 'netneural'
+SECTIONS = ('technical_metrics', 'business_metrics', 'project_metrics', 'documentation_health', 'schema')
+
+# Maps keyed by open-ended names become one metric with a label, not one metric per key
+LABELLED_MAPS = {
+    ('technical_metrics', 'api_endpoints', 'functions'): 'function',
+    ('technical_metrics', 'test_coverage', 'packages'): 'package',
+    ('technical_metrics', 'code_inventory', 'languages'): 'language',
+    ('technical_metrics', 'code_inventory', 'directories'): 'directory',
+    ('documentation_health', 'links', 'broken'): 'document',
+    ('documentation_health', 'code_references', 'unresolved_by_kind'): 'kind',
+    ('documentation_health', 'code_references', 'unresolved_references'): 'document',
+    ('schema', 'migrations', 'per_migration'): 'migration',
+    ('schema', 'database_dumps'): 'dump',
+}
+HEALTHY_STATUSES = ('ok', 'cached', 'reused')
+
+Sample = Tuple[str, Tuple[Tuple[str, str], ...], float]
+
+
+def metric_name(parts: Iterable[str]) -> str:
+    """OpenMetrics-safe gauge name from state path components
+
+    OpenMetrics reserves the '_total' suffix for counters, so a state
+    'total' leaf names the gauge of its parent (services_total -> services).
+    """
+    name = re.sub(r'[^a-zA-Z0-9_]', '_', '_'.join((PREFIX,) + tuple(parts))).lower()
+    return name[:-len('_total')] if name.endswith('_total') else name
+
+
+def escape_label(value: str) -> str:
+    """Escape a label value for the text exposition format"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def is_number(value: Any) -> bool:
+    """Only numeric leaves are exported"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def collect_samples(node: Dict[str, Any], parts: Tuple[str, ...],
+                    labels: Tuple[Tuple[str, str], ...], samples: List[Sample]) -> None:
+    """Collect numeric leaves of a state subtree as gauge samples"""
+    label = LABELLED_MAPS.get(parts)
+    for key, value in node.items():
+        if label is None:
+            if isinstance(value, dict):
+                collect_samples(value, parts + (str(key),), labels, samples)
+            elif is_number(value):
+                samples.append((metric_name(parts + (str(key),)), labels, value))
+            continue
+        # Entry of a labelled map: its fields become metrics labelled with the entry key
+        entry_labels = labels + ((label, str(key)),)
+        if is_number(value):
+            samples.append((metric_name(parts), entry_labels, value))
+            continue
+        if isinstance(value, list):
+            # Per-entry findings (broken links, unresolved references) export as their count
+            samples.append((metric_name(parts), entry_labels, len(value)))
+            continue
+        for field, field_value in (value.items() if isinstance(value, dict) else ()):
+            if isinstance(field_value, dict):
+                collect_samples(field_value, parts + (str(field),), entry_labels, samples)
+            elif is_number(field_value):
+                samples.append((metric_name(parts + (str(field),)), entry_labels, field_value))
+
+
+def render(state: Dict[str, Any], openmetrics: bool = True) -> bytes:
+    """Render a monitor state in the OpenMetrics (or Prometheus 0.0.4) text format"""
+    samples: List[Sample] = []
+    for section in SECTIONS:
+        collect_samples(state.get(section, {}), (section,), (), samples)
+    for name, collector in state.get('collectors', {}).items():
+        labels = (('collector', name),)
+        samples.append((metric_name(('collector', 'up')), labels,
+                        1 if collector.get('status') in HEALTHY_STATUSES else 0))
+        samples.append((metric_name(('collector', 'latency', 'seconds')), labels,
+                        round(collector.get('latency_ms', 0.0) / 1000, 6)))
+    samples.append((metric_name(('state', 'approximate')), (), 1 if state.get('approximate') else 0))
+    timestamp = parse_timestamp(state.get('timestamp'))
+    if timestamp is not None:
+        samples.append((metric_name(('state', 'timestamp', 'seconds')), (), timestamp))
+
+    by_name: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        by_name.setdefault(sample[0], []).append(sample)
+    lines = []
+    for name in sorted(by_name):
+        lines.append(f"# TYPE {name} gauge")
+        for _, labels, value in by_name[name]:
+            label_text = ','.join(f'{key}="{escape_label(val)}"' for key, val in labels)
+            lines.append(f"{name}{{{label_text}}} {value!r}" if labels else f"{name} {value!r}")
+    if openmetrics:
+        lines.append('# EOF')
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+class MetricsExporter:
+    """Embedded HTTP exporter serving pre-rendered monitor metrics.
+
+    Rendering happens when a new state is published, not when Prometheus
+    scrapes, so a scrape only copies cached bytes to the socket and never
+    scans the repository.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 9464):
+        """Initialize the exporter (call start() to begin serving)"""
+        self.host = host
+        self.port = port
+        self.bodies = {True: render({}), False: render({}, openmetrics=False)}
+        self.server: Optional[ThreadingHTTPServer] = None
+
+    def publish(self, state: Dict[str, Any]) -> None:
+        """Render a state and swap it in for subsequent scrapes"""
+        bodies = {True: render(state), False: render(state, openmetrics=False)}
+        # A single reference assignment, so scrapes see the old or new bodies, never a mix
+        self.bodies = bodies
+
+    def start(self) -> None:
+        """Serve /metrics from a background daemon thread"""
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                openmetrics = 'application/openmetrics-text' in self.headers.get('Accept', '')
+                body = exporter.bodies[openmetrics]
+                self.send_response(200)
+                self.send_header('Content-Type', OPENMETRICS_TYPE if openmetrics else PROMETHEUS_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format, *args)
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, name='metrics-exporter', daemon=True).start()
+        logger.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    def stop(self) -> None:
+        """Stop serving"""
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+NetNeural Scan Cache
+Content-addressed result cache shared by the documentation monitor collectors
+"""
+
+import os
+import json
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, Iterable, Set
+
+from collector_scheduler import abandoned
+
+
+class ScanCache:
+    """Persistent cache of per-file analysis results keyed by content hash.
+
+    File digests are memoised by (mtime, size) so unchanged files are never
+    re-read, and results are stored under the digest so identical files found
+    at different paths share a single entry.
+
+    A shared cache is used by the monitors of several workspaces at once:
+    writes are serialized, and saves defer pruning to prune_retained(), so
+    one workspace never drops entries another still needs.
+
+    Collectors the scheduler has abandoned can neither store results nor
+    save: they may finish after a later cycle has started reading.
+    """
+
+    def __init__(self, cache_dir: Path, namespace: str, version: int = 1, shared: bool = False):
+        """Initialize the cache for one collector namespace.
+
+        Args:
+            cache_dir: Directory holding the persisted cache files
+            namespace: Collector name, used as the cache file name
+            version: Bump to invalidate entries when the parser changes
+            shared: Used concurrently by several workspaces
+        """
+        self.cache_dir = Path(cache_dir)
+        self.namespace = namespace
+        self.version = version
+        self.shared = shared
+        self.cache_file = self.cache_dir / f"{namespace}.json"
+        self.files: Dict[str, list] = {}
+        self.entries: Dict[str, Any] = {}
+        # Paths digested since the last pruning save; the rest are renamed or deleted files
+        self.seen: Set[str] = set()
+        self.dirty = False
+        # Union of the digests saves kept alive since the last prune; None once a save skipped pruning
+        self.retained: Optional[Set[str]] = set()
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        """Load the persisted cache, discarding it on version mismatch"""
+        if not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return
+        if data.get('version') != self.version:
+            return
+        self.files = data.get('files', {})
+        self.entries = data.get('entries', {})
+
+    def save(self, live_digests: Optional[Iterable[str]] = None) -> None:
+        """Persist the cache atomically, optionally pruning dead entries"""
+        if abandoned():
+            return
+        with self._lock:
+            if self.shared:
+                if live_digests is None:
+                    self.retained = None
+                elif self.retained is not None:
+                    self.retained.update(live_digests)
+                live_digests = None
+            self._persist(live_digests)
+
+    def prune_retained(self) -> None:
+        """Prune a shared cache to the digests every save kept alive since the last prune"""
+        with self._lock:
+            retained, self.retained = self.retained, set()
+            self._persist(retained)
+
+    def _persist(self, live_digests: Optional[Iterable[str]]) -> None:
+        """Prune and write the cache; callers hold the lock
+
+        Pruning drops the entries not in live_digests and the memoised
+        digests of paths not hashed since the last pruning save.
+        """
+        if live_digests is not None:
+            live = set(live_digests)
+            stale = [d for d in self.entries if d not in live]
+            for digest in stale:
+                del self.entries[digest]
+            gone = [path for path in self.files if path not in self.seen]
+            for path in gone:
+                del self.files[path]
+            self.seen = set()
+            self.dirty = self.dirty or bool(stale) or bool(gone)
+        if not self.dirty:
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump({
+                'version': self.version,
+                'files': self.files,
+                'entries': self.entries
+            }, f, separators=(',', ':'))
+        os.replace(tmp_file, self.cache_file)
+        self.dirty = False
+
+    def digest(self, path: Path) -> str:
+        """Return the content hash of a file, re-hashing only if it changed"""
+        stat = path.stat()
+        key = str(path)
+        self.seen.add(key)
+        known = self.files.get(key)
+        if known and known[0] == stat.st_mtime_ns and known[1] == stat.st_size:
+            return known[2]
+
+        hasher = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+        with self._lock:
+            self.files[key] = [stat.st_mtime_ns, stat.st_size, digest]
+            self.dirty = True
+        return digest
+
+    def get(self, digest: str) -> Optional[Any]:
+        """Return the cached result for a content hash"""
+        return self.entries.get(digest)
+
+    def put(self, digest: str, value: Any) -> None:
+        """Store the result for a content hash"""
+        if abandoned():
+            return
+        with self._lock:
+            self.entries[digest] = value
+            self.dirty = True
+
+
+class ScanCacheGroup:
+    """Scan caches shared by the monitors of several workspaces.
+
+    Every workspace gets the same cache object per namespace, so a file
+    whose content is identical across checkouts is analyzed once. Pruning
+    waits for flush(), when every workspace has reported what it uses.
+    """
+
+    def __init__(self, cache_dir: Path):
+        """Initialize the group over one shared cache directory"""
+        self.cache_dir = Path(cache_dir)
+        self.caches: Dict[str, ScanCache] = {}
+        self._lock = threading.Lock()
+
+    def cache(self, namespace: str, version: int = 1) -> ScanCache:
+        """The shared cache of a namespace, loaded on first use"""
+        with self._lock:
+            cache = self.caches.get(namespace)
+            if cache is None or cache.version != version:
+                cache = self.caches[namespace] = ScanCache(self.cache_dir, namespace, version, shared=True)
+            return cache
+
+    def flush(self) -> None:
+        """Persist every cache, pruning entries no workspace used this cycle"""
+        for cache in list(self.caches.values()):
+            cache.prune_retained()
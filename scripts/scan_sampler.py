@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+NetNeural Scan Sampler
+Time-bounded stratified directory sampling with ratio estimates and confidence intervals
+"""
+
+import math
+import heapq
+import random
+import time
+from statistics import NormalDist
+from typing import Dict, List, Any, Callable, Iterable, Optional, Tuple
+
+# Directories measured per stratum before allocation turns proportional
+MIN_PER_STRATUM = 2
+
+
+def stratify(files: Iterable[str], roots: Iterable[str],
+             depth: int) -> Tuple[Dict[str, Dict[str, List[str]]], Dict[str, Dict[str, List[str]]]]:
+    """Split files into high-value and sampled strata of directories
+
+    Files under a root form that root's high-value stratum, measured in
+    full unless the deadline hits. The rest are grouped by their directory
+    (the sampling unit), and directories by their first 'depth' path
+    components (the stratum). Both map stratum -> directory -> files.
+    """
+    prefixes = [(root.strip('/'), root.strip('/') + '/') for root in roots]
+    high_value: Dict[str, Dict[str, List[str]]] = {}
+    strata: Dict[str, Dict[str, List[str]]] = {}
+    for relative in files:
+        directory = relative.rpartition('/')[0]
+        root = next((root for root, prefix in prefixes if relative.startswith(prefix)), None)
+        if root is not None:
+            high_value.setdefault(root, {}).setdefault(directory, []).append(relative)
+            continue
+        stratum = '/'.join(directory.split('/')[:depth]) if directory else '.'
+        strata.setdefault(stratum, {}).setdefault(directory, []).append(relative)
+    return high_value, strata
+
+
+def ratio_estimate(sampled: List[Tuple[int, float]], total_units: int, total_files: int,
+                   ratio: Optional[float]) -> Tuple[float, float]:
+    """Stratum total and its variance from (files, value) pairs of sampled directories
+
+    Uses the ratio estimator with directory file counts as the auxiliary
+    variable, which are known for every directory from the file index. With
+    one directory measured the variance falls back to the square of the
+    estimate; with none it is unbounded, since nothing about the stratum
+    was observed.
+    """
+    units = len(sampled)
+    if units == total_units:
+        return float(sum(value for _, value in sampled)), 0.0
+    files = sum(count for count, _ in sampled)
+    if units == 0:
+        return total_files * (ratio or 0.0), math.inf
+    stratum_ratio = sum(value for _, value in sampled) / files
+    estimate = total_files * stratum_ratio
+    if units < 2:
+        return estimate, estimate ** 2
+    residuals = [value - stratum_ratio * count for count, value in sampled]
+    spread = sum(residual ** 2 for residual in residuals) / (units - 1)
+    variance = total_units ** 2 * (1 - units / total_units) * spread / units
+    return estimate, variance
+
+
+class StratifiedSampler:
+    """Measures high-value directories in full and samples the rest until a deadline.
+
+    Directories are drawn at random without replacement, first a minimum
+    per stratum and then always from the stratum with the smallest sampled
+    fraction, so allocation stays proportional however early the deadline
+    hits. Every metric returned by the measure callback must be additive
+    over files.
+    """
+
+    def __init__(self, measure: Callable[[List[str]], Dict[str, float]],
+                 confidence: float = 0.95, seed: Optional[int] = None):
+        """Initialize the sampler.
+
+        Args:
+            measure: Callable returning additive metrics for a list of files
+            confidence: Two-sided confidence level of the reported intervals
+            seed: Random seed, for reproducible samples
+        """
+        self.measure = measure
+        self.z = NormalDist().inv_cdf((1 + confidence) / 2)
+        self.confidence = confidence
+        self.random = random.Random(seed)
+
+    def run(self, files: List[str], roots: Iterable[str], depth: int,
+            deadline: float) -> Dict[str, Any]:
+        """Estimate metric totals over files, stopping at a time.monotonic() deadline
+
+        High-value directories are measured first, one at a time; any the
+        deadline leaves unmeasured are estimated like a sampled stratum.
+        Besides totals and intervals, 'units' holds the metrics of every
+        directory: measured, or predicted from its stratum's ratio, so
+        rollups over them add up to the totals.
+        """
+        high_value, strata = stratify(files, roots, depth)
+        groups = {**high_value, **strata}
+        sampled: Dict[str, List[Tuple[str, int, Dict[str, float]]]] = {name: [] for name in groups}
+
+        def take(name: str, directory: str) -> None:
+            unit = groups[name][directory]
+            sampled[name].append((directory, len(unit), self.measure(unit)))
+
+        queue = [(name, directory) for name in sorted(high_value) for directory in sorted(high_value[name])]
+        for name, directory in queue:
+            if time.monotonic() >= deadline:
+                break
+            take(name, directory)
+
+        order = {name: self.random.sample(sorted(units), len(units)) for name, units in strata.items()}
+        heap = [(0, 0.0, -len(units), name) for name, units in strata.items()]
+        heapq.heapify(heap)
+        while heap and time.monotonic() < deadline:
+            _, _, size, name = heapq.heappop(heap)
+            taken = sampled[name]
+            take(name, order[name][len(taken)])
+            if len(taken) < len(order[name]):
+                # Round-robin up to the minimum per stratum, then lowest sampled fraction first
+                heapq.heappush(heap, (min(len(taken), MIN_PER_STRATUM), len(taken) / len(order[name]), size, name))
+
+        metrics = sorted({metric for taken in sampled.values() for _, _, values in taken for metric in values})
+        measured_files = sum(count for taken in sampled.values() for _, count, _ in taken)
+        # Fallback ratios for strata the deadline left unsampled: the random sample pooled, as
+        # high-value roots are no typical directories; those alone if nothing else was reached
+        reference = [taken for name, taken in sampled.items() if name in strata and taken] or list(sampled.values())
+        reference_files = sum(count for taken in reference for _, count, _ in taken)
+        pooled = {metric: sum(values.get(metric, 0) for taken in reference for _, _, values in taken)
+                  / reference_files if reference_files else 0.0 for metric in metrics}
+        totals, intervals = {}, {}
+        for metric in metrics:
+            estimate, variance, measured = 0.0, 0.0, 0.0
+            for name, units in groups.items():
+                stratum_files = sum(len(unit) for unit in units.values())
+                pairs = [(count, values.get(metric, 0)) for _, count, values in sampled[name]]
+                measured += sum(value for _, value in pairs)
+                stratum_estimate, stratum_variance = ratio_estimate(
+                    pairs, len(units), stratum_files, pooled[metric] if measured_files else None)
+                estimate += stratum_estimate
+                variance += stratum_variance
+            margin = self.z * math.sqrt(variance)
+            totals[metric] = round(estimate)
+            # Metrics are counts, so the measured part bounds the total from below
+            intervals[metric] = {'low': round(max(estimate - margin, measured)),
+                                 'high': round(estimate + margin) if math.isfinite(margin) else None}
+
+        units_out: Dict[str, Dict[str, float]] = {}
+        for name, units in groups.items():
+            taken = {directory: values for directory, _, values in sampled[name]}
+            taken_files = sum(count for _, count, _ in sampled[name])
+            ratios = pooled if not taken_files else {
+                metric: sum(values.get(metric, 0) for values in taken.values()) / taken_files for metric in metrics}
+            for directory, unit in units.items():
+                units_out[directory] = taken.get(directory) or {
+                    metric: ratios[metric] * len(unit) for metric in metrics}
+
+        units_total = len(units_out)
+        units_sampled = sum(len(taken) for taken in sampled.values())
+        return {
+            'total': totals,
+            'confidence_intervals': intervals,
+            'units': units_out,
+            'sampling': {
+                'approximate': units_sampled < units_total,
+                'confidence': self.confidence,
+                'exhaustive_files': sum(len(unit) for units in high_value.values() for unit in units.values()),
+                'files_total': len(files),
+                'files_measured': measured_files,
+                'directories_total': units_total,
+                'directories_sampled': units_sampled,
+                'strata': len(groups),
+                'unsampled_strata': sum(1 for taken in sampled.values() if not taken),
+            },
+        }
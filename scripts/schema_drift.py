@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+NetNeural Schema Drift
+Compares the table/column schema replayed from migrations with the generated Supabase types
+"""
+
+import re
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Any, Iterable
+
+from scan_cache import ScanCache
+from sql_analyzer import analyze_file, replay_columns
+
+# 'key: {' / 'key?: type' / 'export type Database = {' lines of the generated types file
+KEY_RE = re.compile(r'(?:export\s+type\s+)?(["\']?)(?P<key>[\w$]+)\1\??\s*[:=]')
+DIGEST_SIZE = 8
+
+
+def parse_supabase_types(path: Path) -> Dict[str, Any]:
+    """Table -> columns index of a generated Supabase types file, read line by line
+
+    Tracks the chain of open object keys, so a column is any key directly
+    under Database.<schema>.Tables.<table>.Row. Tables outside 'public' are
+    keyed 'schema.table', the way migration names are normalized.
+    """
+    stack: List[str] = []
+    schemas = set()
+    tables: Dict[str, List[str]] = {}
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped.startswith('}') and stack:
+                stack.pop()
+            match = KEY_RE.match(stripped)
+            key = match.group('key') if match else ''
+            if stripped.endswith('{'):
+                stack.append(key)
+                if len(stack) == 4 and stack[0] == 'Database' and stack[2] == 'Tables':
+                    schemas.add(stack[1])
+                    tables.setdefault(table_key(stack[1], stack[3]), [])
+            elif key and len(stack) == 5 and stack[0] == 'Database' and stack[2] == 'Tables' and stack[4] == 'Row':
+                tables[table_key(stack[1], stack[3])].append(key)
+    return {'schemas': sorted(schemas), 'tables': tables}
+
+
+def table_key(schema: str, table: str) -> str:
+    """Table name as the SQL analyzer normalizes it ('public.' is implied)"""
+    return table if schema == 'public' else f"{schema}.{table}"
+
+
+def column_digest(columns: Iterable[str]) -> str:
+    """Order-independent digest of a table's column set"""
+    return hashlib.blake2b('\0'.join(sorted(columns)).encode(), digest_size=DIGEST_SIZE).hexdigest()
+
+
+def hashed_index(tables: Dict[str, Iterable[str]]) -> Dict[str, Dict[str, Any]]:
+    """Table -> {'digest', 'columns'} index; equal digests mean equal column sets"""
+    return {table: {'digest': column_digest(columns), 'columns': sorted(columns)}
+            for table, columns in tables.items()}
+
+
+def diff_indexes(types: Dict[str, Dict[str, Any]], migrations: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Drift between two hashed indexes: one digest comparison per table, column sets only on mismatch"""
+    missing_from_types = sorted(set(migrations) - set(types))
+    missing_from_migrations = sorted(set(types) - set(migrations))
+    columns = {}
+    for table in sorted(set(types) & set(migrations)):
+        if types[table]['digest'] == migrations[table]['digest']:
+            continue
+        typed, migrated = set(types[table]['columns']), set(migrations[table]['columns'])
+        columns[table] = {'missing_from_types': sorted(migrated - typed),
+                          'missing_from_migrations': sorted(typed - migrated)}
+    return {
+        'tables_in_types': len(types),
+        'tables_in_migrations': len(migrations),
+        'drifted_tables': len(missing_from_types) + len(missing_from_migrations) + len(columns),
+        'missing_from_types': missing_from_types,
+        'missing_from_migrations': missing_from_migrations,
+        'columns': columns,
+    }
+
+
+class SchemaDriftDetector:
+    """Detects drift between migrations and the generated Supabase types.
+
+    Column DDL events are cached per migration and the types index per
+    types file, both by content hash, so a re-check after adding one
+    migration tokenizes only that file. The replayed migration index is
+    cached under the digests of the whole migration sequence.
+    """
+
+    def __init__(self, cache: ScanCache):
+        """Initialize with a content-addressed cache for events and indexes"""
+        self.cache = cache
+        self.live: List[str] = []
+
+    def cached(self, key: str, compute) -> Any:
+        """Cached value for a key, computing and storing it on a miss"""
+        self.live.append(key)
+        value = self.cache.get(key)
+        if value is None:
+            value = compute()
+            self.cache.put(key, value)
+        return value
+
+    def types_index(self, types_path: Path) -> Dict[str, Any]:
+        """Hashed index of the generated types file"""
+        def build():
+            parsed = parse_supabase_types(types_path)
+            return {'schemas': parsed['schemas'], 'tables': hashed_index(parsed['tables'])}
+        return self.cached(f"types:{self.cache.digest(types_path)}", build)
+
+    def migrations_index(self, migrations: List[Path]) -> Dict[str, Dict[str, Any]]:
+        """Hashed index of the schema left by replaying migrations in order"""
+        ordered = sorted(migrations, key=lambda p: p.name)
+        digests = [self.cache.digest(path) for path in ordered]
+        sequence = hashlib.sha1('\n'.join(digests).encode()).hexdigest()
+
+        def build():
+            tables: Dict[str, Any] = {}
+            for path, digest in zip(ordered, digests):
+                events = self.cached(f"sql:{digest}", lambda: analyze_file(path)['columns'])
+                replay_columns(events, tables)
+            return hashed_index(tables)
+
+        # Keep per-file events alive even when the replayed index is served from cache
+        self.live.extend(f"sql:{digest}" for digest in digests)
+        return self.cached(f"index:{sequence}", build)
+
+    def detect(self, types_path: Path, migrations: List[Path]) -> Dict[str, Any]:
+        """Drift report, restricted to the schemas the types file covers"""
+        types = self.types_index(types_path)
+        schemas = set(types['schemas'])
+        migrated = {table: entry for table, entry in self.migrations_index(migrations).items()
+                    if (table.split('.')[0] if '.' in table else 'public') in schemas}
+        return diff_indexes(types['tables'], migrated)
+
+    def save(self) -> None:
+        """Persist the cache, pruning events and indexes no longer referenced"""
+        self.cache.save(self.live)
+        self.live = []
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+NetNeural Snapshot Codec
+Compact binary snapshot frames with an offset table for lazy, per-metric decoding
+"""
+
+import re
+import json
+import zlib
+import struct
+import hashlib
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+
+MAGIC = b'NNSB'
+VERSION = 1
+# magic, version, key count, block count
+HEADER = struct.Struct('<4sHII')
+# chunk key hash, block index; sorted by hash for binary search
+KEY_ENTRY = struct.Struct('<QI')
+# block payload offset, payload length; in encoding order
+BLOCK_ENTRY = struct.Struct('<II')
+# Paths are grouped into chunks by their first CHUNK_DEPTH components (section.metric)
+CHUNK_DEPTH = 2
+# Chunks are packed into zlib blocks of about this much JSON, so small metrics share a stream
+BLOCK_SIZE = 4096
+# Up to CHUNK_DEPTH components, each a run of unescaped non-dots and escape pairs
+COMPONENT = r'[^.\\]*(?:\\.[^.\\]*)*'
+CHUNK_RE = re.compile(COMPONENT + (r'(?:\.' + COMPONENT + ')?') * (CHUNK_DEPTH - 1), re.DOTALL)
+COMPRESSION_LEVEL = 6
+
+
+class Deleted:
+    """Tombstone returned for a path a delta frame removes"""
+
+
+DELETED_VALUE = Deleted()
+
+
+def chunk_key(path: str) -> str:
+    """Leading CHUNK_DEPTH components of an escaped metric path"""
+    return CHUNK_RE.match(path).group()
+
+
+def key_hash(key: str) -> int:
+    """64-bit hash of a chunk key, the lookup key of the offset table"""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little')
+
+
+def encode(flat: Dict[str, Any], deleted: Iterable[str] = ()) -> bytes:
+    """Encode a flattened state, or a delta's set paths plus deleted paths, as one frame
+
+    Paths sharing a section.metric prefix form a chunk. Consecutive chunks
+    are packed into blocks, each the zlib-compressed JSON
+    [{path: value}, [deleted paths]], and the key table maps every chunk
+    key's hash to its block. Blocks keep first-seen order, so decoding
+    preserves path order.
+    """
+    chunks: Dict[str, Tuple[Dict[str, Any], List[str]]] = {}
+    for path, value in flat.items():
+        chunks.setdefault(chunk_key(path), ({}, []))[0][path] = value
+    for path in deleted:
+        chunks.setdefault(chunk_key(path), ({}, []))[1].append(path)
+
+    keys: List[Tuple[int, int]] = []
+    blocks: List[bytes] = []
+    values: List[str] = []
+    removed: List[str] = []
+    size = 0
+
+    def flush():
+        nonlocal size
+        text = '[{' + ','.join(values) + '},[' + ','.join(removed) + ']]'
+        blocks.append(zlib.compress(text.encode(), COMPRESSION_LEVEL))
+        values.clear()
+        removed.clear()
+        size = 0
+
+    for key, (chunk_values, chunk_deleted) in chunks.items():
+        # Object members without the braces, so chunks concatenate into one block object
+        members = json.dumps(chunk_values, separators=(',', ':'), default=str)[1:-1]
+        # A large chunk gets a block of its own rather than slowing lookups of its neighbours
+        if len(members) >= BLOCK_SIZE and (values or removed):
+            flush()
+        if members:
+            values.append(members)
+        if chunk_deleted:
+            removed.append(json.dumps(chunk_deleted, separators=(',', ':'))[1:-1])
+        keys.append((key_hash(key), len(blocks)))
+        size += len(members)
+        if size >= BLOCK_SIZE:
+            flush()
+    if values or removed:
+        flush()
+
+    table = [HEADER.pack(MAGIC, VERSION, len(keys), len(blocks))]
+    table.extend(KEY_ENTRY.pack(hashed, block) for hashed, block in sorted(keys))
+    offset = 0
+    for payload in blocks:
+        table.append(BLOCK_ENTRY.pack(offset, len(payload)))
+        offset += len(payload)
+    return b''.join(table + blocks)
+
+
+class BinarySnapshot:
+    """Read-only view of an encoded frame that decompresses only the blocks asked for.
+
+    A lookup binary-searches the key table in place and decodes the one
+    block holding the path's metric, so opening a frame costs nothing and
+    a lookup depends on the size of that block rather than of the
+    snapshot. Decoded blocks are kept for repeated lookups.
+    """
+
+    def __init__(self, data: bytes):
+        """Wrap an encoded frame (bytes or any buffer)"""
+        self.data = memoryview(data)
+        magic, version, self.key_count, self.block_count = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a binary snapshot frame")
+        self.blocks_at = HEADER.size + self.key_count * KEY_ENTRY.size
+        self.payload_at = self.blocks_at + self.block_count * BLOCK_ENTRY.size
+        self._blocks: Dict[int, Tuple[Dict[str, Any], List[str]]] = {}
+
+    def _block(self, index: int) -> Tuple[Dict[str, Any], List[str]]:
+        """Decoded (values, deleted paths) of one block"""
+        block = self._blocks.get(index)
+        if block is None:
+            offset, length = BLOCK_ENTRY.unpack_from(self.data, self.blocks_at + index * BLOCK_ENTRY.size)
+            start = self.payload_at + offset
+            values, deleted = json.loads(zlib.decompress(self.data[start:start + length]))
+            block = self._blocks[index] = (values, deleted)
+        return block
+
+    def _find(self, path: str) -> Tuple[Dict[str, Any], List[str]]:
+        """Block holding a path's chunk; empty if the frame has no such chunk"""
+        hashed = key_hash(chunk_key(path))
+        low, high = 0, self.key_count
+        while low < high:
+            middle = (low + high) // 2
+            entry, block = KEY_ENTRY.unpack_from(self.data, HEADER.size + middle * KEY_ENTRY.size)
+            if entry == hashed:
+                return self._block(block)
+            if entry < hashed:
+                low = middle + 1
+            else:
+                high = middle
+        return {}, []
+
+    def lookup(self, path: str, default: Any = None) -> Any:
+        """Value of one metric path, DELETED_VALUE if this frame removes it, or default"""
+        values, deleted = self._find(path)
+        if path in values:
+            return values[path]
+        return DELETED_VALUE if path in deleted else default
+
+    def subtree(self, prefix: str) -> Dict[str, Any]:
+        """Flat {path: value} of the paths at or under a metric path of at least CHUNK_DEPTH components"""
+        values, _ = self._find(prefix)
+        return {path: value for path, value in values.items()
+                if path == prefix or path.startswith(prefix + '.')}
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """Every (path, value) pair, in encoding order"""
+        for index in range(self.block_count):
+            yield from self._block(index)[0].items()
+
+    def deleted(self, prefix: Optional[str] = None) -> List[str]:
+        """Paths a delta frame removes, optionally only those at or under a metric path"""
+        if prefix is not None:
+            return [path for path in self._find(prefix)[1]
+                    if path == prefix or path.startswith(prefix + '.')]
+        return [path for index in range(self.block_count) for path in self._block(index)[1]]
+
+    def to_flat(self) -> Dict[str, Any]:
+        """Decode every set path"""
+        flat: Dict[str, Any] = {}
+        for index in range(self.block_count):
+            flat.update(self._block(index)[0])
+        return flat
+
+
+def decode(data: bytes) -> Dict[str, Any]:
+    """Decode a frame into a flat state (deleted paths are dropped)"""
+    return BinarySnapshot(data).to_flat()
@@ -0,0 +1,592 @@
+#!/usr/bin/env python3
+"""
+NetNeural Snapshot Store
+Append-only, timestamp-indexed history of documentation monitor snapshots
+"""
+
+import os
+import json
+import struct
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+from snapshot_codec import BinarySnapshot, encode, CHUNK_DEPTH
+
+try:
+    import fcntl
+except ImportError:  # Windows: commits are serialized within one process only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+INDEX_MAGIC = b'NNSIDX02'
+# timestamp (epoch seconds), segment day (YYYYMMDD), byte offset, byte length, kind
+INDEX_RECORD = struct.Struct('<dIQIc')
+KEYFRAME = b'K'
+DELTA = b'D'
+# Segment file suffix per codec
+SEGMENT_SUFFIXES = {'json': '.jsonl', 'binary': '.nnsb'}
+# Binary segment frame header: timestamp, kind, payload length
+FRAME = struct.Struct('<dcI')
+
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """Convert an ISO timestamp from a snapshot into epoch seconds"""
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return None
+
+
+def escape_key(key: str) -> str:
+    """Escape a dict key for use as one component of a metric path"""
+    return key.replace('\\', '\\\\').replace('.', '\\.')
+
+
+def split_path(path: str) -> List[str]:
+    """Split a metric path into its unescaped key components"""
+    keys, current, escaped = [], [], False
+    for char in path:
+        if escaped:
+            current.append(char)
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif char == '.':
+            keys.append(''.join(current))
+            current = []
+        else:
+            current.append(char)
+    keys.append(''.join(current))
+    return keys
+
+
+def flatten_state(state: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+    """Flatten a nested state into {metric path: leaf value}"""
+    flat = {}
+    for key, value in state.items():
+        path = prefix + escape_key(str(key))
+        if isinstance(value, dict) and value:
+            flat.update(flatten_state(value, path + '.'))
+        else:
+            flat[path] = value
+    return flat
+
+
+def unflatten_state(flat: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild a nested state from {metric path: leaf value}"""
+    state: Dict[str, Any] = {}
+    for path, value in flat.items():
+        keys = split_path(path)
+        node = state
+        for key in keys[:-1]:
+            node = node.setdefault(key, {})
+        node[keys[-1]] = value
+    return state
+
+
+def diff_flat(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Structural delta between two flattened states"""
+    changed = {
+        path: value for path, value in current.items()
+        if path not in previous
+        or type(previous[path]) is not type(value)
+        or previous[path] != value
+    }
+    removed = [path for path in previous if path not in current]
+    return {'set': changed, 'del': removed}
+
+
+def apply_delta(flat: Dict[str, Any], delta: Dict[str, Any]) -> None:
+    """Apply a structural delta to a flattened state in place"""
+    for path in delta.get('del', []):
+        flat.pop(path, None)
+    flat.update(delta.get('set', {}))
+
+
+class SnapshotStore:
+    """Append-only snapshot log with a binary timestamp index.
+
+    Snapshots are appended to one segment file per day, sharded into
+    year/month directories so no directory grows past a month of segments.
+    Segments hold compact JSON lines, or with the binary codec length-prefixed
+    frames whose metrics can be read without decoding the whole snapshot;
+    a day keeps the format its segment was started in.
+    Most entries are structural deltas against the previous snapshot; a full
+    keyframe is written every ``keyframe_interval`` entries and at the start
+    of every segment so each day decodes on its own. A fixed-width index of
+    (timestamp, segment, offset, length, kind) records is kept sorted by
+    timestamp, so time-range queries are a binary search plus a sequential
+    replay, and a latest pointer locates the newest snapshot directly.
+
+    Commits take an advisory lock on the history directory, so concurrent
+    monitor runs append one at a time. Readers need no lock: a segment line
+    is synced before its index record is appended, and the latest pointer
+    and rebuilt indexes are swapped in by rename, so readers never see a
+    partially written snapshot.
+    """
+
+    def __init__(self, history_path: Path, keyframe_interval: int = 24, codec: str = 'json'):
+        """Open (and if needed build) the store under the history directory"""
+        if codec not in SEGMENT_SUFFIXES:
+            raise ValueError(f"Unknown snapshot codec: {codec}")
+        self.history_path = Path(history_path)
+        self.segments_path = self.history_path / "segments"
+        self.index_file = self.history_path / "snapshots.idx"
+        self.latest_file = self.history_path / "LATEST"
+        self.lock_file = self.history_path / "snapshots.lock"
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.codec = codec
+        self.segments_path.mkdir(parents=True, exist_ok=True)
+        self._tail: Optional[Tuple[Tuple, int, Dict[str, Any]]] = None
+        self._thread_lock = threading.RLock()
+        self._lock_depth = 0
+        self._lock_handle = None
+
+        with self.lock():
+            self._shard_flat_segments()
+            if not self._index_valid():
+                self.rebuild_index()
+                if len(self) == 0:
+                    self.import_legacy_snapshots()
+            self._repair_latest()
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Hold the store's advisory commit lock; re-entrant within a process"""
+        with self._thread_lock:
+            if self._lock_depth == 0:
+                handle = open(self.lock_file, 'a')
+                if fcntl:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+                self._lock_handle = handle
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    # Closing the descriptor releases the flock
+                    self._lock_handle.close()
+                    self._lock_handle = None
+
+    def _shard_flat_segments(self) -> None:
+        """Move segments written before sharding into their year/month directories"""
+        for segment in self.segments_path.glob("segment_*.jsonl"):
+            target = self._shard_path(int(segment.stem.split('_')[1])) / segment.name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(segment, target)
+
+    # Index handling
+
+    def _index_valid(self) -> bool:
+        """Check that the index exists and carries the current format magic"""
+        if not self.index_file.exists():
+            return False
+        with open(self.index_file, 'rb') as f:
+            if f.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+                return False
+        body = self.index_file.stat().st_size - len(INDEX_MAGIC)
+        return body % INDEX_RECORD.size == 0
+
+    def __len__(self) -> int:
+        """Number of indexed snapshots"""
+        return (self.index_file.stat().st_size - len(INDEX_MAGIC)) // INDEX_RECORD.size
+
+    def _read_record(self, f, position: int) -> Tuple[float, int, int, int, bytes]:
+        """Read the index record at a position from an open index file"""
+        f.seek(len(INDEX_MAGIC) + position * INDEX_RECORD.size)
+        return INDEX_RECORD.unpack(f.read(INDEX_RECORD.size))
+
+    def _bisect(self, f, timestamp: float, count: int) -> int:
+        """Return the first index position with a timestamp >= the given one"""
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if self._read_record(f, middle)[0] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _keyframe_position(self, f, position: int) -> int:
+        """Walk back from a position to the keyframe it is replayed from"""
+        while position > 0 and self._read_record(f, position)[4] != KEYFRAME:
+            position -= 1
+        return position
+
+    def rebuild_index(self) -> None:
+        """Rebuild the index and latest pointer by scanning segment files"""
+        records = []
+        for segment in sorted(self.segments_path.glob("*/*/segment_*.*")):
+            day = int(segment.stem.split('_')[1])
+            if segment.suffix == SEGMENT_SUFFIXES['binary']:
+                records.extend(self._scan_frames(segment, day))
+                continue
+            offset = 0
+            with open(segment, 'rb') as f:
+                for line in f:
+                    if line.endswith(b'\n'):
+                        try:
+                            entry = json.loads(line)
+                            kind = entry.get('k', 'K').encode()
+                            records.append((entry['t'], day, offset, len(line), kind))
+                        except (ValueError, KeyError, AttributeError):
+                            # A torn write with later appends run into it; the snapshot was never committed
+                            logger.warning("Skipping undecodable line at %s:%d", segment, offset)
+                    offset += len(line)
+
+        records.sort(key=lambda r: r[0])
+        tmp_file = self.index_file.with_suffix('.idx.tmp')
+        with open(tmp_file, 'wb') as f:
+            f.write(INDEX_MAGIC)
+            for record in records:
+                f.write(INDEX_RECORD.pack(*record))
+        os.replace(tmp_file, self.index_file)
+        self._tail = None
+
+        if records:
+            self._write_latest(records[-1])
+        elif self.latest_file.exists():
+            self.latest_file.unlink()
+
+    def _scan_frames(self, segment: Path, day: int) -> List[Tuple[float, int, int, int, bytes]]:
+        """Index records of the complete frames in a binary segment"""
+        records = []
+        offset = 0
+        with open(segment, 'rb') as f:
+            while True:
+                header = f.read(FRAME.size)
+                if len(header) < FRAME.size:
+                    break
+                timestamp, kind, length = FRAME.unpack(header)
+                if len(f.read(length)) < length:
+                    # Torn write: the frame was never indexed
+                    break
+                records.append((timestamp, day, offset, FRAME.size + length, kind))
+                offset += FRAME.size + length
+        return records
+
+    def _write_latest(self, record: Tuple[float, int, int, int, bytes]) -> None:
+        """Atomically point LATEST at an index record"""
+        timestamp, day, offset, length, kind = record
+        tmp_file = self.latest_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump({'t': timestamp, 'segment': day, 'offset': offset,
+                       'length': length, 'kind': kind.decode(),
+                       'position': len(self) - 1}, f)
+        os.replace(tmp_file, self.latest_file)
+
+    def _repair_latest(self) -> None:
+        """Re-point LATEST at the last index record when a crash left it behind or missing
+
+        The index record is synced before the pointer is swapped, so a
+        writer that died in between leaves LATEST one snapshot stale.
+        """
+        count = len(self)
+        if count == 0:
+            return
+        with open(self.index_file, 'rb') as index:
+            record = self._read_record(index, count - 1)
+        latest = self._read_latest()
+        if latest is None or (latest['position'], latest['t'], latest['segment'], latest['offset']) != (
+                count - 1, record[0], record[1], record[2]):
+            logger.warning("Repairing latest snapshot pointer of %s", self.history_path)
+            self._write_latest(record)
+
+    def _read_latest(self) -> Optional[Dict[str, Any]]:
+        """Return the LATEST pointer"""
+        try:
+            with open(self.latest_file, 'r') as f:
+                return json.load(f)
+        except (IOError, json.JSONDecodeError):
+            return None
+
+    # Reading and writing
+
+    def _shard_path(self, day: int) -> Path:
+        """Year/month shard directory of a YYYYMMDD day"""
+        return self.segments_path / f"{day // 10000:04d}" / f"{day // 100 % 100:02d}"
+
+    def _segment_file(self, day: int) -> Path:
+        """Path of the segment holding snapshots for a day, in whichever format it was started"""
+        shard = self._shard_path(day)
+        for suffix in SEGMENT_SUFFIXES.values():
+            segment = shard / f"segment_{day}{suffix}"
+            if segment.exists():
+                return segment
+        return shard / f"segment_{day}{SEGMENT_SUFFIXES[self.codec]}"
+
+    @staticmethod
+    def _decode_entry(data: bytes, binary: bool) -> Tuple[bytes, Any]:
+        """Decode one segment entry into (kind, flat state) or (kind, delta)"""
+        if not binary:
+            entry = json.loads(data)
+            if entry.get('k', 'K') == 'K':
+                return KEYFRAME, flatten_state(entry['s'])
+            return DELTA, entry['d']
+        _, kind, _ = FRAME.unpack_from(data)
+        frame = BinarySnapshot(memoryview(data)[FRAME.size:])
+        if kind == KEYFRAME:
+            return KEYFRAME, frame.to_flat()
+        return DELTA, {'set': frame.to_flat(), 'del': frame.deleted()}
+
+    def _replay(self, first: int, last: int, emit_from: int) -> Iterator[Tuple[float, Dict[str, Any]]]:
+        """Replay index positions first..last, yielding flat states from emit_from"""
+        flat: Dict[str, Any] = {}
+        handle, handle_day, binary = None, None, False
+        try:
+            with open(self.index_file, 'rb') as index:
+                for position in range(first, last + 1):
+                    timestamp, day, offset, length, kind = self._read_record(index, position)
+                    if day != handle_day:
+                        if handle:
+                            handle.close()
+                        segment = self._segment_file(day)
+                        binary = segment.suffix == SEGMENT_SUFFIXES['binary']
+                        handle = open(segment, 'rb')
+                        handle_day = day
+                    handle.seek(offset)
+                    kind, decoded = self._decode_entry(handle.read(length), binary)
+                    if kind == KEYFRAME:
+                        flat = decoded
+                    else:
+                        apply_delta(flat, decoded)
+                    if position >= emit_from:
+                        yield timestamp, flat
+        finally:
+            if handle:
+                handle.close()
+
+    def append(self, state: Dict[str, Any]) -> None:
+        """Append a snapshot to the log as a keyframe or delta and index it"""
+        # Round-trip through JSON so the cached tail matches what readers decode
+        state = json.loads(json.dumps(state, default=str))
+        with self.lock():
+            self._append(state)
+
+    def _append(self, state: Dict[str, Any]) -> None:
+        """Append under the commit lock, so the latest pointer can't move underneath"""
+        timestamp = parse_timestamp(state.get('timestamp')) or datetime.now().timestamp()
+        self._repair_latest()
+        latest = self._read_latest()
+        if latest and timestamp < latest['t']:
+            # Keep the index sorted when runs finish out of order
+            timestamp = latest['t']
+        day = int(datetime.fromtimestamp(timestamp).strftime("%Y%m%d"))
+        flat = flatten_state(state)
+
+        previous = None
+        if latest and latest['segment'] == day:
+            previous = self._tail_state(latest)
+
+        if previous is None or previous[0] + 1 >= self.keyframe_interval:
+            kind, since_keyframe = KEYFRAME, 0
+        else:
+            kind, since_keyframe = DELTA, previous[0] + 1
+        delta = diff_flat(previous[1], flat) if kind == DELTA else None
+
+        segment = self._segment_file(day)
+        if segment.suffix == SEGMENT_SUFFIXES['binary']:
+            payload = encode(flat) if kind == KEYFRAME else encode(delta['set'], delta['del'])
+            line = FRAME.pack(timestamp, kind, len(payload)) + payload
+        elif kind == KEYFRAME:
+            line = json.dumps({'t': timestamp, 'k': 'K', 's': state}, separators=(',', ':')).encode() + b'\n'
+        else:
+            line = json.dumps({'t': timestamp, 'k': 'D', 'd': delta}, separators=(',', ':')).encode() + b'\n'
+        segment.parent.mkdir(parents=True, exist_ok=True)
+        self._truncate_uncommitted(segment, day)
+        with open(segment, 'ab') as f:
+            offset = f.tell()
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+        record = (timestamp, day, offset, len(line), kind)
+        with open(self.index_file, 'ab') as f:
+            f.write(INDEX_RECORD.pack(*record))
+            f.flush()
+            os.fsync(f.fileno())
+        self._write_latest(record)
+        self._tail = ((len(self) - 1, timestamp), since_keyframe, flat)
+
+    def _truncate_uncommitted(self, segment: Path, day: int) -> None:
+        """Cut a segment back to its last indexed entry, dropping bytes a crashed writer left behind
+
+        Without this, the next entry would be appended to a torn line or
+        frame and the segment could no longer be scanned.
+        """
+        if not segment.exists():
+            return
+        committed = 0
+        count = len(self)
+        if count:
+            with open(self.index_file, 'rb') as index:
+                _, last_day, offset, length, _ = self._read_record(index, count - 1)
+            if last_day == day:
+                committed = offset + length
+        size = segment.stat().st_size
+        if size > committed:
+            logger.warning("Truncating %d uncommitted bytes from %s", size - committed, segment)
+            with open(segment, 'r+b') as f:
+                f.truncate(committed)
+
+    def _tail_state(self, latest: Dict[str, Any]) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """Return (entries since keyframe, flat state) for the newest snapshot"""
+        position = latest['position']
+        # Keyed by timestamp too: another process may have appended or pruned since
+        if self._tail and self._tail[0] == (position, latest['t']):
+            return self._tail[1], dict(self._tail[2])
+
+        with open(self.index_file, 'rb') as index:
+            first = self._keyframe_position(index, position)
+        flat = {}
+        for _, flat in self._replay(first, position, position):
+            pass
+        self._tail = ((position, latest['t']), position - first, flat)
+        return position - first, dict(flat)
+
+    def latest(self) -> Dict[str, Any]:
+        """Return the most recent snapshot, or an empty dict"""
+        latest = self._read_latest()
+        if latest is None:
+            return {}
+        segment = self._segment_file(latest['segment'])
+        if latest['kind'] == 'K' and segment.suffix == SEGMENT_SUFFIXES['json']:
+            with open(segment, 'rb') as f:
+                f.seek(latest['offset'])
+                return json.loads(f.read(latest['length']))['s']
+        return unflatten_state(self._tail_state(latest)[1])
+
+    def latest_subtree(self, prefix: str) -> Dict[str, Any]:
+        """Flat {path: value} at or under a metric path in the most recent snapshot
+
+        In binary segments each frame from the keyframe to the newest
+        snapshot decodes only the block holding the metric, so reading one
+        metric skips decoding the rest of the snapshot. JSON segments, and
+        prefixes above the codec's section.metric chunks, replay in full.
+        """
+        latest = self._read_latest()
+        if latest is None:
+            return {}
+        segment = self._segment_file(latest['segment'])
+
+        def under(path: str) -> bool:
+            return path == prefix or path.startswith(prefix + '.')
+
+        if segment.suffix != SEGMENT_SUFFIXES['binary'] or len(split_path(prefix)) < CHUNK_DEPTH:
+            return {path: value for path, value in self._tail_state(latest)[1].items() if under(path)}
+
+        position = latest['position']
+        with open(self.index_file, 'rb') as index:
+            first = self._keyframe_position(index, position)
+            records = [self._read_record(index, p) for p in range(first, position + 1)]
+        flat: Dict[str, Any] = {}
+        with open(segment, 'rb') as f:
+            for _, _, offset, length, kind in records:
+                f.seek(offset)
+                frame = BinarySnapshot(f.read(length)[FRAME.size:])
+                for path in frame.deleted(prefix) if kind == DELTA else ():
+                    flat.pop(path, None)
+                flat.update(frame.subtree(prefix))
+        return flat
+
+    def at(self, timestamp: float) -> Dict[str, Any]:
+        """Reconstruct the snapshot in effect at a point in time"""
+        with open(self.index_file, 'rb') as index:
+            position = self._bisect(index, timestamp, len(self))
+            if position < len(self) and self._read_record(index, position)[0] == timestamp:
+                position += 1
+            position -= 1
+            if position < 0:
+                return {}
+            first = self._keyframe_position(index, position)
+        for _, flat in self._replay(first, position, position):
+            return unflatten_state(flat)
+        return {}
+
+    def iter_flat(self, start: Optional[float] = None,
+                  end: Optional[float] = None) -> Iterator[Tuple[float, Dict[str, Any]]]:
+        """Sequentially replay (timestamp, flat state) with start <= timestamp < end
+
+        The yielded dict is reused between iterations; copy it to keep it.
+        """
+        count = len(self)
+        with open(self.index_file, 'rb') as index:
+            position = self._bisect(index, start, count) if start is not None else 0
+            last = self._bisect(index, end, count) - 1 if end is not None else count - 1
+            if position > last:
+                return
+            first = self._keyframe_position(index, position)
+        yield from self._replay(first, last, position)
+
+    def count(self, start: Optional[float] = None, end: Optional[float] = None) -> int:
+        """Number of snapshots with start <= timestamp < end"""
+        total = len(self)
+        with open(self.index_file, 'rb') as index:
+            first = self._bisect(index, start, total) if start is not None else 0
+            last = self._bisect(index, end, total) if end is not None else total
+        return max(0, last - first)
+
+    def drop_segments_before(self, day: int) -> int:
+        """Delete whole day segments older than a YYYYMMDD day, returns snapshots dropped"""
+        with self.lock():
+            return self._drop_segments_before(day)
+
+    def _drop_segments_before(self, day: int) -> int:
+        """Drop old segments under the commit lock"""
+        with open(self.index_file, 'rb') as index:
+            records = [self._read_record(index, position) for position in range(len(self))]
+        kept = [record for record in records if record[1] >= day]
+        if len(kept) == len(records):
+            return 0
+
+        tmp_file = self.index_file.with_suffix('.idx.tmp')
+        with open(tmp_file, 'wb') as f:
+            f.write(INDEX_MAGIC)
+            for record in kept:
+                f.write(INDEX_RECORD.pack(*record))
+        os.replace(tmp_file, self.index_file)
+        # Segments start with a keyframe, so the remaining days still decode.
+        # Only shards of months up to the cutoff are listed, and emptied shards are removed.
+        for year in self.segments_path.iterdir():
+            if not year.is_dir() or int(year.name) > day // 10000:
+                continue
+            for month in year.iterdir():
+                if int(year.name + month.name) > day // 100:
+                    continue
+                for segment in month.glob("segment_*.*"):
+                    if int(segment.stem.split('_')[1]) < day:
+                        segment.unlink()
+                if not any(month.iterdir()):
+                    month.rmdir()
+            if not any(year.iterdir()):
+                year.rmdir()
+
+        self._tail = None
+        if kept:
+            self._write_latest(kept[-1])
+        elif self.latest_file.exists():
+            self.latest_file.unlink()
+        return len(records) - len(kept)
+
+    def range(self, start: Optional[float] = None,
+              end: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Return snapshots with start <= timestamp < end, oldest first"""
+        return [unflatten_state(flat) for _, flat in self.iter_flat(start, end)]
+
+    def import_legacy_snapshots(self) -> int:
+        """Import pre-store state_snapshot_*.json files, oldest first"""
+        imported = 0
+        for legacy_file in sorted(self.history_path.glob("state_snapshot_*.json")):
+            try:
+                with open(legacy_file, 'r') as f:
+                    self.append(json.load(f))
+                imported += 1
+            except (json.JSONDecodeError, IOError):
+                continue
+        return imported
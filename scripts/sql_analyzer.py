@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+NetNeural SQL Analyzer
+Streaming, memory-mapped SQL tokenizer counting schema objects in migrations and dumps
+"""
+
+import re
+import mmap
+from pathlib import Path
+from typing import Dict, List, Any, Iterator, Tuple
+
+from scan_cache import ScanCache
+
+# Tokens that change lexical state; everything between them is skipped by the regex engine
+TOKEN_RE = re.compile(rb"--|/\*|'|\"|\$[A-Za-z_][A-Za-z_0-9]*\$|\$\$|;")
+COPY_STDIN_RE = re.compile(rb"copy\s[^;]*\bfrom\s+stdin", re.IGNORECASE)
+COPY_END = b"\n\\.\n"
+HEAD_SIZE = 512
+# Bump when per-file results change shape, so cached analyses are discarded
+CACHE_VERSION = 2
+
+NAME = r'(?:"[^"]+"|[\w$]+)(?:\s*\.\s*(?:"[^"]+"|[\w$]+))?'
+STATEMENT_PATTERNS = [
+    ('tables', 'create', re.compile(
+        r"create\s+(?:(?:global|local)\s+)?(?:(?:temp|temporary|unlogged)\s+)?table\s+"
+        r"(?:if\s+not\s+exists\s+)?(?P<name>" + NAME + ")", re.IGNORECASE)),
+    ('policies', 'create', re.compile(
+        r"create\s+policy\s+(?P<name>" + NAME + r")\s+on\s+(?P<table>" + NAME + ")", re.IGNORECASE)),
+    ('functions', 'create', re.compile(
+        r"create\s+(?:or\s+replace\s+)?function\s+(?P<name>" + NAME + ")", re.IGNORECASE)),
+    ('triggers', 'create', re.compile(
+        r"create\s+(?:or\s+replace\s+)?(?:constraint\s+)?trigger\s+(?P<name>" + NAME + r")\s.*?"
+        r"\bon\s+(?:only\s+)?(?P<table>" + NAME + ")", re.IGNORECASE | re.DOTALL)),
+    ('indexes', 'create', re.compile(
+        r"create\s+(?:unique\s+)?index\s+(?:concurrently\s+)?(?:if\s+not\s+exists\s+)?"
+        r"(?P<name>" + NAME + r")\s+on\s+", re.IGNORECASE)),
+    ('rls_tables', 'create', re.compile(
+        r"alter\s+table\s+(?:if\s+exists\s+)?(?:only\s+)?(?P<name>" + NAME + r")\s+"
+        r"enable\s+row\s+level\s+security", re.IGNORECASE)),
+    ('rls_tables', 'drop', re.compile(
+        r"alter\s+table\s+(?:if\s+exists\s+)?(?:only\s+)?(?P<name>" + NAME + r")\s+"
+        r"disable\s+row\s+level\s+security", re.IGNORECASE)),
+    ('tables', 'drop', re.compile(
+        r"drop\s+table\s+(?:if\s+exists\s+)?(?P<name>" + NAME + ")", re.IGNORECASE)),
+    ('policies', 'drop', re.compile(
+        r"drop\s+policy\s+(?:if\s+exists\s+)?(?P<name>" + NAME + r")\s+on\s+(?P<table>" + NAME + ")",
+        re.IGNORECASE)),
+    ('functions', 'drop', re.compile(
+        r"drop\s+function\s+(?:if\s+exists\s+)?(?P<name>" + NAME + ")", re.IGNORECASE)),
+    ('triggers', 'drop', re.compile(
+        r"drop\s+trigger\s+(?:if\s+exists\s+)?(?P<name>" + NAME + r")\s+on\s+(?P<table>" + NAME + ")",
+        re.IGNORECASE)),
+    ('indexes', 'drop', re.compile(
+        r"drop\s+index\s+(?:concurrently\s+)?(?:if\s+exists\s+)?(?P<name>" + NAME + ")", re.IGNORECASE)),
+]
+OBJECT_KINDS = ('tables', 'policies', 'functions', 'triggers', 'indexes', 'rls_tables')
+
+# Column-level DDL; statements matching COLUMN_DDL_RE are read whole, the rest only by their head
+COLUMN_DDL_RE = re.compile(r"(?:create\s+(?:\w+\s+){0,2}table|alter\s+table|drop\s+table)\s", re.IGNORECASE)
+ALTER_TABLE_RE = re.compile(
+    r"alter\s+table\s+(?:if\s+exists\s+)?(?:only\s+)?(?P<name>" + NAME + r")\s+(?P<actions>.*)",
+    re.IGNORECASE | re.DOTALL)
+DROP_TABLES_RE = re.compile(r"drop\s+table\s+(?:if\s+exists\s+)?(?P<names>.*?)\s*(?:cascade|restrict)?\s*;?\Z",
+                            re.IGNORECASE | re.DOTALL)
+RENAME_TABLE_RE = re.compile(r"rename\s+to\s+(?P<new>" + NAME + r")\s*;?\Z", re.IGNORECASE)
+RENAME_COLUMN_RE = re.compile(
+    r"rename\s+(?:column\s+)?(?P<old>" + NAME + r")\s+to\s+(?P<new>" + NAME + r")\s*;?\Z", re.IGNORECASE)
+ADD_COLUMN_RE = re.compile(r"add\s+(?:column\s+)?(?:if\s+not\s+exists\s+)?(?P<name>" + NAME + ")", re.IGNORECASE)
+PARTITION_OF_RE = re.compile(r"partition\s+of\s+(?P<parent>" + NAME + ")", re.IGNORECASE)
+DROP_COLUMN_RE = re.compile(r"drop\s+(?:column\s+)?(?:if\s+exists\s+)?(?P<name>" + NAME + ")", re.IGNORECASE)
+# Leading words of table elements and ALTER actions that are not columns
+NON_COLUMN_WORDS = {'constraint', 'primary', 'unique', 'foreign', 'check', 'exclude', 'like', 'column', 'rename'}
+
+
+def normalize_name(name: str) -> str:
+    """Canonical object name: unquoted identifiers fold to lower case, 'public.' is implied"""
+    parts = []
+    for part in re.split(r'\s*\.\s*(?=(?:[^"]*"[^"]*")*[^"]*$)', name.strip()):
+        parts.append(part[1:-1] if part.startswith('"') else part.lower())
+    if len(parts) == 2 and parts[0] == 'public':
+        parts = parts[1:]
+    return '.'.join(parts)
+
+
+def split_top_level(text: str) -> List[str]:
+    """Split on commas outside parentheses, quotes and comments, up to an unmatched ')'
+
+    Comments are dropped, so a column list with commented-out lines splits cleanly.
+    """
+    items, current, depth, position = [], [], 0, 0
+    while position < len(text):
+        char = text[position]
+        if text.startswith('--', position):
+            newline = text.find('\n', position)
+            position = len(text) if newline < 0 else newline
+            continue
+        if text.startswith('/*', position):
+            close = text.find('*/', position + 2)
+            position = len(text) if close < 0 else close + 2
+            continue
+        if char in '\'"':
+            close = text.find(char, position + 1)
+            close = len(text) if close < 0 else close + 1
+            current.append(text[position:close])
+            position = close
+            continue
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            if depth == 0:
+                break
+            depth -= 1
+        elif char == ',' and depth == 0:
+            items.append(''.join(current).strip())
+            current = []
+            position += 1
+            continue
+        current.append(char)
+        position += 1
+    items.append(''.join(current).strip())
+    return [item for item in items if item]
+
+
+def column_name(element: str) -> str:
+    """Column defined by a table element or ALTER action, or None"""
+    match = re.match(NAME, element)
+    if match is None or match.group().lower() in NON_COLUMN_WORDS:
+        return None
+    return normalize_name(match.group())
+
+
+def column_events(statement: str) -> List[List[Any]]:
+    """Table and column DDL events of one statement, in the order they apply
+
+    Events are ['create', table, [columns]], ['partition', table, parent],
+    ['drop', table], ['rename', table, new_table], ['add', table, column],
+    ['drop_column', table, column] and ['rename_column', table, old, new].
+    """
+    classified = classify_statement(statement[:HEAD_SIZE])
+    if classified and classified[:2] == ('tables', 'create'):
+        table = classified[2]
+        match = STATEMENT_PATTERNS[0][2].match(statement)
+        rest = statement[match.end():].lstrip()
+        partition = PARTITION_OF_RE.match(rest)
+        if partition:
+            return [['partition', table, normalize_name(partition.group('parent'))]]
+        if not rest.startswith('('):
+            # CREATE TABLE ... AS: columns are not spelled out
+            return [['create', table, []]]
+        columns = [name for name in map(column_name, split_top_level(rest[1:])) if name]
+        return [['create', table, columns]]
+
+    match = DROP_TABLES_RE.match(statement)
+    if match:
+        return [['drop', normalize_name(name)] for name in split_top_level(match.group('names'))]
+
+    match = ALTER_TABLE_RE.match(statement)
+    if not match:
+        return []
+    table = normalize_name(match.group('name'))
+    actions = match.group('actions').strip().rstrip(';')
+    rename = RENAME_TABLE_RE.match(actions)
+    if rename:
+        new = normalize_name(rename.group('new'))
+        schema = table.rpartition('.')[0]
+        return [['rename', table, f"{schema}.{new}" if schema and '.' not in new else new]]
+    rename = RENAME_COLUMN_RE.match(actions)
+    if rename:
+        return [['rename_column', table, normalize_name(rename.group('old')), normalize_name(rename.group('new'))]]
+
+    events = []
+    for action in split_top_level(actions):
+        for pattern, event in ((ADD_COLUMN_RE, 'add'), (DROP_COLUMN_RE, 'drop_column')):
+            found = pattern.match(action)
+            if found and found.group('name').lower() not in NON_COLUMN_WORDS:
+                events.append([event, table, normalize_name(found.group('name'))])
+    return events
+
+
+def replay_columns(events: List[List[Any]], tables: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Apply column DDL events to a table -> set of columns index"""
+    tables = {} if tables is None else tables
+    for event in events:
+        action, table = event[0], event[1]
+        if action == 'create':
+            # CREATE TABLE IF NOT EXISTS leaves an existing table as it is
+            tables.setdefault(table, set(event[2]))
+        elif action == 'partition':
+            # A partition shares the parent's column set, so later parent ALTERs reach it too
+            tables.setdefault(table, tables.setdefault(event[2], set()))
+        elif action == 'drop':
+            tables.pop(table, None)
+        elif action == 'rename':
+            if table in tables:
+                tables[event[2]] = tables.pop(table)
+        elif table in tables:
+            columns = tables[table]
+            if action == 'add':
+                columns.add(event[2])
+            elif action == 'drop_column':
+                columns.discard(event[2])
+            elif action == 'rename_column' and event[2] in columns:
+                columns.discard(event[2])
+                columns.add(event[3])
+    return tables
+
+
+def skip_trivia(buffer: Any, position: int, end: int) -> int:
+    """Advance past whitespace and comments"""
+    while position < end:
+        char = buffer[position:position + 1]
+        if char.isspace():
+            position += 1
+        elif buffer[position:position + 2] == b'--':
+            newline = buffer.find(b'\n', position, end)
+            position = end if newline < 0 else newline + 1
+        elif buffer[position:position + 2] == b'/*':
+            close = buffer.find(b'*/', position + 2, end)
+            position = end if close < 0 else close + 2
+        else:
+            break
+    return position
+
+
+def iter_statements(buffer: Any) -> Iterator[Tuple[int, int]]:
+    """Yield (start, end) byte offsets of each statement, comments and leading space excluded
+
+    Works on bytes or an mmap. Quoted strings, identifiers and dollar-quoted
+    bodies are skipped whole, so semicolons inside function bodies do not end
+    a statement, and COPY ... FROM stdin data blocks in dumps are stepped over.
+    """
+    size = len(buffer)
+    position = start = 0
+    while True:
+        match = TOKEN_RE.search(buffer, position)
+        if match is None:
+            start = skip_trivia(buffer, start, size)
+            if start < size:
+                yield start, size
+            return
+        token = match.group()
+        if token == b';':
+            begin = skip_trivia(buffer, start, match.start())
+            if begin < match.start():
+                yield begin, match.end()
+                if COPY_STDIN_RE.match(buffer[begin:min(match.end(), begin + HEAD_SIZE)]):
+                    data_end = buffer.find(COPY_END, match.end())
+                    match_end = size if data_end < 0 else data_end + len(COPY_END)
+                    position = start = match_end
+                    continue
+            position = start = match.end()
+        elif token == b'--':
+            newline = buffer.find(b'\n', match.end())
+            position = size if newline < 0 else newline + 1
+        elif token == b'/*':
+            close = buffer.find(b'*/', match.end())
+            position = size if close < 0 else close + 2
+        elif token == b"'":
+            position = match.end()
+            while True:
+                close = buffer.find(b"'", position)
+                if close < 0:
+                    position = size
+                    break
+                position = close + 1
+                # '' is an escaped quote inside the string
+                if buffer[position:position + 1] != b"'":
+                    break
+                position += 1
+        elif token == b'"':
+            close = buffer.find(b'"', match.end())
+            position = size if close < 0 else close + 1
+        else:
+            close = buffer.find(token, match.end())
+            position = size if close < 0 else close + len(token)
+
+
+def classify_statement(head: str) -> Tuple[str, str, str]:
+    """(kind, action, object id) of a schema statement, or None"""
+    for kind, action, pattern in STATEMENT_PATTERNS:
+        match = pattern.match(head)
+        if match:
+            name = normalize_name(match.group('name'))
+            if 'table' in pattern.groupindex:
+                name = f"{normalize_name(match.group('table'))}:{name}"
+            return kind, action, name
+    return None
+
+
+def analyze_buffer(buffer: Any) -> Dict[str, Any]:
+    """Count statements and schema objects created and dropped in a SQL buffer"""
+    result = {'statements': 0,
+              'created': {kind: [] for kind in OBJECT_KINDS},
+              'dropped': {kind: [] for kind in OBJECT_KINDS},
+              'columns': []}
+    for start, end in iter_statements(buffer):
+        result['statements'] += 1
+        head = bytes(buffer[start:min(end, start + HEAD_SIZE)]).decode('utf-8', 'ignore')
+        classified = classify_statement(head)
+        if classified:
+            kind, action, name = classified
+            result['created' if action == 'create' else 'dropped'][kind].append(name)
+        if COLUMN_DDL_RE.match(head):
+            statement = bytes(buffer[start:end]).decode('utf-8', 'ignore')
+            result['columns'].extend(column_events(statement))
+    return result
+
+
+def analyze_file(path: Path) -> Dict[str, Any]:
+    """Analyze a SQL file through a read-only memory map, never loading it whole"""
+    with open(path, 'rb') as f:
+        if path.stat().st_size == 0:
+            return analyze_buffer(b'')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return analyze_buffer(buffer)
+
+
+def object_counts(result: Dict[str, Any]) -> Dict[str, int]:
+    """Per-kind counts of objects a file creates"""
+    counts = {kind: len(names) for kind, names in result['created'].items()}
+    counts['statements'] = result['statements']
+    return counts
+
+
+class SchemaAnalyzer:
+    """Analyzes migrations and database dumps, caching results by file hash.
+
+    Migrations are replayed in order so the schema section reports both
+    what each migration does and the net set of objects that remain.
+    """
+
+    def __init__(self, cache: ScanCache):
+        """Initialize with a content-addressed cache for per-file results"""
+        self.cache = cache
+        self.live: List[str] = []
+
+    def analyze(self, path: Path) -> Dict[str, Any]:
+        """Analysis of one SQL file, from cache when its content is unchanged"""
+        digest = self.cache.digest(path)
+        self.live.append(digest)
+        result = self.cache.get(digest)
+        if result is None:
+            result = analyze_file(path)
+            self.cache.put(digest, result)
+        return result
+
+    def analyze_migrations(self, migrations: List[Path]) -> Dict[str, Any]:
+        """Per-migration counts and the net schema after replaying migrations in order"""
+        objects = {kind: set() for kind in OBJECT_KINDS}
+        per_migration = {}
+        totals = {'files': 0, 'statements': 0}
+        for path in sorted(migrations, key=lambda p: p.name):
+            result = self.analyze(path)
+            for kind in OBJECT_KINDS:
+                objects[kind].difference_update(result['dropped'][kind])
+                objects[kind].update(result['created'][kind])
+            per_migration[path.stem] = object_counts(result)
+            totals['files'] += 1
+            totals['statements'] += result['statements']
+        return {
+            **totals,
+            'objects': {kind: len(names) for kind, names in objects.items()},
+            'tables_without_rls': len(objects['tables'] - objects['rls_tables']),
+            'per_migration': per_migration,
+        }
+
+    def analyze_dumps(self, dumps: List[Path]) -> Dict[str, Any]:
+        """Object counts per database dump"""
+        return {path.name: dict(object_counts(self.analyze(path)), size_mb=round(path.stat().st_size / 1e6, 1))
+                for path in sorted(dumps)}
+
+    def save(self) -> None:
+        """Persist the cache, pruning files no longer analyzed"""
+        self.cache.save(self.live)
+        self.live = []
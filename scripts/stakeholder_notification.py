@@ -9,14 +9,10 @@ import json
 import argparse
 from datetime import datetime
 from typing import Dict, List, Any
-import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
+from structured_logging import configure_logging, get_logger, load_config
+
+logger = get_logger(__name__)
 
 class StakeholderNotifier:
     """Handles automated notifications to various stakeholders."""
@@ -316,9 +312,14 @@ def main():
     parser.add_argument("--event", required=True, help="Event type (push, schedule, pull_request)")
     parser.add_argument("--status", required=True, help="Status (success, failure)")
     parser.add_argument("--run-id", required=True, help="GitHub Actions run ID")
+    parser.add_argument("--config", type=str, default="ai_blueprint_config.yaml",
+                       help="Configuration with the logging settings (default: ai_blueprint_config.yaml)")
     
     args = parser.parse_args()
     
+    config = load_config(args.config)
+    configure_logging(config.get('logging'), 'stakeholder_notification')
+
     notifier = StakeholderNotifier()
     notifier.notify_stakeholders(args.event, args.status, args.run_id)
 
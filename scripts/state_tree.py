@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+NetNeural State Tree
+Merkle hashes over monitor state and hash-guided, path-level state diffs
+"""
+
+import json
+import hashlib
+from typing import Dict, List, Any, Iterable, Optional
+
+from snapshot_store import escape_key
+
+DIGEST_SIZE = 8
+
+
+def leaf_digest(value: Any) -> bytes:
+    """Digest of a leaf value; lists are leaves and hash by content"""
+    encoded = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(encoded.encode(), digest_size=DIGEST_SIZE).digest()
+
+
+def tree_digest(node: Dict[str, Any], path: str, hashes: Dict[str, str]) -> bytes:
+    """Digest of a subtree, recording the hex digest of every dict node under it"""
+    hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    for key in sorted(node, key=str):
+        child_path = path + '.' + escape_key(str(key))
+        value = node[key]
+        child = tree_digest(value, child_path, hashes) if isinstance(value, dict) else leaf_digest(value)
+        hasher.update(escape_key(str(key)).encode() + b'\0' + child)
+    digest = hasher.digest()
+    hashes[path] = digest.hex()
+    return digest
+
+
+def state_hashes(state: Dict[str, Any], sections: Iterable[str]) -> Dict[str, str]:
+    """Merkle hash of every dict node of the given state sections, keyed by metric path"""
+    hashes: Dict[str, str] = {}
+    for section in sections:
+        if isinstance(state.get(section), dict):
+            tree_digest(state[section], escape_key(section), hashes)
+    return hashes
+
+
+def change_record(path: str, change: str, before: Any = None, after: Any = None) -> Dict[str, Any]:
+    """One path-level change; numeric changes carry a percentage"""
+    record = {'path': path, 'type': change, 'from': before, 'to': after}
+    numeric = all(isinstance(value, (int, float)) and not isinstance(value, bool)
+                  for value in (before, after))
+    if change == 'changed' and numeric:
+        record['change_pct'] = round((after - before) / abs(before) * 100, 2) if before else None
+    return record
+
+
+def diff_tree(previous: Any, current: Any, path: str,
+              previous_hashes: Dict[str, str], current_hashes: Dict[str, str],
+              changes: List[Dict[str, Any]], stats: Dict[str, int]) -> None:
+    """Append change records for a subtree, skipping branches whose hashes match"""
+    stats['nodes_visited'] += 1
+    if not (isinstance(previous, dict) and isinstance(current, dict)):
+        if previous != current or type(previous) is not type(current):
+            changes.append(change_record(path, 'changed', previous, current))
+        return
+    known = previous_hashes.get(path)
+    if known is not None and known == current_hashes.get(path):
+        return
+
+    for key in sorted(set(previous) | set(current), key=str):
+        child_path = path + '.' + escape_key(str(key))
+        if key not in previous:
+            changes.append(change_record(child_path, 'added', after=current[key]))
+        elif key not in current:
+            changes.append(change_record(child_path, 'removed', before=previous[key]))
+        else:
+            diff_tree(previous[key], current[key], child_path,
+                      previous_hashes, current_hashes, changes, stats)
+
+
+def diff_states(previous: Dict[str, Any], current: Dict[str, Any], sections: Iterable[str],
+                previous_hashes: Optional[Dict[str, str]] = None,
+                current_hashes: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Path-level changes between two states, descending only into changed subtrees
+
+    Hashes default to the 'merkle' map carried by each state; a state saved
+    before hashes were recorded is hashed on the fly.
+    """
+    sections = list(sections)
+    if previous_hashes is None:
+        previous_hashes = previous.get('merkle') or state_hashes(previous, sections)
+    if current_hashes is None:
+        current_hashes = current.get('merkle') or state_hashes(current, sections)
+
+    stats = {'nodes_visited': 0}
+    by_section = {}
+    for section in sections:
+        changes: List[Dict[str, Any]] = []
+        diff_tree(previous.get(section, {}), current.get(section, {}), escape_key(section),
+                  previous_hashes, current_hashes, changes, stats)
+        by_section[section] = changes
+    return {'sections': by_section, 'nodes_visited': stats['nodes_visited']}
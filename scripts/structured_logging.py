@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+NetNeural Structured Logging
+Queued JSON event logging shared by the automation scripts, started on first use
+"""
+
+import sys
+import copy
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+DEFAULT_SETTINGS = {
+    'level': 'INFO',
+    'file': None,  # e.g. logs/{name}.jsonl; None logs to stderr only
+    'max_bytes': 10 * 1024 * 1024,
+    'backup_count': 5,
+    'console': 'text',  # 'text' or 'json'
+    'queue_size': 10000,
+}
+
+_lock = threading.RLock()
+_name = 'automation'
+_handler: Optional['EventQueueHandler'] = None
+
+
+class EventQueueHandler(QueueHandler):
+    """Root handler that only enqueues; formatting and I/O happen on the listener thread.
+
+    The listener and its handlers are built when the first record arrives,
+    so configuring logging creates no files and starts no threads. When
+    the queue is full, records are counted and dropped rather than
+    blocking the caller.
+    """
+
+    def __init__(self, settings: Dict[str, Any], name: str):
+        """Initialize with logging settings and the name of the entry point"""
+        super().__init__(queue.Queue(settings['queue_size']))
+        self.settings = settings
+        self.entry_point = name
+        self.listener: Optional[QueueListener] = None
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Copy of a record with %-arguments merged while they still hold their call-time values"""
+        record = copy.copy(record)
+        if not isinstance(record.msg, dict):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Queue a record, or drop it when the listener has fallen behind"""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Start the listener on the first record, then hand the record over"""
+        if self.listener is None:
+            with _lock:
+                if self.listener is None:
+                    self.listener = QueueListener(self.queue, *self.build_handlers(), respect_handler_level=True)
+                    self.listener.start()
+        super().emit(record)
+
+    def build_handlers(self) -> list:
+        """Stderr handler plus, when a file is configured, a rotating JSON lines file"""
+        import structlog
+
+        console = logging.StreamHandler(sys.stderr)
+        console.setFormatter(event_formatter(
+            structlog.processors.JSONRenderer() if self.settings['console'] == 'json'
+            else structlog.dev.ConsoleRenderer(colors=False)))
+        handlers = [console]
+        if self.settings['file']:
+            path = Path(str(self.settings['file']).format(name=self.entry_point))
+            path.parent.mkdir(parents=True, exist_ok=True)
+            log_file = RotatingFileHandler(path, maxBytes=self.settings['max_bytes'],
+                                           backupCount=self.settings['backup_count'], delay=True,
+                                           encoding='utf-8')
+            log_file.setFormatter(event_formatter(structlog.processors.JSONRenderer(default=str)))
+            handlers.append(log_file)
+        return handlers
+
+    def stop(self) -> None:
+        """Drain the queue and close the handlers"""
+        if self.listener is not None:
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+            self.listener = None
+        if self.dropped:
+            sys.stderr.write(f"{self.dropped} log records dropped: logging queue full\n")
+            self.dropped = 0
+
+
+def record_timestamp(logger: Any, method: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Stamp a plain stdlib record with its creation time rather than the time it is rendered"""
+    created = datetime.fromtimestamp(event_dict['_record'].created, timezone.utc)
+    event_dict['timestamp'] = created.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+    return event_dict
+
+
+def event_formatter(renderer) -> logging.Formatter:
+    """Formatter rendering structlog events and plain stdlib records alike"""
+    import structlog
+
+    return structlog.stdlib.ProcessorFormatter(
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.format_exc_info,
+            renderer,
+        ],
+        foreign_pre_chain=[
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            record_timestamp,
+        ],
+    )
+
+
+def configure_logging(settings: Optional[Dict[str, Any]] = None, name: Optional[str] = None) -> None:
+    """Route all logging through one queued root handler
+
+    settings is the 'logging' section of ai_blueprint_config.yaml; missing
+    keys take DEFAULT_SETTINGS, and '{name}' in the file path is replaced
+    by the entry point name. Nothing is opened until the first record.
+    Calling again replaces the configuration, flushing what was queued.
+    """
+    global _name, _handler
+    with _lock:
+        if _handler is not None:
+            _handler.stop()
+            logging.getLogger().removeHandler(_handler)
+        settings = dict(DEFAULT_SETTINGS, **(settings or {}))
+        _name = name or _name
+        _handler = EventQueueHandler(settings, _name)
+        root = logging.getLogger()
+        root.addHandler(_handler)
+        root.setLevel(str(settings['level']).upper())
+
+
+def load_config(config_path: str) -> Dict[str, Any]:
+    """Parsed YAML configuration for an entry point's configure_logging call
+
+    Returns {} when the file is missing or unreadable, so the entry point
+    still runs, logging with DEFAULT_SETTINGS.
+    """
+    import yaml
+
+    try:
+        with open(config_path, 'r') as f:
+            return yaml.safe_load(f) or {}
+    except (OSError, yaml.YAMLError) as e:
+        print(f"Logging with defaults, could not load {config_path}: {e}", file=sys.stderr)
+        return {}
+
+
+def ensure_configured() -> None:
+    """Configure with defaults unless an entry point already did"""
+    if _handler is None:
+        with _lock:
+            if _handler is None:
+                configure_logging()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    with _lock:
+        if _handler is not None:
+            _handler.stop()
+
+
+atexit.register(shutdown_logging)
+
+
+class EventLogger:
+    """Logger that sets up logging and structlog when its first event is logged.
+
+    Creating one at import time is free, so modules can keep a module-level
+    logger without importing structlog or touching handlers until they log.
+    Events take keyword fields (logger.info("scan_planned", changed=12)),
+    which end up as keys of the JSON record.
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        """Initialize with the stdlib logger name events are emitted under"""
+        self.name = name
+        self._bound = None
+
+    def __getattr__(self, attribute: str) -> Any:
+        """Delegate to the structlog logger, building it on first access"""
+        if self._bound is None:
+            import structlog
+
+            ensure_configured()
+            self._bound = structlog.wrap_logger(
+                logging.getLogger(self.name),
+                processors=[
+                    structlog.stdlib.filter_by_level,
+                    structlog.stdlib.add_logger_name,
+                    structlog.stdlib.add_log_level,
+                    structlog.processors.TimeStamper(fmt='iso', utc=True),
+                    structlog.stdlib.PositionalArgumentsFormatter(),
+                    # Tracebacks are captured on the calling thread, where the exception is current
+                    structlog.processors.StackInfoRenderer(),
+                    structlog.processors.format_exc_info,
+                    structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+                ],
+                wrapper_class=structlog.stdlib.BoundLogger,
+            )
+        return getattr(self._bound, attribute)
+
+
+def get_logger(name: Optional[str] = None) -> EventLogger:
+    """Structured logger for a module; cheap to create at import time"""
+    return EventLogger(name)
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+NetNeural Test Results Ingest
+Incremental Jest and Playwright log parsing with slowest-test rankings
+"""
+
+import re
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from scan_cache import ScanCache
+
+CHUNK_SIZE = 1 << 20
+HEAD_BYTES = 4096
+
+ANSI_RE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+DURATION_RE = r"(?P<value>\d+(?:\.\d+)?) ?(?P<unit>ms|s|m|h)"
+# Separators are matched loosely: Windows captures often mangle '›' into mojibake
+PW_TEST_RE = re.compile(
+    r"^(?P<lead>.*?)\[(?P<project>[^\]/]+)\]\s+\S+\s+(?P<file>\S+?):(?P<line>\d+):\d+\s+\S+\s+"
+    r"(?P<title>.*?)(?:\s+\(retry #(?P<retry>\d+)\))?(?:\s+\(" + DURATION_RE + r"\))?\s*$")
+PW_RUN_RE = re.compile(r"^Running (\d+) tests? using")
+PW_SUMMARY_RE = re.compile(
+    r"^\s+(?P<count>\d+) (?P<category>passed|failed|flaky|skipped|did not run|interrupted)"
+    r"(?:\s+\(" + DURATION_RE + r"\))?\s*$")
+JEST_SUITE_RE = re.compile(r"^\s*(?P<status>PASS|FAIL)\s+(?P<file>\S+)(?:\s+\(" + DURATION_RE + r"\))?")
+JEST_TEST_RE = re.compile(
+    r"^\s+(?P<mark>[✓✔√✕✖×○])\s+(?:(?:skipped|todo)\s+)?(?P<title>.+?)"
+    r"(?:\s+\(" + DURATION_RE + r"\))?\s*$")
+JEST_TESTS_RE = re.compile(r"^Tests:\s+(.*)$")
+JEST_TIME_RE = re.compile(r"^Time:\s+" + DURATION_RE)
+
+PASS_MARKS = ('✓', '✔', '√', 'ok', 'Γ£ô')
+FAIL_MARKS = ('✘', '✗', '✕', '✖', '×', 'x', 'Γ£ÿ')
+SKIP_MARKS = ('-', '○', '°')
+UNIT_MS = {'ms': 1, 's': 1000, 'm': 60000, 'h': 3600000}
+BOMS = [
+    (b'\xff\xfe', 'utf-16-le'),
+    (b'\xfe\xff', 'utf-16-be'),
+    (b'\xef\xbb\xbf', 'utf-8'),
+]
+
+
+def to_ms(value: Optional[str], unit: Optional[str]) -> Optional[float]:
+    """Convert a reporter duration to milliseconds"""
+    if value is None:
+        return None
+    return float(value) * UNIT_MS[unit]
+
+
+def new_run(runner: Optional[str] = None) -> Dict[str, Any]:
+    """Empty per-run parser state"""
+    return {'runner': runner, 'expected': None, 'tests': {}, 'summary': {},
+            'duration_ms': None, 'section': None, 'suite': None, 'complete': False}
+
+
+class LogParser:
+    """Line-at-a-time parser for Jest and Playwright console output.
+
+    The state is a plain dict so it can be persisted between monitor runs
+    and resumed when the log grows. Only the latest run in a log is kept:
+    a new 'Running N tests' banner or a Jest suite line after a finished
+    summary starts over.
+    """
+
+    def __init__(self, state: Optional[Dict[str, Any]] = None):
+        """Resume from persisted state, or start empty"""
+        self.run = state or new_run()
+
+    def test(self, key: str, file: str) -> Dict[str, Any]:
+        """Record for one test of the current run"""
+        return self.run['tests'].setdefault(
+            key, {'file': file, 'status': None, 'duration_ms': None, 'retries': 0})
+
+    def feed(self, line: str) -> None:
+        """Consume one line of console output"""
+        line = ANSI_RE.sub('', line).rstrip()
+        if not line:
+            return
+
+        match = PW_RUN_RE.match(line)
+        if match:
+            self.run = new_run('playwright')
+            self.run['expected'] = int(match.group(1))
+            return
+
+        match = PW_TEST_RE.match(line)
+        if match:
+            self.feed_playwright_test(match)
+            return
+
+        match = PW_SUMMARY_RE.match(line)
+        if match and self.run['runner'] == 'playwright':
+            category = match.group('category')
+            self.run['summary'][category] = int(match.group('count'))
+            self.run['section'] = category
+            self.run['complete'] = True
+            if category == 'passed' and match.group('value'):
+                self.run['duration_ms'] = to_ms(match.group('value'), match.group('unit'))
+            return
+
+        match = JEST_SUITE_RE.match(line)
+        if match:
+            if self.run['runner'] != 'jest' or self.run['complete']:
+                self.run = new_run('jest')
+            self.run['suite'] = match.group('file')
+            self.run['summary'].setdefault('suites', 0)
+            self.run['summary']['suites'] += 1
+            return
+
+        match = JEST_TEST_RE.match(line)
+        if match and self.run['runner'] == 'jest' and self.run['suite']:
+            mark = match.group('mark')
+            status = 'passed' if mark in PASS_MARKS else 'failed' if mark in FAIL_MARKS else 'skipped'
+            suite = self.run['suite']
+            record = self.test(f"{suite} › {match.group('title')}", suite)
+            record['status'] = status
+            record['duration_ms'] = to_ms(match.group('value'), match.group('unit'))
+            return
+
+        match = JEST_TESTS_RE.match(line)
+        if match and self.run['runner'] == 'jest':
+            for part in match.group(1).split(','):
+                count, _, category = part.strip().partition(' ')
+                if count.isdigit() and category != 'total':
+                    self.run['summary'][category] = int(count)
+            self.run['complete'] = True
+            return
+
+        match = JEST_TIME_RE.match(line)
+        if match and self.run['runner'] == 'jest':
+            self.run['duration_ms'] = to_ms(match.group('value'), match.group('unit'))
+
+    def feed_playwright_test(self, match: 're.Match') -> None:
+        """Consume a progress, result, failure-header or summary-listing line"""
+        if self.run['runner'] != 'playwright':
+            self.run = new_run('playwright')
+        file = match.group('file').replace('\\', '/')
+        title = match.group('title')
+        record = self.test(f"[{match.group('project')}] {file}:{match.group('line')} › {title}", file)
+        if match.group('retry'):
+            record['retries'] = max(record['retries'], int(match.group('retry')))
+        if match.group('value'):
+            # Retries add to the time the test costs CI
+            duration = to_ms(match.group('value'), match.group('unit'))
+            record['duration_ms'] = (record['duration_ms'] or 0) + duration if match.group('retry') else duration
+
+        lead = match.group('lead').strip()
+        if not lead:
+            # Listing under a summary line such as '15 failed' or '2 flaky'
+            if self.run['section']:
+                record['status'] = self.run['section']
+        elif lead[0] == '[' or lead.endswith(')'):
+            # '[3/20]' progress line or '1)' failure header; outcome comes later
+            if lead.endswith(')') and record['status'] is None:
+                record['status'] = 'failed'
+        else:
+            mark = lead.split()[0]
+            if mark in PASS_MARKS:
+                record['status'] = 'flaky' if record['retries'] else 'passed'
+            elif mark in FAIL_MARKS:
+                record['status'] = 'failed'
+            elif mark in SKIP_MARKS:
+                record['status'] = 'skipped'
+
+
+def digest_before(f, offset: int) -> str:
+    """Hash of the HEAD_BYTES (or fewer) bytes of an open file that end at offset"""
+    start = max(0, offset - HEAD_BYTES)
+    f.seek(start)
+    return hashlib.sha1(f.read(offset - start)).hexdigest()
+
+
+def detect_encoding(head: bytes) -> Tuple[str, int]:
+    """Encoding and BOM length of a log from its first bytes"""
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding, len(bom)
+    return 'utf-8', 0
+
+
+def last_newline(data: bytes, newline: bytes) -> int:
+    """Index of the last newline that falls on a character boundary"""
+    index = data.rfind(newline)
+    while index > 0 and index % len(newline):
+        index = data.rfind(newline, 0, index)
+    return index
+
+
+def parse_playwright_json(report: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a Playwright JSON reporter document to run state"""
+    run = new_run('playwright')
+    run['complete'] = True
+    stats = report.get('stats', {})
+    run['duration_ms'] = stats.get('duration')
+    run['summary'] = {'passed': stats.get('expected', 0), 'failed': stats.get('unexpected', 0),
+                      'flaky': stats.get('flaky', 0), 'skipped': stats.get('skipped', 0)}
+
+    suites = list(report.get('suites', []))
+    while suites:
+        suite = suites.pop()
+        suites.extend(suite.get('suites', []))
+        for spec in suite.get('specs', []):
+            file = spec.get('file', suite.get('file', ''))
+            for test in spec.get('tests', []):
+                results = test.get('results', [])
+                status = {'expected': 'passed', 'unexpected': 'failed'}.get(
+                    test.get('status'), test.get('status'))
+                key = f"[{test.get('projectName', '')}] {file}:{spec.get('line', 0)} › {spec.get('title')}"
+                run['tests'][key] = {
+                    'file': file,
+                    'status': status,
+                    'duration_ms': sum(result.get('duration', 0) for result in results),
+                    'retries': max(0, len(results) - 1),
+                }
+    return run
+
+
+def parse_jest_json(report: Dict[str, Any], root: str) -> Dict[str, Any]:
+    """Reduce a Jest --json report to run state"""
+    run = new_run('jest')
+    run['complete'] = True
+    run['summary'] = {'passed': report.get('numPassedTests', 0), 'failed': report.get('numFailedTests', 0),
+                      'skipped': report.get('numPendingTests', 0) + report.get('numTodoTests', 0),
+                      'suites': report.get('numTotalTestSuites', 0)}
+    ends = []
+    for suite in report.get('testResults', []):
+        file = suite.get('name', '').replace('\\', '/')
+        if root and file.startswith(root + '/'):
+            file = file[len(root) + 1:]
+        if suite.get('endTime'):
+            ends.append(suite['endTime'])
+        for assertion in suite.get('assertionResults', []):
+            status = assertion.get('status')
+            run['tests'][f"{file} › {assertion.get('fullName') or assertion.get('title')}"] = {
+                'file': file,
+                'status': 'skipped' if status in ('pending', 'todo', 'disabled') else status,
+                'duration_ms': assertion.get('duration'),
+                'retries': max(0, (assertion.get('invocations') or 1) - 1),
+            }
+    if ends and report.get('startTime'):
+        run['duration_ms'] = max(ends) - report['startTime']
+    return run
+
+
+def summarize_run(run: Dict[str, Any]) -> Dict[str, Any]:
+    """Counts, retries and per-spec durations of one run"""
+    tests = run['tests'].values()
+    counts = {category: 0 for category in ('passed', 'failed', 'flaky', 'skipped')}
+    for test in tests:
+        if test['status'] in counts:
+            counts[test['status']] += 1
+    if run['complete']:
+        # Reporter totals are authoritative; listings may be truncated
+        for category in counts:
+            counts[category] = run['summary'].get(category, counts[category])
+        counts['skipped'] += run['summary'].get('did not run', 0)
+        counts['failed'] += run['summary'].get('interrupted', 0)
+
+    specs: Dict[str, float] = {}
+    for test in tests:
+        if test['duration_ms']:
+            specs[test['file']] = specs.get(test['file'], 0) + test['duration_ms']
+    return {
+        'runner': run['runner'],
+        'complete': run['complete'],
+        **counts,
+        'retries': sum(test['retries'] for test in tests),
+        'duration_s': round(run['duration_ms'] / 1000, 1) if run['duration_ms'] else None,
+        'specs': {file: round(duration) for file, duration in sorted(specs.items())},
+    }
+
+
+class TestResultsIngestor:
+    """Ingests test runner logs and JSON reports into monitor metrics.
+
+    Console logs are read incrementally: the byte offset and parser state of
+    each log are cached, so a run only parses lines appended since the last
+    one. A log that was replaced (new inode), shrank, or whose first bytes or
+    bytes before the offset changed is treated as rewritten and parsed from
+    the start. JSON reports are cached by content hash.
+    """
+
+    def __init__(self, cache: ScanCache, root: Path):
+        """Initialize with a cache for log cursors and reports and the project root"""
+        self.cache = cache
+        self.root = str(root).replace('\\', '/').rstrip('/')
+
+    def relative(self, path: Path) -> str:
+        """Artifact path relative to the project root"""
+        path = str(path).replace('\\', '/')
+        if path.startswith(self.root + '/'):
+            return path[len(self.root) + 1:]
+        return path
+
+    def ingest_log(self, path: Path) -> Tuple[str, Dict[str, Any]]:
+        """Parse the lines appended to a console log since the last ingest"""
+        key = f"log:{path}"
+        cursor = self.cache.get(key)
+        stat = path.stat()
+        size = stat.st_size
+
+        with open(path, 'rb') as f:
+            head = f.read(HEAD_BYTES)
+            # A new run with the same banner can start with the same bytes and outgrow the old
+            # log, so the bytes just before the cursor must match too
+            if (cursor is None or size < cursor['offset'] or cursor.get('inode') != stat.st_ino or
+                    hashlib.sha1(head[:cursor['head_size']]).hexdigest() != cursor['head'] or
+                    digest_before(f, cursor['offset']) != cursor.get('tail')):
+                encoding, bom = detect_encoding(head)
+                cursor = {'offset': bom, 'encoding': encoding, 'state': None}
+            if size == cursor['offset'] and 'head' in cursor:
+                return key, cursor
+
+            parser = LogParser(cursor['state'])
+            newline = '\n'.encode(cursor['encoding'])
+            offset = cursor['offset']
+            f.seek(offset)
+            pending = b''
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                data = pending + chunk
+                end = last_newline(data, newline)
+                if end < 0:
+                    pending = data
+                    continue
+                end += len(newline)
+                for line in data[:end].decode(cursor['encoding'], 'replace').splitlines():
+                    parser.feed(line)
+                offset += end
+                pending = data[end:]
+            # A trailing partial line is left for the next ingest
+            tail = digest_before(f, offset)
+
+        cursor.update(offset=offset, state=parser.run, head_size=len(head),
+                      head=hashlib.sha1(head).hexdigest(), tail=tail, inode=stat.st_ino)
+        self.cache.put(key, cursor)
+        return key, cursor
+
+    def ingest_report(self, path: Path) -> Tuple[str, Dict[str, Any]]:
+        """Parse a Playwright or Jest JSON report, or reuse the cached result"""
+        digest = self.cache.digest(path)
+        cached = self.cache.get(digest)
+        if cached is None:
+            with open(path, 'r', encoding='utf-8-sig') as f:
+                report = json.load(f)
+            if 'suites' in report:
+                run = parse_playwright_json(report)
+            elif 'testResults' in report:
+                run = parse_jest_json(report, self.root)
+            else:
+                raise ValueError(f"{path} is not a Playwright or Jest JSON report")
+            cached = {'state': run}
+            self.cache.put(digest, cached)
+        return digest, cached
+
+    def ingest(self, reports: List[Path], slowest: int = 10) -> Dict[str, Any]:
+        """Totals and slowest-test rankings from the newest run of each reporter
+
+        Artifacts accumulate: older runs are kept around and one run is often
+        saved both as a console log and as a JSON report. Every artifact is
+        listed under 'runs', but only the most recently written one per
+        runner counts towards the totals and rankings.
+        """
+        totals = {category: 0 for category in ('passed', 'failed', 'flaky', 'skipped', 'retries')}
+        runs = []
+        newest: Dict[str, Tuple[float, int, Dict[str, Any]]] = {}
+        live = []
+        for path in reports:
+            try:
+                modified = path.stat().st_mtime
+                if path.suffix == '.json':
+                    key, cached = self.ingest_report(path)
+                else:
+                    key, cached = self.ingest_log(path)
+            except (OSError, ValueError, UnicodeDecodeError) as e:
+                runs.append({'path': self.relative(path), 'error': str(e)})
+                continue
+            live.append(key)
+            run = cached['state']
+            if run is None or not run['runner']:
+                continue
+            summary = summarize_run(run)
+            runs.append(dict(summary, path=self.relative(path), counted=False))
+            if run['runner'] not in newest or modified > newest[run['runner']][0]:
+                newest[run['runner']] = (modified, len(runs) - 1, run)
+        self.cache.save(live)
+
+        timings = []
+        specs: Dict[str, float] = {}
+        for _, index, run in newest.values():
+            summary = runs[index]
+            summary['counted'] = True
+            for category in totals:
+                totals[category] += summary[category]
+            for file, duration in summary['specs'].items():
+                specs[file] = specs.get(file, 0) + duration
+            timings.extend((test['duration_ms'], name, summary['path'])
+                           for name, test in run['tests'].items() if test['duration_ms'])
+        timings.sort(reverse=True)
+        return {
+            **totals,
+            'total': totals['passed'] + totals['failed'] + totals['flaky'] + totals['skipped'],
+            'runs': runs,
+            'slowest_tests': [{'test': name, 'duration_ms': round(duration), 'report': report}
+                              for duration, name, report in timings[:slowest]],
+            'slowest_specs': [{'file': file, 'duration_ms': round(duration)}
+                              for file, duration in sorted(specs.items(), key=lambda item: -item[1])[:slowest]],
+        }
@@ -0,0 +1,10 @@
+"""
+NetNeural Script Tests
+Puts the scripts directory on the import path, as running a script from it would
+"""
+
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
@@ -0,0 +1,48 @@
+"""
+NetNeural Collector Registry Tests
+Cached values and the inputs and untracked artifacts that invalidate them
+"""
+
+import os
+import subprocess
+
+from collector_registry import CollectorRegistry, CollectorSpec
+from collector_scheduler import CollectorScheduler
+
+
+def git(root, *args):
+    subprocess.run(['git', '-C', str(root), *args], check=True, capture_output=True)
+
+
+def test_new_artifact_under_a_tracked_directory_invalidates_the_cache(tmp_path):
+    # development/ is tracked, the coverage reports written into it are not
+    (tmp_path / 'development' / 'coverage').mkdir(parents=True)
+    (tmp_path / 'development' / 'package.json').write_text('{}')
+    (tmp_path / '.gitignore').write_text('coverage/\n')
+    git(tmp_path, 'init', '-q')
+    git(tmp_path, 'add', '.')
+    git(tmp_path, '-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-qm', 'init')
+
+    calls = []
+    registry = CollectorRegistry(tmp_path, tmp_path / 'cache.json', {'moderate': 3600})
+    registry.register(CollectorSpec('test_coverage', 'technical_metrics', lambda: calls.append(1) or len(calls),
+                                    inputs=['development'], cost='moderate',
+                                    artifacts=['development/coverage/lcov.info', '*/coverage.out']))
+    scheduler = CollectorScheduler(max_workers=1)
+
+    assert registry.run(scheduler)['test_coverage']['value'] == 1
+    assert registry.run(scheduler)['test_coverage']['status'] == 'cached'
+
+    report = tmp_path / 'development' / 'coverage' / 'lcov.info'
+    report.write_text('SF:a.ts\nLF:2\nLH:1\nend_of_record\n')
+    assert registry.run(scheduler)['test_coverage']['value'] == 2
+    assert registry.run(scheduler)['test_coverage']['status'] == 'cached'
+
+    # Rewritten in place by the next test run
+    stat = report.stat()
+    report.write_text('SF:a.ts\nLF:2\nLH:2\nend_of_record\n')
+    os.utime(report, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert registry.run(scheduler)['test_coverage']['value'] == 3
+
+    (tmp_path / 'development' / 'coverage.out').write_text('mode: set\n')
+    assert registry.run(scheduler)['test_coverage']['value'] == 4
@@ -0,0 +1,94 @@
+"""
+NetNeural Collector Scheduler Tests
+Time budgets, cooperative deadlines and process exit with abandoned collectors
+"""
+
+import sys
+import time
+import subprocess
+import threading
+from pathlib import Path
+
+from collector_scheduler import CollectorScheduler, check_deadline
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+# One scheduler run in a fresh interpreter: a cooperative collector, one that ignores
+# deadlines entirely and a cheap one, under a time budget far shorter than either
+BUDGETED_RUN = """
+import time
+from collector_scheduler import CollectorScheduler, check_deadline
+
+def cooperative():
+    while True:
+        check_deadline()
+        time.sleep(0.01)
+
+scheduler = CollectorScheduler(max_workers=2)
+results = scheduler.run({{
+    'constant': (lambda: 1, None),
+    'cooperative': (cooperative, None),
+    'blocking': (lambda: time.sleep(30), None),
+}}, time_budget={budget}, unbudgeted=['constant'])
+print(' '.join(results[name]['status'] for name in ('constant', 'cooperative', 'blocking')))
+"""
+
+
+def test_process_exits_within_budget_despite_running_collectors():
+    budget = 0.5
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', BUDGETED_RUN.format(budget=budget)],
+                            cwd=SCRIPTS_DIR, capture_output=True, text=True, timeout=60)
+    elapsed = time.perf_counter() - started
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ['ok', 'timeout', 'timeout']
+    # Interpreter startup is the only allowance; the blocking collector would hold exit for 30s
+    assert elapsed < budget + 1.5
+
+
+def test_cheap_collectors_run_outside_the_budget():
+    scheduler = CollectorScheduler(max_workers=1)
+    results = scheduler.run({
+        'constant': (lambda: time.sleep(0.3) or 'done', None),
+        'moderate': (lambda: time.sleep(0.3) or 'done', None),
+    }, time_budget=0.1, unbudgeted=['constant'])
+
+    assert results['constant']['status'] == 'ok'
+    assert results['constant']['value'] == 'done'
+    assert results['moderate']['status'] == 'timeout'
+
+
+def test_deadline_runs_from_start_not_from_submission():
+    scheduler = CollectorScheduler(max_workers=1)
+    results = scheduler.run({
+        'first': (lambda: time.sleep(0.3), 0.5),
+        'queued': (lambda: time.sleep(0.3), 0.5),
+    })
+
+    assert results['first']['status'] == 'ok'
+    assert results['queued']['status'] == 'ok'
+
+
+def test_cooperative_collector_stops_at_its_deadline():
+    stopped = threading.Event()
+
+    def cooperative():
+        try:
+            while True:
+                check_deadline()
+                time.sleep(0.01)
+        finally:
+            stopped.set()
+
+    scheduler = CollectorScheduler()
+    started = time.perf_counter()
+    results = scheduler.run({'cooperative': (cooperative, 0.2)})
+
+    assert results['cooperative']['status'] == 'timeout'
+    assert stopped.wait(1.0)
+    assert time.perf_counter() - started < 1.0
+
+
+def test_check_deadline_outside_the_scheduler_does_nothing():
+    check_deadline()
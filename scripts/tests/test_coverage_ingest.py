@@ -0,0 +1,91 @@
+"""
+NetNeural Coverage Ingest Tests
+lcov, Istanbul summary and Go profile totals, and combining reports of one run
+"""
+
+import json
+
+from coverage_ingest import CoverageIngestor, parse_go_profile, parse_istanbul_summary, parse_lcov
+from scan_cache import ScanCache
+
+LCOV = """TN:
+SF:/repo/development/src/lib/format.ts
+DA:1,4
+DA:2,0
+DA:3,1,abc123
+BRF:4
+BRH:3
+end_of_record
+SF:/repo/development/src/lib/parse.ts
+FN:1,parse
+LF:10
+LH:7
+end_of_record
+SF:/repo/development/src/app/page.tsx
+DA:1,0
+DA:2,0
+end_of_record
+"""
+
+ISTANBUL = {
+    'total': {'lines': {'total': 99, 'covered': 99}},
+    '/repo/development/src/lib/format.ts': {'lines': {'total': 3, 'covered': 2},
+                                            'branches': {'total': 4, 'covered': 3}},
+    '/repo/development/src/lib/parse.ts': {'lines': {'total': 10, 'covered': 7},
+                                           'branches': {'total': 0, 'covered': 0}},
+}
+
+GO_PROFILE = """mode: set
+github.com/netneural/api/handlers/devices.go:12.40,15.2 3 1
+github.com/netneural/api/handlers/devices.go:17.2,19.16 2 0
+github.com/netneural/api/store/db.go:8.30,10.2 4 1
+"""
+
+
+def test_lcov_counts_records_and_falls_back_to_da_lines(tmp_path):
+    report = tmp_path / 'lcov.info'
+    report.write_text(LCOV)
+
+    assert parse_lcov(report, '/repo') == {
+        'development/src/lib': {'lines_total': 13, 'lines_covered': 9, 'branches_total': 4, 'branches_covered': 3},
+        'development/src/app': {'lines_total': 2, 'lines_covered': 0, 'branches_total': 0, 'branches_covered': 0},
+    }
+
+
+def test_istanbul_summary_skips_the_total_entry(tmp_path):
+    report = tmp_path / 'coverage-summary.json'
+    report.write_text(json.dumps(ISTANBUL))
+
+    assert parse_istanbul_summary(report, '/repo') == {
+        'development/src/lib': {'lines_total': 13, 'lines_covered': 9, 'branches_total': 4, 'branches_covered': 3},
+    }
+
+
+def test_go_profile_counts_statements_of_covered_blocks(tmp_path):
+    report = tmp_path / 'coverage.out'
+    report.write_text(GO_PROFILE)
+
+    assert parse_go_profile(report, '') == {
+        'github.com/netneural/api/handlers': {'lines_total': 5, 'lines_covered': 3,
+                                              'branches_total': 0, 'branches_covered': 0},
+        'github.com/netneural/api/store': {'lines_total': 4, 'lines_covered': 4,
+                                           'branches_total': 0, 'branches_covered': 0},
+    }
+
+
+def test_reports_combine_without_counting_a_run_twice(tmp_path):
+    (tmp_path / 'coverage').mkdir()
+    (tmp_path / 'coverage' / 'lcov.info').write_text(LCOV.replace('/repo', str(tmp_path.resolve())))
+    (tmp_path / 'coverage' / 'coverage-summary.json').write_text(json.dumps(ISTANBUL))
+    (tmp_path / 'coverage.out').write_text(GO_PROFILE)
+    ingestor = CoverageIngestor(ScanCache(tmp_path / 'cache', 'coverage'), tmp_path)
+
+    result = ingestor.ingest([tmp_path / 'coverage' / 'lcov.info', tmp_path / 'coverage' / 'coverage-summary.json',
+                              tmp_path / 'coverage.out', tmp_path / 'coverage' / 'lcov.info'])
+
+    # The Istanbul summary describes the same Jest run as lcov.info
+    assert [report['path'] for report in result['reports']] == ['coverage/lcov.info', 'coverage.out']
+    assert (result['lines_total'], result['lines_covered']) == (24, 16)
+    assert (result['branches_total'], result['branches_covered']) == (4, 3)
+    assert result['line_pct'] == 66.67
+    assert result['packages']['development/src/lib']['line_pct'] == 69.23
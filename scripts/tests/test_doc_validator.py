@@ -0,0 +1,70 @@
+"""
+NetNeural Doc Validator Tests
+Code references in markdown, resolved and unresolved against the symbol index
+"""
+
+from doc_validator import DocValidator, accuracy_score, document_references
+from scan_cache import ScanCache
+
+SETUP = """# Alerts
+
+Deploy with `supabase functions deploy send-alert`, then call
+`POST /functions/v1/send-alert` or the retired `functions/v1/notify-all`.
+Replace my-function in `functions/v1/my-function` with your own.
+
+Rows land in the `devices` table; `gadgets` tables are gone.
+The handler reads `SUPABASE_URL` and returns an `AlertPayload`, not a `DeviceRecord`.
+
+```bash
+export SUPABASE_URL=http://localhost:54321
+STRIPE_SECRET_KEY=sk_test
+```
+
+The client calls `supabase.from('devices')`.
+"""
+
+SOURCES = {
+    'supabase/functions/send-alert/index.ts':
+        "export interface AlertPayload { device: string }\nconst key = Deno.env.get('RESEND_API_KEY')\n",
+    'supabase/functions/_shared/cors.ts': "export const corsHeaders = {}\n",
+    '.env.example': "SUPABASE_URL=\n",
+    'supabase/migrations/001_init.sql': "CREATE TABLE public.devices (id uuid);\nCREATE TABLE gadgets (id uuid);\n",
+    'supabase/migrations/002_drop.sql': "DROP TABLE gadgets;\n",
+}
+
+
+def write_project(tmp_path):
+    for relative, text in {**SOURCES, 'docs/SETUP.md': SETUP, 'docs/EMPTY.md': "# Nothing to check\n"}.items():
+        (tmp_path / relative).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / relative).write_text(text)
+    return DocValidator(ScanCache(tmp_path / 'cache', 'doc_validator'), tmp_path)
+
+
+def test_references_by_kind_with_first_line_and_no_placeholders():
+    references = document_references(SETUP)
+
+    assert sorted(references) == [
+        ['env', 'STRIPE_SECRET_KEY', 12], ['env', 'SUPABASE_URL', 8],
+        ['functions', 'notify-all', 4], ['functions', 'send-alert', 3],
+        ['tables', 'devices', 7], ['tables', 'gadgets', 7],
+        ['types', 'AlertPayload', 8], ['types', 'DeviceRecord', 8],
+    ]
+
+
+def test_unresolved_references_against_the_index(tmp_path):
+    validator = write_project(tmp_path)
+    migrations = sorted((tmp_path / 'supabase' / 'migrations').glob('*.sql'))
+
+    index = validator.build_index(list(SOURCES), 'supabase/functions', migrations)
+    results = validator.validate(['docs/SETUP.md', 'docs/EMPTY.md'], index)
+
+    # _shared is not a deployable function, and gadgets was dropped by a later migration
+    assert index['symbols']['functions'] == {'send-alert'}
+    assert index['symbols']['tables'] == {'devices'}
+    assert results['docs/SETUP.md']['references'] == 8
+    assert sorted(results['docs/SETUP.md']['unresolved']) == [
+        ['env', 'STRIPE_SECRET_KEY', 12], ['functions', 'notify-all', 4],
+        ['tables', 'gadgets', 7], ['types', 'DeviceRecord', 8]]
+    assert accuracy_score(results) == 5.0
+    # Nothing to check is not the same as nothing wrong
+    assert accuracy_score(results, ['docs/EMPTY.md']) is None
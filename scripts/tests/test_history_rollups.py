@@ -0,0 +1,66 @@
+"""
+NetNeural History Rollup Tests
+Hourly, daily and weekly statistics, incremental compaction and retention
+"""
+
+from datetime import datetime, timedelta
+
+from history_rollups import HistoryCompactor, merge_stats
+from snapshot_store import SnapshotStore
+
+START = datetime(2026, 3, 2, 9, 0)
+
+
+def fill(store, hours, per_hour=2):
+    for hour in range(hours):
+        for index in range(per_hour):
+            moment = START + timedelta(hours=hour, minutes=20 * index)
+            store.append({'timestamp': moment.isoformat(),
+                          'technical_metrics': {'services': {'total': hour * 10 + index, 'status': 'ok'}}})
+
+
+def test_merge_stats_combines_weighted_means():
+    stats = {}
+    merge_stats(stats, 'a', [1, 3, 2.0, 3, 2])
+    merge_stats(stats, 'a', [0, 10, 5.0, 10, 1])
+
+    assert stats['a'] == [0, 10, 3.0, 10, 3]
+
+
+def test_complete_buckets_roll_up_once(tmp_path):
+    store = SnapshotStore(tmp_path)
+    fill(store, 3)
+    compactor = HistoryCompactor(store)
+
+    report = compactor.compact(START + timedelta(hours=2, minutes=30))
+    # The current hour is still open, so only two hourly buckets are complete
+    assert report['hourly_rolled'] == 2
+    first, second = compactor.read_tier('hourly')
+    assert first['n'] == 2
+    assert first['m'] == {'technical_metrics.services.total': [0, 1, 0.5, 1, 2]}
+    assert second['m']['technical_metrics.services.total'] == [10, 11, 10.5, 11, 2]
+
+    # Compacting again rolls only buckets past the watermark
+    assert compactor.compact(START + timedelta(hours=3))['hourly_rolled'] == 1
+    assert len(compactor.read_tier('hourly')) == 3
+
+    daily = compactor.compact(START + timedelta(days=1))
+    assert daily['daily_rolled'] == 1
+    point, = compactor.read_tier('daily')
+    assert point['n'] == 6
+    assert point['m']['technical_metrics.services.total'] == [0, 21, 10.5, 21, 6]
+
+
+def test_retention_drops_old_segments_and_rollups(tmp_path):
+    store = SnapshotStore(tmp_path)
+    fill(store, 2)
+    compactor = HistoryCompactor(store, {'raw_snapshots': 1, 'hourly_rollups': 2})
+
+    compactor.compact(START + timedelta(hours=3))
+    report = compactor.compact(START + timedelta(days=3))
+
+    assert report['raw_dropped'] == 4
+    assert len(store) == 0
+    assert report['hourly_dropped'] == 2
+    assert compactor.read_tier('hourly') == []
+    assert len(compactor.read_tier('daily')) == 1
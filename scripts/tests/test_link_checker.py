@@ -0,0 +1,69 @@
+"""
+NetNeural Link Checker Tests
+Heading anchors, link extraction and broken links and anchors across documents
+"""
+
+from link_checker import LinkChecker, parse_markdown
+from scan_cache import ScanCache
+
+README = """# NetNeural Platform
+
+## Getting Started
+
+See [setup](docs/SETUP.md#local-development), [the API](docs/API.md#endpoints)
+and [deploying](docs/SETUP.md#deploy-to-production). Jump to [usage](#usage) or [usage notes](#usage-1).
+
+## Usage
+
+## Usage
+
+[Site](https://netneural.ai), [spec](docs/spec.md), [migrations](supabase/migrations/)
+and [line 3](scripts/run.sh#L3).
+
+```markdown
+[example](docs/NOT_A_LINK.md)
+```
+
+[setup]: docs/SETUP.md#Local-Development-V2
+"""
+
+SETUP = """Setup
+=====
+
+### Local `development` (v2)
+
+<a id="deploy-to-prod"></a>
+Back to [the top](../README.md#netneural-platform).
+"""
+
+
+def write_repository(tmp_path):
+    files = {'README.md': README, 'docs/SETUP.md': SETUP, 'scripts/run.sh': "echo\n",
+             'supabase/migrations/001_init.sql': "", 'archive/OLD.md': "[gone](missing.md)\n"}
+    for relative, text in files.items():
+        (tmp_path / relative).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / relative).write_text(text)
+    return sorted(files)
+
+
+def test_anchors_follow_github_slugs_and_skip_code():
+    parsed = parse_markdown(README)
+
+    assert parsed['anchors'] == ['netneural-platform', 'getting-started', 'usage', 'usage-1']
+    assert 'docs/NOT_A_LINK.md' not in [target for target, _ in parsed['links']]
+    assert parse_markdown(SETUP)['anchors'] == ['setup', 'local-development-v2', 'deploy-to-prod']
+
+
+def test_broken_links_and_anchors(tmp_path):
+    files = write_repository(tmp_path)
+    checker = LinkChecker(ScanCache(tmp_path / 'cache', 'links'), tmp_path)
+
+    report = checker.check(files, excluded=['archive'])
+
+    assert report['documents'] == 2
+    assert report['external'] == 1
+    assert (report['broken_links'], report['broken_anchors']) == (2, 2)
+    # Anchors match case-insensitively, and line anchors and directories resolve
+    assert report['broken'] == {'README.md': [
+        'docs/SETUP.md#local-development@5', 'docs/API.md#endpoints@5', 'docs/SETUP.md#deploy-to-production@6',
+        'docs/spec.md@12']}
@@ -0,0 +1,72 @@
+"""
+NetNeural Manifest Cache Tests
+package.json and go.mod parsing, and reuse of parsed manifests across runs
+"""
+
+import os
+
+from manifest_cache import ManifestCache, parse_go_mod, parse_package_json
+
+GO_MOD = """module github.com/netneural/sensor-service
+
+go 1.21
+
+require github.com/gorilla/mux v1.8.0
+
+require (
+\tgithub.com/lib/pq v1.10.9 // indirect
+\tgo.uber.org/zap v1.26.0
+)
+"""
+
+
+def test_go_mod_requirements_from_lines_and_blocks():
+    assert parse_go_mod(GO_MOD) == {
+        'module': 'github.com/netneural/sensor-service',
+        'go': '1.21',
+        'requires': ['github.com/gorilla/mux', 'github.com/lib/pq', 'go.uber.org/zap'],
+    }
+
+
+def test_package_json_keeps_dependency_names():
+    parsed = parse_package_json('{"name": "web", "dependencies": {"react": "^18", "next": "14"}, '
+                                '"devDependencies": null, "scripts": {"test": "jest"}}')
+
+    assert parsed == {'name': 'web', 'dependencies': ['next', 'react'], 'dev_dependencies': [], 'scripts': ['test']}
+
+
+def test_manifests_are_reparsed_only_when_they_change(tmp_path):
+    manifest = tmp_path / 'app' / 'package.json'
+    manifest.parent.mkdir()
+    manifest.write_text('{"name": "app", "dependencies": {"react": "18"}}')
+    cache_file = tmp_path / 'cache' / 'manifests.json'
+
+    cache = ManifestCache(cache_file)
+    assert cache.package_json(manifest.parent)['dependencies'] == ['react']
+    assert cache.package_json(tmp_path) is None
+    cache.save()
+
+    # A new run trusts the persisted parse while mtime and size match
+    persisted = ManifestCache(cache_file)
+    persisted.persisted[str(manifest)][2]['name'] = 'from-cache'
+    assert persisted.package_json(manifest.parent)['name'] == 'from-cache'
+
+    manifest.write_text('{"name": "app", "dependencies": {"react": "18", "vue": "3"}}')
+    stat = manifest.stat()
+    os.utime(manifest, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    persisted.reset_run()
+    assert persisted.package_json(manifest.parent)['dependencies'] == ['react', 'vue']
+
+
+def test_invalid_and_deleted_manifests(tmp_path):
+    (tmp_path / 'package.json').write_text('{not json')
+    cache_file = tmp_path / 'manifests.json'
+    cache = ManifestCache(cache_file)
+    assert cache.package_json(tmp_path) is None
+    cache.save()
+
+    (tmp_path / 'package.json').unlink()
+    rerun = ManifestCache(cache_file)
+    assert rerun.package_json(tmp_path) is None
+    rerun.save()
+    assert ManifestCache(cache_file).persisted == {}
@@ -0,0 +1,41 @@
+"""
+NetNeural Scan Sampler Tests
+Deadlines inside high-value roots and per-directory estimates that add up to the totals
+"""
+
+import time
+
+from scan_sampler import StratifiedSampler
+
+FILES = [f"app/src/module{module}/file{index}.ts" for module in range(10) for index in range(3)]
+FILES += [f"tools/{kind}/script{index}.py" for kind in ('build', 'release') for index in range(4)]
+
+
+def measure(files):
+    return {'files': len(files), 'code': 10 * len(files)}
+
+
+def test_ample_time_measures_everything_exactly():
+    estimate = StratifiedSampler(measure, seed=1).run(FILES, ['app/src'], 1, time.monotonic() + 60)
+
+    assert estimate['total'] == {'code': 380, 'files': 38}
+    assert estimate['confidence_intervals']['code'] == {'low': 380, 'high': 380}
+    assert not estimate['sampling']['approximate']
+    assert estimate['units']['tools/build'] == {'files': 4, 'code': 40}
+
+
+def test_deadline_stops_inside_high_value_roots():
+    calls = []
+
+    def slow_measure(files):
+        calls.append(files)
+        time.sleep(0.05)
+        return measure(files)
+
+    estimate = StratifiedSampler(slow_measure, seed=1).run(FILES, ['app/src'], 1, time.monotonic() + 0.12)
+
+    assert len(calls) < 10
+    assert estimate['sampling']['approximate']
+    # Every directory still gets a value, so rollups keep the full inventory shape
+    assert len(estimate['units']) == 12
+    assert round(sum(unit['files'] for unit in estimate['units'].values())) == estimate['total']['files'] == 38
@@ -0,0 +1,96 @@
+"""
+NetNeural Schema Drift Tests
+Generated Supabase types parsing and drift against the schema replayed from migrations
+"""
+
+import schema_drift
+from scan_cache import ScanCache
+from schema_drift import SchemaDriftDetector, parse_supabase_types
+
+TYPES = """export type Json = string | number | boolean | null
+
+export type Database = {
+  public: {
+    Tables: {
+      devices: {
+        Row: {
+          id: string
+          label: string
+          "serial": string | null
+        }
+        Insert: {
+          id?: string
+          label: string
+        }
+      }
+      users: {
+        Row: {
+          id: string
+        }
+      }
+    }
+    Views: {
+      device_summary: {
+        Row: {
+          total: number | null
+        }
+      }
+    }
+  }
+}
+"""
+
+INIT = """CREATE TABLE devices (id uuid PRIMARY KEY, name text, serial text);
+CREATE TABLE alerts (id bigint, device_id uuid);
+CREATE TABLE audit.events (id bigint);
+"""
+
+RENAME = "ALTER TABLE devices RENAME COLUMN name TO label;\n"
+
+
+def setup_project(tmp_path):
+    (tmp_path / 'migrations').mkdir()
+    (tmp_path / 'migrations' / '001_init.sql').write_text(INIT)
+    (tmp_path / 'database.types.ts').write_text(TYPES)
+    return tmp_path / 'database.types.ts', sorted((tmp_path / 'migrations').glob('*.sql'))
+
+
+def test_types_file_columns_come_from_row_only(tmp_path):
+    types_path, _ = setup_project(tmp_path)
+
+    assert parse_supabase_types(types_path) == {
+        'schemas': ['public'], 'tables': {'devices': ['id', 'label', 'serial'], 'users': ['id']}}
+
+
+def test_drift_between_types_and_migrations(tmp_path):
+    types_path, migrations = setup_project(tmp_path)
+    detector = SchemaDriftDetector(ScanCache(tmp_path / 'cache', 'schema_drift'))
+
+    report = detector.detect(types_path, migrations)
+
+    # audit.events is outside the schemas the types file covers
+    assert (report['tables_in_types'], report['tables_in_migrations']) == (2, 2)
+    assert report['missing_from_types'] == ['alerts']
+    assert report['missing_from_migrations'] == ['users']
+    assert report['columns'] == {'devices': {'missing_from_types': ['name'], 'missing_from_migrations': ['label']}}
+    assert report['drifted_tables'] == 3
+
+
+def test_a_new_migration_is_the_only_file_tokenized(tmp_path, monkeypatch):
+    types_path, migrations = setup_project(tmp_path)
+    detector = SchemaDriftDetector(ScanCache(tmp_path / 'cache', 'schema_drift'))
+    detector.detect(types_path, migrations)
+    detector.save()
+
+    (tmp_path / 'migrations' / '002_rename.sql').write_text(RENAME)
+    analyzed = []
+    analyze_file = schema_drift.analyze_file
+    monkeypatch.setattr(schema_drift, 'analyze_file', lambda path: analyzed.append(path.name) or analyze_file(path))
+    detector = SchemaDriftDetector(ScanCache(tmp_path / 'cache', 'schema_drift'))
+
+    report = detector.detect(types_path, sorted((tmp_path / 'migrations').glob('*.sql')))
+
+    assert analyzed == ['002_rename.sql']
+    # The rename brings devices back in line with the types
+    assert report['columns'] == {}
+    assert report['drifted_tables'] == 2
@@ -0,0 +1,88 @@
+"""
+NetNeural Snapshot Codec Tests
+Binary frames, lazy per-metric reads and binary segments in the snapshot store
+"""
+
+from datetime import datetime, timedelta
+
+from snapshot_codec import BinarySnapshot, DELETED_VALUE, decode, encode
+from snapshot_store import SnapshotStore, flatten_state
+
+FLAT = {
+    'technical_metrics.services.total': 12,
+    'technical_metrics.services.go_services': 3,
+    'technical_metrics.code_inventory.languages.Go.code': 5400,
+    'technical_metrics.code_inventory.directories.development/src.code': 90000,
+    'schema.database_dumps.dump\\.sql.tables': 41,
+    'documentation_health.overall_health_score': 8.07,
+    'documentation_health.links.broken.README\\.md': ['docs/missing.md@3'],
+}
+
+
+def test_frame_round_trips_in_order():
+    assert list(decode(encode(FLAT)).items()) == list(FLAT.items())
+
+
+def test_lookups_read_single_metrics():
+    frame = BinarySnapshot(encode(FLAT))
+
+    assert frame.lookup('technical_metrics.services.go_services') == 3
+    assert frame.lookup('schema.database_dumps.dump\\.sql.tables') == 41
+    assert frame.lookup('technical_metrics.services.missing', 'default') == 'default'
+    assert frame.subtree('technical_metrics.code_inventory') == {
+        'technical_metrics.code_inventory.languages.Go.code': 5400,
+        'technical_metrics.code_inventory.directories.development/src.code': 90000,
+    }
+
+
+def test_delta_frames_carry_deleted_paths():
+    frame = BinarySnapshot(encode({'technical_metrics.services.total': 13},
+                                  ['technical_metrics.services.go_services']))
+
+    assert frame.lookup('technical_metrics.services.go_services') is DELETED_VALUE
+    assert frame.deleted('technical_metrics.services') == ['technical_metrics.services.go_services']
+    assert frame.to_flat() == {'technical_metrics.services.total': 13}
+
+
+def test_large_chunks_split_into_blocks():
+    flat = {f"technical_metrics.code_inventory.directories.dir{index}.code": index for index in range(2000)}
+    flat['technical_metrics.services.total'] = 1
+    frame = BinarySnapshot(encode(flat))
+
+    assert frame.block_count > 1
+    assert frame.lookup('technical_metrics.services.total') == 1
+    assert frame.to_flat() == flat
+
+
+def test_binary_store_reads_one_metric_through_deltas(tmp_path):
+    start = datetime(2026, 3, 2, 9, 0)
+    store = SnapshotStore(tmp_path, keyframe_interval=4, codec='binary')
+    states = [{'timestamp': (start + timedelta(hours=hour)).isoformat(),
+               'technical_metrics': {'services': {'total': hour, 'go_services': 1}}} for hour in range(6)]
+    del states[-1]['technical_metrics']['services']['go_services']
+    for state in states:
+        store.append(state)
+
+    assert list(store.segments_path.glob('*/*/segment_*.nnsb'))
+    assert store.range() == states
+    assert store.latest_subtree('technical_metrics.services') == flatten_state(states[-1]['technical_metrics'],
+                                                                               'technical_metrics.')
+
+
+def test_binary_segment_torn_mid_frame_still_loads(tmp_path):
+    start = datetime(2026, 3, 2, 9, 0)
+    store = SnapshotStore(tmp_path, codec='binary')
+    states = [{'timestamp': (start + timedelta(hours=hour)).isoformat(),
+               'technical_metrics': {'services': {'total': hour}}} for hour in range(3)]
+    for state in states:
+        store.append(state)
+    segment, = store.segments_path.glob('*/*/segment_*.nnsb')
+    data = segment.read_bytes()
+    # Cut the last frame short, as a crash mid-write would, and lose the index too
+    segment.write_bytes(data[:len(data) - 10])
+    store.index_file.unlink()
+
+    reopened = SnapshotStore(tmp_path, codec='binary')
+    assert reopened.range() == states[:2]
+    reopened.append(states[2])
+    assert SnapshotStore(tmp_path, codec='binary').range() == states
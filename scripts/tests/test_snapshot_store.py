@@ -0,0 +1,103 @@
+"""
+NetNeural Snapshot Store Tests
+Append and replay, torn segment tails and the latest pointer after a crash
+"""
+
+import json
+from datetime import datetime, timedelta
+
+from snapshot_store import SnapshotStore, parse_timestamp
+
+START = datetime(2026, 3, 2, 9, 0)
+
+
+def snapshot(hour, **metrics):
+    return {'timestamp': (START + timedelta(hours=hour)).isoformat(),
+            'technical_metrics': {'services': {'total': hour, **metrics}}}
+
+
+def segment_of(store):
+    segments = list(store.segments_path.glob('*/*/segment_*.*'))
+    assert len(segments) == 1
+    return segments[0]
+
+
+def test_appended_snapshots_replay_in_order(tmp_path):
+    store = SnapshotStore(tmp_path)
+    states = [snapshot(hour, go=hour % 2) for hour in range(5)]
+    for state in states:
+        store.append(state)
+
+    assert len(store) == 5
+    assert store.range() == states
+    assert store.latest() == states[-1]
+    assert store.at(parse_timestamp(states[2]['timestamp'])) == states[2]
+    assert store.count(parse_timestamp(states[1]['timestamp']), parse_timestamp(states[3]['timestamp'])) == 2
+
+    # A fresh process reads the same history from disk
+    assert SnapshotStore(tmp_path).range() == states
+
+
+def test_store_loads_with_a_segment_torn_mid_record(tmp_path):
+    store = SnapshotStore(tmp_path)
+    for hour in range(3):
+        store.append(snapshot(hour))
+    segment = segment_of(store)
+    # A writer crashed halfway through a fourth line, before indexing it
+    with open(segment, 'ab') as f:
+        f.write(b'{"t":1772445600.0,"k":"D","d":{"set":{"technical')
+
+    reopened = SnapshotStore(tmp_path)
+    assert len(reopened) == 3
+    assert reopened.latest() == snapshot(2)
+
+    # Losing the index as well, the rebuild skips the torn line
+    reopened.index_file.unlink()
+    rebuilt = SnapshotStore(tmp_path)
+    assert [state['timestamp'] for state in rebuilt.range()] == [snapshot(hour)['timestamp'] for hour in range(3)]
+
+    # The next append cuts the torn bytes off rather than running into them
+    rebuilt.append(snapshot(3))
+    assert SnapshotStore(tmp_path).range()[-1] == snapshot(3)
+    assert segment.read_bytes().count(b'\n') == 4
+
+
+def test_latest_after_a_crash_before_the_pointer_moved(tmp_path):
+    store = SnapshotStore(tmp_path)
+    store.append(snapshot(0))
+    pointer = store.latest_file.read_bytes()
+    store.append(snapshot(1))
+    # The crash hit after the index record was synced but before LATEST was swapped
+    store.latest_file.write_bytes(pointer)
+
+    reopened = SnapshotStore(tmp_path)
+    assert reopened.latest() == snapshot(1)
+    reopened.append(snapshot(2, go=1))
+    assert SnapshotStore(tmp_path).range() == [snapshot(0), snapshot(1), snapshot(2, go=1)]
+
+
+def test_latest_after_a_crash_that_lost_the_pointer(tmp_path):
+    store = SnapshotStore(tmp_path)
+    store.append(snapshot(0))
+    store.append(snapshot(1))
+    store.latest_file.unlink()
+
+    assert SnapshotStore(tmp_path).latest() == snapshot(1)
+
+
+def test_delta_chain_rebuilds_across_keyframes(tmp_path):
+    store = SnapshotStore(tmp_path, keyframe_interval=3)
+    states = [snapshot(hour, go=hour % 2) for hour in range(7)]
+    # Keys added and removed between snapshots must survive the delta encoding
+    states[4]['technical_metrics']['frontend_apps'] = {'total': 2}
+    del states[5]['technical_metrics']['services']['go']
+    for state in states:
+        store.append(state)
+
+    kinds = [json.loads(line)['k'] for line in segment_of(store).read_bytes().splitlines()]
+    assert kinds == ['K', 'D', 'D', 'K', 'D', 'D', 'K']
+    assert store.range() == states
+    # Reads starting between keyframes replay from the keyframe before them
+    for hour in range(7):
+        assert store.at(parse_timestamp(states[hour]['timestamp'])) == states[hour]
+    assert SnapshotStore(tmp_path, keyframe_interval=3).latest() == states[-1]
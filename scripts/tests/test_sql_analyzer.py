@@ -0,0 +1,81 @@
+"""
+NetNeural SQL Analyzer Tests
+Statement splitting, CREATE/ALTER/DROP replay across migrations and column replay
+"""
+
+from scan_cache import ScanCache
+from sql_analyzer import SchemaAnalyzer, analyze_file, replay_columns
+
+INIT = """-- Devices and their readings; a ; in a comment does not end a statement
+CREATE TABLE public.devices (
+  id uuid PRIMARY KEY,
+  name text NOT NULL,
+  serial text,
+  CONSTRAINT devices_serial_key UNIQUE (serial)
+);
+CREATE TABLE IF NOT EXISTS "readings" (id bigserial, device_id uuid REFERENCES devices(id), value numeric);
+ALTER TABLE devices ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "devices_select" ON public.devices FOR SELECT USING (true);
+CREATE INDEX readings_device_idx ON readings (device_id);
+CREATE OR REPLACE FUNCTION touch_device() RETURNS trigger AS $$
+BEGIN
+  NEW.name := 'a;b';
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+CREATE TRIGGER devices_touch BEFORE UPDATE ON devices FOR EACH ROW EXECUTE FUNCTION touch_device();
+/* block comment; with a semicolon */
+INSERT INTO devices (id, name) VALUES ('00000000-0000-0000-0000-000000000000', 'it''s; fine');
+"""
+
+CHANGES = """ALTER TABLE public.devices ADD COLUMN location text, DROP COLUMN serial;
+ALTER TABLE devices RENAME COLUMN name TO label;
+DROP INDEX IF EXISTS readings_device_idx;
+DROP TABLE readings;
+CREATE TABLE audit.events (id bigint, kind text);
+"""
+
+
+def write_migrations(tmp_path):
+    directory = tmp_path / 'migrations'
+    directory.mkdir()
+    (directory / '20240101000000_init.sql').write_text(INIT)
+    (directory / '20240201000000_changes.sql').write_text(CHANGES)
+    return sorted(directory.glob('*.sql'))
+
+
+def test_statements_split_around_comments_strings_and_dollar_quotes(tmp_path):
+    init, _ = write_migrations(tmp_path)
+
+    result = analyze_file(init)
+
+    assert result['statements'] == 8
+    assert result['created'] == {
+        'tables': ['devices', 'readings'], 'policies': ['devices:devices_select'], 'functions': ['touch_device'],
+        'triggers': ['devices:devices_touch'], 'indexes': ['readings_device_idx'], 'rls_tables': ['devices'],
+    }
+    assert result['columns'] == [['create', 'devices', ['id', 'name', 'serial']],
+                                 ['create', 'readings', ['id', 'device_id', 'value']]]
+
+
+def test_migrations_replay_to_the_net_schema(tmp_path):
+    migrations = write_migrations(tmp_path)
+    analyzer = SchemaAnalyzer(ScanCache(tmp_path / 'cache', 'sql'))
+
+    # Given out of order, replayed by name
+    result = analyzer.analyze_migrations(migrations[::-1])
+
+    assert (result['files'], result['statements']) == (2, 13)
+    assert result['objects'] == {'tables': 2, 'policies': 1, 'functions': 1, 'triggers': 1, 'indexes': 0,
+                                 'rls_tables': 1}
+    # audit.events never enables row level security
+    assert result['tables_without_rls'] == 1
+    assert result['per_migration']['20240201000000_changes']['tables'] == 1
+
+
+def test_column_replay_follows_alters_and_drops(tmp_path):
+    tables = {}
+    for path in write_migrations(tmp_path):
+        replay_columns(analyze_file(path)['columns'], tables)
+
+    assert tables == {'devices': {'id', 'label', 'location'}, 'audit.events': {'id', 'kind'}}
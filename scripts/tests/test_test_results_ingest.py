@@ -0,0 +1,143 @@
+"""
+NetNeural Test Results Ingest Tests
+Jest and Playwright counts, flaky retries and incremental log cursors
+"""
+
+import os
+import json
+
+from scan_cache import ScanCache
+
+# Imported as a module: pytest would try to collect a Test* class imported by name
+import test_results_ingest
+from test_results_ingest import LogParser, summarize_run
+
+# Console noise ahead of the results, longer than the head the cursor hashes
+PREAMBLE = "> jest --ci\n" + "".join(f"  console.log  seeding fixture {index}\n" for index in range(300))
+
+FAILING_RUN = """PASS src/lib/format.test.ts (1.2 s)
+    ✓ formats dates (5 ms)
+FAIL src/app/page.test.tsx
+    ✕ renders the header (12 ms)
+Tests:       1 failed, 1 passed, 2 total
+Time:        2.5 s
+"""
+
+PASSING_RUN = """PASS src/lib/format.test.ts (1.1 s)
+    ✓ formats dates (4 ms)
+    ✓ formats money (3 ms)
+PASS src/app/page.test.tsx
+    ✓ renders the header (10 ms)
+    ✓ renders the footer (9 ms)
+Tests:       4 passed, 4 total
+Time:        2.4 s
+"""
+
+PLAYWRIGHT_RUN = """Running 4 tests using 1 worker
+
+  ✓  1 [chromium] › tests/login.spec.ts:5:3 › logs in (1.2s)
+  ✘  2 [chromium] › tests/login.spec.ts:12:3 › rejects a bad password (3.0s)
+  ✓  3 [chromium] › tests/login.spec.ts:12:3 › rejects a bad password (retry #1) (2.5s)
+  ✘  4 [chromium] › tests/login.spec.ts:20:3 › times out (30.0s)
+  ✘  5 [chromium] › tests/login.spec.ts:20:3 › times out (retry #1) (30.0s)
+  -  6 [chromium] › tests/admin.spec.ts:3:3 › exports users
+
+  1) [chromium] › tests/login.spec.ts:20:3 › times out ─────────────
+
+  1 failed
+    [chromium] › tests/login.spec.ts:20:3 › times out ──────────────
+  1 flaky
+    [chromium] › tests/login.spec.ts:12:3 › rejects a bad password ──
+  1 skipped
+  1 passed (1.1m)
+"""
+
+
+def parse(log):
+    parser = LogParser()
+    for line in log.splitlines():
+        parser.feed(line)
+    return summarize_run(parser.run)
+
+
+def ingest(tmp_path, log):
+    ingestor = test_results_ingest.TestResultsIngestor(ScanCache(tmp_path / 'cache', 'test_results'), tmp_path)
+    return ingestor.ingest([log])
+
+
+def test_rewritten_log_with_the_same_start_is_parsed_from_scratch(tmp_path):
+    log = tmp_path / 'jest-output.txt'
+    log.write_text(PREAMBLE + FAILING_RUN, encoding='utf-8')
+    result = ingest(tmp_path, log)
+    assert (result['passed'], result['failed']) == (1, 1)
+
+    # The next run overwrites the log in place: same inode, same first bytes, and longer
+    log.write_text(PREAMBLE + PASSING_RUN + "Ran all test suites.\n", encoding='utf-8')
+    result = ingest(tmp_path, log)
+
+    assert (result['passed'], result['failed'], result['total']) == (4, 0, 4)
+
+
+
+def test_playwright_counts_flaky_retries_and_durations():
+    summary = parse(PLAYWRIGHT_RUN)
+
+    assert summary['runner'] == 'playwright' and summary['complete']
+    assert [summary[category] for category in ('passed', 'failed', 'flaky', 'skipped')] == [1, 1, 1, 1]
+    assert summary['retries'] == 2
+    assert summary['duration_s'] == 66.0
+    # Retried attempts add up: 1.2s + (3.0s + 2.5s) + (30s + 30s)
+    assert summary['specs'] == {'tests/login.spec.ts': 66700}
+
+
+def test_jest_counts_and_suite_durations():
+    summary = parse(FAILING_RUN)
+
+    assert summary['runner'] == 'jest' and summary['complete']
+    assert [summary[category] for category in ('passed', 'failed', 'flaky', 'skipped')] == [1, 1, 0, 0]
+    assert summary['duration_s'] == 2.5
+    assert summary['specs'] == {'src/app/page.test.tsx': 12, 'src/lib/format.test.ts': 5}
+
+
+def test_appended_lines_resume_from_the_cursor(tmp_path):
+    log = tmp_path / 'playwright-output.txt'
+    head, tail = PLAYWRIGHT_RUN.split("  1) ")
+    # The writer is mid-line: the partial line waits for the next ingest
+    log.write_text(head + "  -  7 [chromium] › tests/adm", encoding='utf-8')
+    partial = ingest(tmp_path, log)
+    assert partial['runs'][0]['complete'] is False
+    assert (partial['passed'], partial['flaky'], partial['failed']) == (1, 1, 1)
+
+    with open(log, 'a', encoding='utf-8') as f:
+        f.write("in.spec.ts:9:3 › imports users\n\n  1) " + tail)
+    result = ingest(tmp_path, log)
+    assert result['runs'][0]['complete'] is True
+    assert (result['passed'], result['failed'], result['flaky'], result['skipped']) == (1, 1, 1, 1)
+    assert result['slowest_tests'][0] == {
+        'test': '[chromium] tests/login.spec.ts:20 › times out', 'duration_ms': 60000, 'report': 'playwright-output.txt'}
+
+    # A second run appended to the same log replaces the first
+    with open(log, 'a', encoding='utf-8') as f:
+        f.write("Running 1 test using 1 worker\n  ✓  1 [chromium] › tests/login.spec.ts:5:3 › logs in (1.0s)\n"
+                "  1 passed (2.0s)\n")
+    result = ingest(tmp_path, log)
+    assert (result['passed'], result['total']) == (1, 1)
+
+
+def test_only_the_newest_run_per_runner_counts(tmp_path):
+    older, newer = tmp_path / 'jest-old.txt', tmp_path / 'jest-results.json'
+    older.write_text(FAILING_RUN, encoding='utf-8')
+    newer.write_text(json.dumps({
+        'numPassedTests': 3, 'numFailedTests': 0, 'numPendingTests': 1, 'numTodoTests': 0, 'numTotalTestSuites': 1,
+        'startTime': 1000, 'testResults': [{'name': str(tmp_path / 'src/a.test.ts'), 'endTime': 3500,
+                                            'assertionResults': [{'fullName': 'a works', 'status': 'passed',
+                                                                  'duration': 7}]}]}))
+    os.utime(older, (1, 1))
+    ingestor = test_results_ingest.TestResultsIngestor(ScanCache(tmp_path / 'cache', 'test_results'), tmp_path)
+
+    result = ingestor.ingest([older, newer])
+
+    assert [(run['path'], run['counted']) for run in result['runs']] == [
+        ('jest-old.txt', False), ('jest-results.json', True)]
+    assert (result['passed'], result['failed'], result['skipped']) == (3, 0, 1)
+    assert result['slowest_specs'] == [{'file': 'src/a.test.ts', 'duration_ms': 7}]
@@ -0,0 +1,67 @@
+"""
+NetNeural Trend Engine Tests
+Metric direction, regressions and improving/declining classification
+"""
+
+from datetime import datetime, timedelta
+
+from trend_engine import MetricsMatrix, compute_trends, lower_is_better
+
+
+def snapshots(*states):
+    start = datetime(2026, 1, 1)
+    return [dict(state, timestamp=(start + timedelta(days=day)).isoformat()) for day, state in enumerate(states)]
+
+
+def test_rising_failure_count_is_a_regression():
+    history = snapshots(*({'technical_metrics': {'test_results': {'failed': failed, 'passed': 100}}}
+                          for failed in (2, 2, 3, 4)))
+
+    trends = compute_trends(MetricsMatrix.from_snapshots(history), window_days=7, min_change_pct=5)
+
+    assert 'technical_metrics.test_results.failed' in trends['declining']
+    assert [regression['metric'] for regression in trends['regressions']] == ['technical_metrics.test_results.failed']
+
+
+def test_rising_broken_links_are_not_improving():
+    history = snapshots({'documentation_health': {'links': {'broken_links': 27, 'links': 400}}},
+                        {'documentation_health': {'links': {'broken_links': 28, 'links': 410}}})
+
+    trends = compute_trends(MetricsMatrix.from_snapshots(history), min_change_pct=1)
+
+    assert trends['improving'] == ['documentation_health.links.links']
+    assert trends['declining'] == ['documentation_health.links.broken_links']
+
+
+def test_direction_is_decided_by_full_path():
+    assert lower_is_better('documentation_health.code_references.unresolved_by_kind.env_var')
+    assert lower_is_better('schema.type_drift.drifted_tables')
+    assert not lower_is_better('technical_metrics.test_results.passed')
+    # Same leaf name, different metric
+    assert not lower_is_better('technical_metrics.code_inventory.total.failed')
+
+
+def test_slope_and_change_point_of_a_step():
+    history = snapshots(*({'technical_metrics': {'services': {'total': total}}}
+                          for total in (10, 10, 10, 10, 20, 20, 20, 20)))
+
+    trends = compute_trends(MetricsMatrix.from_snapshots(history), window_days=3, min_change_pct=5)
+
+    metric = trends['metrics']['technical_metrics.services.total']
+    assert (metric['first'], metric['last'], metric['change_pct']) == (10.0, 20.0, 100.0)
+    assert metric['slope_per_day'] > 0
+    assert trends['improving'] == ['technical_metrics.services.total']
+    change_point, = trends['change_points']
+    assert (change_point['before_mean'], change_point['after_mean']) == (10.0, 20.0)
+    assert change_point['timestamp'] == history[4]['timestamp']
+
+
+def test_gaps_are_filled_and_single_observations_skipped():
+    history = snapshots({'project_metrics': {'mvp_completion': 40.0, 'team_velocity': 3}},
+                        {'project_metrics': {}},
+                        {'project_metrics': {'mvp_completion': 50.0}})
+
+    trends = compute_trends(MetricsMatrix.from_snapshots(history))
+
+    assert list(trends['metrics']) == ['project_metrics.mvp_completion']
+    assert trends['metrics']['project_metrics.mvp_completion']['rolling_delta'] == 10.0
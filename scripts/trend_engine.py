@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+NetNeural Trend Engine
+Vectorized trend statistics over a snapshots x metric-paths matrix
+"""
+
+from datetime import datetime
+from fnmatch import fnmatchcase
+from typing import Dict, List, Any
+
+import numpy as np
+
+from snapshot_store import flatten_state, parse_timestamp
+
+# Metric paths (fnmatch patterns) where a rising value is a deterioration: ages and counts of
+# failures, breakage and drift. Every other metric is taken to improve as it rises.
+LOWER_IS_BETTER = (
+    'business_metrics.market_data_freshness',
+    'business_metrics.competitive_analysis_age',
+    'technical_metrics.test_results.failed',
+    'technical_metrics.test_results.flaky',
+    'technical_metrics.test_results.retries',
+    'documentation_health.code_references.unresolved',
+    'documentation_health.code_references.unresolved_by_kind.*',
+    'documentation_health.links.broken_links',
+    'documentation_health.links.broken_anchors',
+    'schema.migrations.tables_without_rls',
+    'schema.type_drift.drifted_tables',
+)
+
+
+def lower_is_better(path: str) -> bool:
+    """Whether a rise in the metric at a flattened state path is a deterioration"""
+    return any(fnmatchcase(path, pattern) for pattern in LOWER_IS_BETTER)
+
+
+class MetricsMatrix:
+    """Numeric snapshot history as a dense (snapshots x metrics) float matrix.
+
+    Missing observations are NaN. Every statistic is computed column-wise
+    with NumPy, so the cost is one pass over the matrix per statistic no
+    matter how many metric paths the snapshots carry.
+    """
+
+    def __init__(self, timestamps: np.ndarray, paths: List[str], values: np.ndarray):
+        """Initialize from epoch timestamps, column paths and the value matrix"""
+        self.timestamps = timestamps
+        self.paths = paths
+        self.values = values
+
+    @classmethod
+    def from_snapshots(cls, snapshots: List[Dict[str, Any]]) -> 'MetricsMatrix':
+        """Build the matrix from snapshot dicts, oldest first"""
+        columns: Dict[str, int] = {}
+        rows = []
+        timestamps = []
+        for snapshot in snapshots:
+            timestamp = parse_timestamp(snapshot.get('timestamp'))
+            if timestamp is None:
+                continue
+            row = {}
+            for path, value in flatten_state(snapshot).items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    row[columns.setdefault(path, len(columns))] = value
+            rows.append(row)
+            timestamps.append(timestamp)
+
+        values = np.full((len(rows), len(columns)), np.nan)
+        for i, row in enumerate(rows):
+            if row:
+                values[i, list(row.keys())] = list(row.values())
+        order = np.argsort(timestamps, kind='stable')
+        return cls(np.asarray(timestamps)[order], list(columns), values[order])
+
+    def select(self, prefix: str) -> 'MetricsMatrix':
+        """Return the sub-matrix of metric paths under a prefix"""
+        keep = [i for i, path in enumerate(self.paths) if path.startswith(prefix)]
+        return MetricsMatrix(self.timestamps, [self.paths[i] for i in keep], self.values[:, keep])
+
+    def filled(self) -> np.ndarray:
+        """Values with gaps forward-filled and leading gaps back-filled"""
+        values = self.values
+        n = values.shape[0]
+        valid = ~np.isnan(values)
+        index = np.where(valid, np.arange(n)[:, None], 0)
+        np.maximum.accumulate(index, axis=0, out=index)
+        forward = values[index, np.arange(values.shape[1])]
+        first = np.argmax(valid, axis=0)
+        leading = np.isnan(forward)
+        return np.where(leading, values[first, np.arange(values.shape[1])], forward)
+
+
+def compute_trends(matrix: MetricsMatrix, window_days: float = 7,
+                   min_change_pct: float = 5.0) -> Dict[str, Any]:
+    """Compute slope, rolling delta, regressions and change-points per metric"""
+    observed = (~np.isnan(matrix.values)).sum(axis=0)
+    keep = np.flatnonzero(observed >= 2)
+    matrix = MetricsMatrix(matrix.timestamps, [matrix.paths[i] for i in keep], matrix.values[:, keep])
+    values = matrix.values
+    n, m = values.shape
+    if n < 2 or m == 0:
+        return {'metrics': {}, 'improving': [], 'declining': [],
+                'regressions': [], 'change_points': []}
+
+    filled = matrix.filled()
+    days = (matrix.timestamps - matrix.timestamps[0]) / 86400.0
+    first, last = filled[0], filled[-1]
+
+    # Least-squares slope per day over observed points only
+    mask = ~np.isnan(values)
+    count = np.maximum(mask.sum(axis=0), 1)
+    x = np.where(mask, days[:, None], 0.0)
+    y = np.where(mask, values, 0.0)
+    x_centered = np.where(mask, x - x.sum(axis=0) / count, 0.0)
+    y_centered = np.where(mask, y - y.sum(axis=0) / count, 0.0)
+    variance = (x_centered ** 2).sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = np.where(variance > 0, (x_centered * y_centered).sum(axis=0) / variance, 0.0)
+
+    # Change over the trailing window
+    cutoff = matrix.timestamps[-1] - window_days * 86400
+    base_row = max(0, int(np.searchsorted(matrix.timestamps, cutoff, side='right')) - 1)
+    rolling_delta = last - filled[base_row]
+
+    change = last - first
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change_pct = np.where(first != 0, change / np.abs(first) * 100, np.where(change != 0, 100.0, 0.0))
+        window_pct = np.where(filled[base_row] != 0, rolling_delta / np.abs(filled[base_row]) * 100,
+                              np.where(rolling_delta != 0, 100.0, 0.0))
+
+    # Change-point: split maximising the standardized difference of means
+    k = np.arange(1, n)[:, None]
+    cumulative = np.cumsum(filled, axis=0)
+    total = cumulative[-1]
+    before = cumulative[:-1] / k
+    after = (total - cumulative[:-1]) / (n - k)
+    noise = np.std(np.diff(filled, axis=0), axis=0) / np.sqrt(2)
+    score = np.abs(after - before) * np.sqrt(k * (n - k) / n)
+    split = np.argmax(score, axis=0)
+    columns = np.arange(m)
+    shift = after[split, columns] - before[split, columns]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.where(noise > 0, score[split, columns] / noise, np.where(shift != 0, np.inf, 0.0))
+        shift_pct = np.where(before[split, columns] != 0,
+                             np.abs(shift) / np.abs(before[split, columns]) * 100, 100.0)
+    is_change_point = (z > 3) & (shift_pct >= min_change_pct)
+
+    direction = np.array([-1.0 if lower_is_better(path) else 1.0 for path in matrix.paths])
+    regression = (direction * rolling_delta < 0) & (np.abs(window_pct) >= min_change_pct)
+
+    result = {'metrics': {}, 'improving': [], 'declining': [], 'regressions': [], 'change_points': []}
+    for i in range(m):
+        path = matrix.paths[i]
+        result['metrics'][path] = {
+            'first': float(first[i]),
+            'last': float(last[i]),
+            'change': float(change[i]),
+            'change_pct': round(float(change_pct[i]), 2),
+            'slope_per_day': float(slope[i]),
+            'rolling_delta': float(rolling_delta[i]),
+        }
+        trend = direction[i] * slope[i]
+        if trend > 0:
+            result['improving'].append(path)
+        elif trend < 0:
+            result['declining'].append(path)
+        if regression[i]:
+            result['regressions'].append({
+                'metric': path,
+                'from': float(filled[base_row, i]),
+                'to': float(last[i]),
+                'change_pct': round(float(window_pct[i]), 2),
+            })
+        if is_change_point[i]:
+            result['change_points'].append({
+                'metric': path,
+                'timestamp': datetime.fromtimestamp(matrix.timestamps[split[i] + 1]).isoformat(),
+                'before_mean': float(before[split[i], i]),
+                'after_mean': float(after[split[i], i]),
+            })
+    return result